@@ -0,0 +1,296 @@
+"""
+Benchmark del detector de plagio
+Genera corpus sintéticos de distintos tamaños, ejecuta el flujo completo con
+distintos tamaños de n-grama y registra el tiempo de cada etapa, la memoria
+máxima (RSS) y el rendimiento (documentos/s y pares/s) en un archivo JSON.
+Si se indica una línea base, compara cada configuración contra ella
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+# 'index' solo se mide con el motor 'index'; 'similarity' incluye la selección del top N
+STAGES = ('load', 'preprocess', 'index', 'similarity', 'report')
+
+# Palabras base para los textos sintéticos (como en documentos/archivos.py)
+TEMAS = [
+    "La inteligencia artificial está transformando la educación moderna",
+    "El cambio climático representa un gran desafío para la humanidad",
+    "Los avances en medicina han mejorado la calidad de vida",
+    "La tecnología influye en nuestras decisiones diarias",
+    "La ética en la programación es fundamental para el futuro"
+]
+
+def generate_corpus(target_dir, document_count, words_per_document=300, copy_rate=0.1, seed=42):
+    """
+    Genera un corpus sintético de documentos .txt
+
+    Una fracción de los documentos (copy_rate) son copias con cambios de otro
+    documento del corpus, para que existan pares con similitud alta
+
+    Args:
+        target_dir (str): Carpeta donde se escriben los documentos
+        document_count (int): Número de documentos
+        words_per_document (int): Palabras aproximadas por documento
+        copy_rate (float): Proporción de documentos copiados de otro
+        seed (int): Semilla para obtener siempre el mismo corpus
+    """
+    generator = random.Random(seed)
+    vocabulary = ' '.join(TEMAS).lower().split()
+    vocabulary += [''.join(generator.choices(string.ascii_lowercase, k=generator.randint(3, 9)))
+                   for _ in range(5000)]
+    generated = []
+
+    for i in range(document_count):
+        if generated and generator.random() < copy_rate:
+            words = list(generator.choice(generated))
+            for _ in range(generator.randint(0, len(words) // 4)):
+                words[generator.randrange(len(words))] = generator.choice(vocabulary)
+        else:
+            length = generator.randint(words_per_document // 2, words_per_document * 3 // 2)
+            words = [generator.choice(vocabulary) for _ in range(length)]
+
+        # Solo se reutilizan los primeros documentos para no guardar todo el corpus en memoria
+        if len(generated) < 500:
+            generated.append(words)
+
+        with open(os.path.join(target_dir, f"doc_{i + 1}.txt"), 'w', encoding='utf-8') as f:
+            f.write(' '.join(words).capitalize() + '.')
+
+def _peak_rss_kb():
+    """
+    Obtiene la memoria residente máxima del proceso actual
+
+    Returns:
+        int: Memoria máxima en KB, o None si la plataforma no lo permite
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # En macOS ru_maxrss está en bytes; en Linux, en KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def run_pipeline(documents_dir, ngram_size, similarity_method, top_n, similarity_threshold, workers, encoding):
+    """
+    Ejecuta el flujo completo del detector midiendo cada etapa
+    Se ejecuta en un proceso nuevo para que la memoria máxima sea la de esta configuración
+
+    Args:
+        documents_dir (str): Carpeta con los documentos
+        ngram_size (int): Tamaño de los n-gramas
+        similarity_method (str): Motor de similitud
+        top_n (int): Número de pares a seleccionar
+        similarity_threshold (float): Umbral de similitud
+        workers (int): Procesos para el preprocesamiento y la similitud
+        encoding (str): Codificación de los n-gramas
+
+    Returns:
+        dict: Tiempos por etapa, pares emitidos por el motor y memoria máxima
+    """
+    from src.main import calculate_similarities, index_documents
+    from src.utils.metrics import count_items
+    from src.utils.preprocessing import load_documents_from_directory, preprocess_documents
+    from src.sorting.merge_sort import get_top_similar_pairs
+    from src.visualization.graph import generate_ascii_graph, generate_similarity_table
+
+    timings = {}
+
+    start_time = time.perf_counter()
+    documents = load_documents_from_directory(documents_dir)
+    timings['load'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    documents_ngrams = preprocess_documents(documents, ngram_size, workers, encoding=encoding)
+    timings['preprocess'] = time.perf_counter() - start_time
+    del documents
+
+    # La tabla hash solo la usa el motor 'index'
+    hash_table = document_sizes = None
+    if similarity_method == 'index':
+        start_time = time.perf_counter()
+        hash_table, _, document_sizes = index_documents(documents_ngrams, verbose=False)
+        timings['index'] = time.perf_counter() - start_time
+
+    # Los pares se consumen en streaming, igual que en detect_plagiarism: el cálculo
+    # y la selección del top N forman una sola etapa
+    start_time = time.perf_counter()
+    counters = {}
+    similarity_pairs = calculate_similarities(documents_ngrams, similarity_method, similarity_threshold,
+                                              workers=workers, hash_table=hash_table,
+                                              document_sizes=document_sizes)
+    top_similar_pairs = get_top_similar_pairs(count_items(similarity_pairs, counters, 'pairs_emitted'), top_n)
+    timings['similarity'] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    generate_similarity_table(top_similar_pairs)
+    generate_ascii_graph(top_similar_pairs, similarity_threshold)
+    timings['report'] = time.perf_counter() - start_time
+
+    return {
+        'timings': timings,
+        'pairs_emitted': counters['pairs_emitted'],
+        'ngrams': sum(len(ngrams) for ngrams in documents_ngrams.values()),
+        'peak_rss_kb': _peak_rss_kb()
+    }
+
+def run_benchmark(sizes, ngram_sizes, methods, top_n=10, similarity_threshold=0.3, workers=1,
+                  encoding='text', words_per_document=300):
+    """
+    Ejecuta todas las combinaciones de tamaño de corpus, tamaño de n-grama y motor
+
+    Args:
+        sizes (list): Números de documentos de cada corpus
+        ngram_sizes (list): Tamaños de n-grama
+        methods (list): Motores de similitud
+        top_n (int): Número de pares a seleccionar
+        similarity_threshold (float): Umbral de similitud
+        workers (int): Procesos para el preprocesamiento y la similitud
+        encoding (str): Codificación de los n-gramas
+        words_per_document (int): Palabras aproximadas por documento
+
+    Returns:
+        dict: Resultados con metadatos y una entrada por configuración
+    """
+    results = {
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': workers,
+        'encoding': encoding,
+        'runs': []
+    }
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            print(f"\nGenerando corpus de {size} documentos...")
+            generate_corpus(corpus_dir, size, words_per_document)
+
+            for ngram_size in ngram_sizes:
+                for method in methods:
+                    # Cada configuración se mide en un proceso nuevo
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                        run = executor.submit(run_pipeline, corpus_dir, ngram_size, method, top_n,
+                                              similarity_threshold, workers, encoding).result()
+
+                    total = sum(run['timings'].values())
+                    preprocess_time = run['timings']['load'] + run['timings']['preprocess']
+                    run.update({
+                        'documents': size,
+                        'ngram_size': ngram_size,
+                        'method': method,
+                        'total': total,
+                        'docs_per_second': size / preprocess_time if preprocess_time else None,
+                        # Pares entregados por el motor: 'lsh' y 'ppjoin' solo entregan los que
+                        # superan el umbral, así que no equivale a pares comparados
+                        'pairs_emitted_per_second': (run['pairs_emitted'] / run['timings']['similarity']
+                                                     if run['timings']['similarity'] else None)
+                    })
+                    results['runs'].append(run)
+                    print(format_run(run))
+
+    return results
+
+def format_run(run):
+    """
+    Da formato de una línea a los resultados de una configuración
+
+    Args:
+        run (dict): Resultados de una configuración
+
+    Returns:
+        str: Resumen legible
+    """
+    stages = ' '.join(f"{stage}={run['timings'][stage]:.3f}s" for stage in STAGES if stage in run['timings'])
+    rss = f"{run['peak_rss_kb'] / 1024:.1f} MB" if run['peak_rss_kb'] else "n/d"
+    return (f"  {run['documents']:>6} docs  n={run['ngram_size']}  {run['method']:<8} "
+            f"total={run['total']:.3f}s  {stages}  RSS={rss}  "
+            f"docs/s={run['docs_per_second'] or 0:.0f}  pares emitidos/s={run['pairs_emitted_per_second'] or 0:.0f}")
+
+def compare_with_baseline(results, baseline, tolerance=0.10):
+    """
+    Compara los resultados con una línea base guardada
+
+    Args:
+        results (dict): Resultados actuales
+        baseline (dict): Resultados de referencia
+        tolerance (float): Aumento relativo permitido antes de marcar una regresión
+
+    Returns:
+        list: Configuraciones con regresión (tiempo total o memoria)
+    """
+    reference = {(run['documents'], run['ngram_size'], run['method']): run for run in baseline['runs']}
+    regressions = []
+
+    print(f"\nComparación con la línea base ({baseline.get('timestamp', 'sin fecha')}):")
+    for run in results['runs']:
+        key = (run['documents'], run['ngram_size'], run['method'])
+        base = reference.get(key)
+        if base is None:
+            print(f"  {key}: sin referencia")
+            continue
+
+        time_ratio = run['total'] / base['total'] if base['total'] else 1.0
+        memory_ratio = (run['peak_rss_kb'] / base['peak_rss_kb']
+                        if run['peak_rss_kb'] and base.get('peak_rss_kb') else 1.0)
+        status = "igual"
+        if time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance:
+            status = "REGRESIÓN"
+            regressions.append(key)
+        elif time_ratio < 1 - tolerance:
+            status = "mejora"
+
+        stage_changes = ' '.join(
+            f"{stage}={run['timings'][stage] / base['timings'][stage]:.2f}x"
+            for stage in STAGES if base['timings'].get(stage) and stage in run['timings']
+        )
+        print(f"  {key}: tiempo {time_ratio:.2f}x, memoria {memory_ratio:.2f}x  [{status}]  {stage_changes}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del detector de plagio")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000], help="Documentos por corpus")
+    parser.add_argument('--ngram-sizes', type=int, nargs='+', default=[3], help="Tamaños de n-grama")
+    parser.add_argument('--methods', nargs='+', default=['index'],
+                        choices=['jaccard', 'minhash', 'lsh', 'index', 'sparse', 'ppjoin'], help="Motores de similitud")
+    parser.add_argument('--words', type=int, default=300, help="Palabras aproximadas por documento")
+    parser.add_argument('--top', type=int, default=10, help="Número de pares a seleccionar")
+    parser.add_argument('--threshold', type=float, default=0.3, help="Umbral de similitud")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="Procesos para preprocesamiento y similitud")
+    parser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación de los n-gramas")
+    parser.add_argument('--output', default='resultados/benchmark.json', help="Archivo JSON de resultados")
+    parser.add_argument('--baseline', default=None, help="Archivo JSON de referencia para comparar")
+    parser.add_argument('--save-baseline', default=None, help="Guardar además los resultados como línea base")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="Aumento relativo permitido")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.ngram_sizes, args.methods, args.top, args.threshold,
+                            args.workers, args.encoding, args.words)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados guardados en: {path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_with_baseline(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-# Paquete detector de plagio
+# Paquete detector de plagio
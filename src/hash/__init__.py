@@ -1 +1 @@
-# Paquete de funciones hash
+# Paquete de funciones hash
@@ -1,158 +1,234 @@
-# Implementación de filtro de Bloom
-"""
-Implementación de un Filtro de Bloom para optimizar la memoria
-Un filtro de Bloom es una estructura de datos probabilística que permite
-verificar si un elemento está en un conjunto de manera eficiente
-"""
-
-class BloomFilter:
-    """
-    Clase BloomFilter - Implementación de un filtro de Bloom
-    """
-    
-    def __init__(self, size=10000, hash_count=3):
-        """
-        Constructor del filtro de Bloom
-        
-        Args:
-            size (int): Tamaño del filtro (número de bits)
-            hash_count (int): Número de funciones hash a utilizar
-        """
-        self.size = size
-        self.hash_count = hash_count
-        # Crear un array de bits (representado como un array de booleanos)
-        self.bit_array = [False] * size
-    
-    def add(self, item):
-        """
-        Agrega un elemento al filtro
-        
-        Args:
-            item (str): Elemento a agregar
-        """
-        # Aplicar cada función hash y marcar los bits correspondientes
-        for index in self._get_hash_values(item):
-            self.bit_array[index] = True
-    
-    def contains(self, item):
-        """
-        Verifica si un elemento podría estar en el filtro
-        
-        Args:
-            item (str): Elemento a verificar
-            
-        Returns:
-            bool: True si el elemento podría estar, False si definitivamente no está
-        """
-        # Verificar si todos los bits correspondientes están marcados
-        return all(self.bit_array[index] for index in self._get_hash_values(item))
-    
-    def _get_hash_values(self, item):
-        """
-        Obtiene los índices hash para un elemento
-        
-        Args:
-            item (str): Elemento a hashear
-            
-        Returns:
-            list: Lista de índices hash
-        """
-        indices = []
-        
-        # Usar las funciones hash disponibles
-        if self.hash_count >= 1:
-            indices.append(self._hash1(item))
-        if self.hash_count >= 2:
-            indices.append(self._hash2(item))
-        if self.hash_count >= 3:
-            indices.append(self._hash3(item))
-        
-        return indices
-    
-    def _hash1(self, string):
-        """
-        Función hash 1
-        
-        Args:
-            string (str): Cadena a hashear
-            
-        Returns:
-            int: Valor hash
-        """
-        hash_value = 0
-        for char in string:
-            hash_value = (hash_value * 31 + ord(char)) % self.size
-        return hash_value
-    
-    def _hash2(self, string):
-        """
-        Función hash 2
-        
-        Args:
-            string (str): Cadena a hashear
-            
-        Returns:
-            int: Valor hash
-        """
-        hash_value = 0
-        for char in string:
-            hash_value = (hash_value * 37 + ord(char)) % self.size
-        return hash_value
-    
-    def _hash3(self, string):
-        """
-        Función hash 3
-        
-        Args:
-            string (str): Cadena a hashear
-            
-        Returns:
-            int: Valor hash
-        """
-        hash_value = 0
-        for char in string:
-            hash_value = (hash_value * 17 + ord(char)) % self.size
-        return hash_value
-    
-    def clear(self):
-        """
-        Limpia el filtro
-        """
-        self.bit_array = [False] * self.size
-    
-    def get_false_positive_rate(self, item_count):
-        """
-        Calcula la tasa de falsos positivos estimada
-        
-        Args:
-            item_count (int): Número de elementos insertados
-            
-        Returns:
-            float: Tasa de falsos positivos
-        """
-        # Fórmula: (1 - e^(-k*n/m))^k
-        # k: número de funciones hash
-        # n: número de elementos insertados
-        # m: tamaño del filtro
-        import math
-        k = self.hash_count
-        m = self.size
-        n = item_count
-        
-        return (1 - math.exp(-k * n / m)) ** k
-
-# Ejemplo de uso
-if __name__ == "__main__":
-    bloom_filter = BloomFilter(1000, 3)
-    
-    # Agregar algunos elementos
-    bloom_filter.add("este es un")
-    bloom_filter.add("es un ejemplo")
-    bloom_filter.add("un ejemplo de")
-    
-    # Verificar si los elementos están en el filtro
-    print("'este es un' está en el filtro:", bloom_filter.contains("este es un"))
-    print("'no existe' está en el filtro:", bloom_filter.contains("no existe"))
-    
-    # Calcular la tasa de falsos positivos
-    print("Tasa de falsos positivos estimada:", bloom_filter.get_false_positive_rate(3))
\ No newline at end of file
+# Implementación de filtro de Bloom
+"""
+Implementación de un Filtro de Bloom para optimizar la memoria
+Un filtro de Bloom es una estructura de datos probabilística que permite
+verificar si un elemento está en un conjunto de manera eficiente
+"""
+
+import math
+from src.hash.fingerprint import hash64, MASK_64
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class BloomFilter:
+    """
+    Clase BloomFilter - Implementación de un filtro de Bloom
+    Los bits se empaquetan en un bytearray (1 bit por posición) y las k
+    funciones hash se derivan de un único hash de 64 bits mediante doble
+    hashing: h_i(x) = h1(x) + i·h2(x) mod m. Con NumPy, add_many y
+    contains_many calculan la matriz de índices de todo el lote de una vez
+    """
+    
+    def __init__(self, size=10000, hash_count=3):
+        """
+        Constructor del filtro de Bloom
+        
+        Args:
+            size (int): Tamaño del filtro (número de bits)
+            hash_count (int): Número de funciones hash a utilizar
+        """
+        self.size = size
+        self.hash_count = hash_count
+        # Crear un array de bits empaquetado (8 bits por byte)
+        self.bit_array = bytearray((size + 7) // 8)
+    
+    def add(self, item):
+        """
+        Agrega un elemento al filtro
+        
+        Args:
+            item (str | int): Elemento a agregar
+        """
+        bit_array = self.bit_array
+        # Aplicar cada función hash y marcar los bits correspondientes
+        for index in self._get_hash_values(item):
+            bit_array[index >> 3] |= 1 << (index & 7)
+    
+    def add_many(self, items):
+        """
+        Agrega varios elementos al filtro (por ejemplo, todos los n-gramas de un documento)
+        
+        Args:
+            items (iterable): Elementos a agregar
+        """
+        if np is not None:
+            indices = self._index_matrix(items).ravel()
+            bits = np.frombuffer(self.bit_array, dtype=np.uint8)
+            np.bitwise_or.at(bits, indices >> np.uint64(3), self._bit_masks(indices))
+            return
+        
+        bit_array = self.bit_array
+        size = self.size
+        hash_range = range(self.hash_count)
+        
+        for item in items:
+            first, second = self._base_hashes(item)
+            for i in hash_range:
+                index = (first + i * second) % size
+                bit_array[index >> 3] |= 1 << (index & 7)
+    
+    def contains(self, item):
+        """
+        Verifica si un elemento podría estar en el filtro
+        
+        Args:
+            item (str | int): Elemento a verificar
+            
+        Returns:
+            bool: True si el elemento podría estar, False si definitivamente no está
+        """
+        bit_array = self.bit_array
+        # Verificar si todos los bits correspondientes están marcados
+        return all(bit_array[index >> 3] & (1 << (index & 7)) for index in self._get_hash_values(item))
+    
+    def contains_many(self, items):
+        """
+        Verifica varios elementos a la vez
+        
+        Args:
+            items (iterable): Elementos a verificar
+            
+        Returns:
+            list: Lista de bool, uno por elemento, en el mismo orden
+        """
+        if np is not None:
+            indices = self._index_matrix(items)
+            bits = np.frombuffer(self.bit_array, dtype=np.uint8)
+            return (bits[indices >> np.uint64(3)] & self._bit_masks(indices)).all(axis=1).tolist()
+        
+        bit_array = self.bit_array
+        size = self.size
+        hash_range = range(self.hash_count)
+        results = []
+        
+        for item in items:
+            first, second = self._base_hashes(item)
+            present = True
+            for i in hash_range:
+                index = (first + i * second) % size
+                if not bit_array[index >> 3] & (1 << (index & 7)):
+                    present = False
+                    break
+            results.append(present)
+        
+        return results
+    
+    def _base_hashes(self, item):
+        """
+        Obtiene los dos hashes base del doble hashing
+        
+        Args:
+            item (str | int): Elemento a hashear
+            
+        Returns:
+            tuple: (h1, h2) con h2 impar
+        """
+        # Mezcla final de MurmurHash3 para dispersar también los identificadores enteros
+        value = hash64(item)
+        value ^= value >> 33
+        value = (value * 0xFF51AFD7ED558CCD) & MASK_64
+        value ^= value >> 33
+        
+        return value & 0xFFFFFFFF, (value >> 32) | 1
+    
+    def _index_matrix(self, items):
+        """
+        Calcula con NumPy los índices de todas las funciones hash para un lote
+        
+        Args:
+            items (iterable): Elementos a hashear
+            
+        Returns:
+            ndarray: Matriz uint64 de (elementos × hash_count) índices
+        """
+        # La misma mezcla que _base_hashes; la multiplicación uint64 es módulo 2^64
+        values = np.fromiter((hash64(item) for item in items), dtype=np.uint64)
+        values ^= values >> np.uint64(33)
+        values *= np.uint64(0xFF51AFD7ED558CCD)
+        values ^= values >> np.uint64(33)
+        
+        first = values & np.uint64(0xFFFFFFFF)
+        second = (values >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return (first[:, None] + steps * second[:, None]) % np.uint64(self.size)
+    
+    def _bit_masks(self, indices):
+        """
+        Obtiene la máscara de cada índice dentro de su byte
+        
+        Args:
+            indices (ndarray): Índices uint64
+            
+        Returns:
+            ndarray: Máscaras uint8 (1 << (índice mod 8))
+        """
+        return np.left_shift(1, indices & np.uint64(7)).astype(np.uint8)
+    
+    def _get_hash_values(self, item):
+        """
+        Obtiene los índices hash para un elemento
+        
+        Args:
+            item (str | int): Elemento a hashear
+            
+        Returns:
+            list: Lista de hash_count índices hash
+        """
+        first, second = self._base_hashes(item)
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+    
+    def clear(self):
+        """
+        Limpia el filtro
+        """
+        self.bit_array = bytearray((self.size + 7) // 8)
+    
+    def fill_ratio(self):
+        """
+        Calcula la proporción de bits marcados
+        
+        Returns:
+            float: Bits en 1 / tamaño del filtro
+        """
+        marked = sum(bin(byte).count('1') for byte in self.bit_array)
+        return marked / self.size
+    
+    def get_false_positive_rate(self, item_count):
+        """
+        Calcula la tasa de falsos positivos estimada
+        
+        Args:
+            item_count (int): Número de elementos insertados
+            
+        Returns:
+            float: Tasa de falsos positivos
+        """
+        # Fórmula: (1 - e^(-k*n/m))^k
+        # k: número de funciones hash
+        # n: número de elementos insertados
+        # m: tamaño del filtro
+        k = self.hash_count
+        m = self.size
+        n = item_count
+        
+        return (1 - math.exp(-k * n / m)) ** k
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    bloom_filter = BloomFilter(1000, 3)
+    
+    # Agregar algunos elementos
+    bloom_filter.add("este es un")
+    bloom_filter.add_many(["es un ejemplo", "un ejemplo de"])
+    
+    # Verificar si los elementos están en el filtro
+    print("'este es un' está en el filtro:", bloom_filter.contains("este es un"))
+    print("'no existe' está en el filtro:", bloom_filter.contains("no existe"))
+    print("Verificación en lote:", bloom_filter.contains_many(["es un ejemplo", "no existe"]))
+    
+    # Calcular la tasa de falsos positivos
+    print("Tasa de falsos positivos estimada:", bloom_filter.get_false_positive_rate(3))
+    print("Proporción de bits marcados:", bloom_filter.fill_ratio())
@@ -0,0 +1,32 @@
+# Funciones hash estables para n-gramas
+"""
+Funciones hash de 64 bits estables entre ejecuciones y procesos
+A diferencia de hash() de Python, el resultado no depende de PYTHONHASHSEED,
+por lo que puede guardarse en disco o compartirse entre procesos
+"""
+
+import hashlib
+
+MASK_64 = (1 << 64) - 1
+
+def hash64(item):
+    """
+    Calcula un hash de 64 bits estable para un n-grama
+
+    Args:
+        item (str | int): N-grama en texto o identificador entero ya calculado
+
+    Returns:
+        int: Valor hash entre 0 y 2^64 - 1
+    """
+    # Los identificadores enteros ya son hashes, solo se ajustan a 64 bits
+    if isinstance(item, int):
+        return item & MASK_64
+
+    digest = hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    print("hash64('este es un'):", hash64("este es un"))
+    print("hash64(12345):", hash64(12345))
@@ -1,162 +1,421 @@
-"""
-Implementación de una tabla hash para almacenar n-gramas
-"""
-
-def custom_hash(string, table_size):
-    """
-    Función hash personalizada para cadenas de texto
-    
-    Args:
-        string (str): Cadena a hashear
-        table_size (int): Tamaño de la tabla hash
-        
-    Returns:
-        int: Valor hash
-    """
-    hash_value = 0
-    PRIME = 31
-    
-    for char in string:
-        # Multiplicamos el hash actual por un número primo y sumamos el código del carácter
-        hash_value = (hash_value * PRIME + ord(char)) % table_size
-    
-    return hash_value
-
-class HashTable:
-    """
-    Clase HashTable - Implementación de una tabla hash con manejo de colisiones por encadenamiento
-    """
-    
-    def __init__(self, size=1024):
-        """
-        Constructor de la tabla hash
-        
-        Args:
-            size (int): Tamaño inicial de la tabla
-        """
-        self.size = size
-        self.table = [[] for _ in range(size)]
-        self.count = 0
-    
-    def insert(self, key, value):
-        """
-        Inserta un elemento en la tabla hash
-        
-        Args:
-            key (str): Clave (n-grama)
-            value (any): Valor asociado (generalmente el documento)
-        """
-        index = custom_hash(key, self.size)
-        
-        # Buscar si la clave ya existe
-        bucket = self.table[index]
-        for i, item in enumerate(bucket):
-            if item[0] == key:
-                # Si la clave existe, actualizar el valor
-                if value not in item[1]:
-                    item[1].append(value)
-                return
-        
-        # Si la clave no existe, agregarla
-        bucket.append([key, [value]])
-        self.count += 1
-        
-        # Verificar si es necesario redimensionar la tabla
-        if self.count > self.size * 0.7:
-            self._resize(self.size * 2)
-    
-    def search(self, key):
-        """
-        Busca un elemento en la tabla hash
-        
-        Args:
-            key (str): Clave a buscar
-            
-        Returns:
-            any: Valor asociado o None si no se encuentra
-        """
-        index = custom_hash(key, self.size)
-        
-        bucket = self.table[index]
-        for item in bucket:
-            if item[0] == key:
-                return item[1]
-        
-        return None
-    
-    def _resize(self, new_size):
-        """
-        Redimensiona la tabla hash
-        
-        Args:
-            new_size (int): Nuevo tamaño de la tabla
-        """
-        old_table = self.table
-        self.size = new_size
-        self.table = [[] for _ in range(new_size)]
-        self.count = 0
-        
-        # Reinserta todos los elementos
-        for bucket in old_table:
-            for key, values in bucket:
-                for value in values:
-                    self.insert(key, value)
-    
-    def keys(self):
-        """
-        Obtiene todas las claves de la tabla hash
-        
-        Returns:
-            list: Lista de claves
-        """
-        all_keys = []
-        
-        for bucket in self.table:
-            for key, _ in bucket:
-                all_keys.append(key)
-        
-        return all_keys
-    
-    def values(self):
-        """
-        Obtiene todos los valores de la tabla hash
-        
-        Returns:
-            list: Lista de valores
-        """
-        all_values = []
-        
-        for bucket in self.table:
-            for _, values in bucket:
-                all_values.extend(values)
-        
-        return list(set(all_values))  # Eliminar duplicados
-    
-    def entries(self):
-        """
-        Obtiene todos los pares clave-valor de la tabla hash
-        
-        Returns:
-            list: Lista de tuplas (key, value)
-        """
-        all_entries = []
-        
-        for bucket in self.table:
-            for key, values in bucket:
-                all_entries.append((key, values))
-        
-        return all_entries
-
-# Ejemplo de uso
-if __name__ == "__main__":
-    hash_table = HashTable(10)
-    
-    hash_table.insert("este es un", "doc1")
-    hash_table.insert("es un ejemplo", "doc1")
-    hash_table.insert("un ejemplo de", "doc1")
-    hash_table.insert("este es un", "doc2")
-    
-    print("Búsqueda 'este es un':", hash_table.search("este es un"))
-    print("Búsqueda 'no existe':", hash_table.search("no existe"))
-    print("Claves:", hash_table.keys())
-    print("Valores:", hash_table.values())
\ No newline at end of file
+"""
+Implementación de una tabla hash para almacenar n-gramas
+"""
+
+from array import array
+from src.hash.fingerprint import hash64
+
+def custom_hash(string, table_size):
+    """
+    Función hash personalizada para cadenas de texto
+    
+    Args:
+        string (str | int): Cadena a hashear o identificador entero de n-grama
+        table_size (int): Tamaño de la tabla hash
+        
+    Returns:
+        int: Valor hash
+    """
+    # Los n-gramas codificados como enteros ya son valores hash
+    if isinstance(string, int):
+        return string % table_size
+    
+    hash_value = 0
+    PRIME = 31
+    
+    for char in string:
+        # Multiplicamos el hash actual por un número primo y sumamos el código del carácter
+        hash_value = (hash_value * PRIME + ord(char)) % table_size
+    
+    return hash_value
+
+class HashTable:
+    """
+    Clase HashTable - Implementación de una tabla hash con manejo de colisiones por encadenamiento
+    """
+    
+    def __init__(self, size=1024):
+        """
+        Constructor de la tabla hash
+        
+        Args:
+            size (int): Tamaño inicial de la tabla
+        """
+        self.size = size
+        self.table = [[] for _ in range(size)]
+        self.count = 0
+        self.resize_count = 0
+    
+    def insert(self, key, value):
+        """
+        Inserta un elemento en la tabla hash
+        
+        Args:
+            key (str | int): Clave (n-grama o su identificador entero)
+            value (any): Valor asociado (generalmente el documento)
+        """
+        index = custom_hash(key, self.size)
+        
+        # Buscar si la clave ya existe
+        bucket = self.table[index]
+        for i, item in enumerate(bucket):
+            if item[0] == key:
+                # Si la clave existe, actualizar el valor
+                if value not in item[1]:
+                    item[1].append(value)
+                return
+        
+        # Si la clave no existe, agregarla
+        bucket.append([key, [value]])
+        self.count += 1
+        
+        # Verificar si es necesario redimensionar la tabla
+        if self.count > self.size * 0.7:
+            self._resize(self.size * 2)
+    
+    def search(self, key):
+        """
+        Busca un elemento en la tabla hash
+        
+        Args:
+            key (str): Clave a buscar
+            
+        Returns:
+            any: Valor asociado o None si no se encuentra
+        """
+        index = custom_hash(key, self.size)
+        
+        bucket = self.table[index]
+        for item in bucket:
+            if item[0] == key:
+                return item[1]
+        
+        return None
+    
+    def _resize(self, new_size):
+        """
+        Redimensiona la tabla hash
+        
+        Args:
+            new_size (int): Nuevo tamaño de la tabla
+        """
+        old_table = self.table
+        self.size = new_size
+        self.resize_count += 1
+        self.table = [[] for _ in range(new_size)]
+        self.count = 0
+        
+        # Reinserta todos los elementos
+        for bucket in old_table:
+            for key, values in bucket:
+                for value in values:
+                    self.insert(key, value)
+    
+    def keys(self):
+        """
+        Obtiene todas las claves de la tabla hash
+        
+        Returns:
+            list: Lista de claves
+        """
+        all_keys = []
+        
+        for bucket in self.table:
+            for key, _ in bucket:
+                all_keys.append(key)
+        
+        return all_keys
+    
+    def values(self):
+        """
+        Obtiene todos los valores de la tabla hash
+        
+        Returns:
+            list: Lista de valores
+        """
+        all_values = []
+        
+        for bucket in self.table:
+            for _, values in bucket:
+                all_values.extend(values)
+        
+        return list(set(all_values))  # Eliminar duplicados
+    
+    def entries(self):
+        """
+        Obtiene todos los pares clave-valor de la tabla hash
+        
+        Returns:
+            list: Lista de tuplas (key, value)
+        """
+        all_entries = []
+        
+        for bucket in self.table:
+            for key, values in bucket:
+                all_entries.append((key, values))
+        
+        return all_entries
+    
+    def stats(self):
+        """
+        Obtiene estadísticas de ocupación de la tabla
+        
+        Returns:
+            dict: Tamaño, claves, factor de carga, longitud promedio y máxima
+                  de las cadenas no vacías y número de redimensionamientos
+        """
+        chain_lengths = [len(bucket) for bucket in self.table if bucket]
+        
+        return {
+            'table_size': self.size,
+            'table_keys': self.count,
+            'load_factor': self.count / self.size,
+            'chain_length_mean': sum(chain_lengths) / len(chain_lengths) if chain_lengths else 0.0,
+            'chain_length_max': max(chain_lengths, default=0),
+            'resize_count': self.resize_count
+        }
+
+class OpenAddressingHashTable:
+    """
+    Clase OpenAddressingHashTable - Tabla hash con direccionamiento abierto (sondeo lineal)
+    
+    Las claves, sus hashes ya calculados y las listas de publicación se guardan
+    en arreglos paralelos. Cada lista de publicación es un arreglo compacto de
+    identificadores enteros de documento. Ofrece la misma interfaz que HashTable
+    (insert, search, keys, values, entries)
+    """
+    
+    EMPTY = None
+    
+    def __init__(self, size=1024, load_factor=0.7):
+        """
+        Constructor de la tabla hash
+        
+        Args:
+            size (int): Tamaño inicial de la tabla (se redondea a una potencia de 2)
+            load_factor (float): Ocupación máxima antes de redimensionar
+        """
+        capacity = 1
+        while capacity < size:
+            capacity *= 2
+        
+        self.size = capacity
+        self.load_factor = load_factor
+        self.count = 0
+        self.resize_count = 0
+        self._keys = [self.EMPTY] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._postings = [self.EMPTY] * capacity
+        # Traducción entre valores (nombres de documento) e identificadores enteros
+        self._value_ids = {}
+        self._values = []
+    
+    def _value_id(self, value):
+        """
+        Obtiene (o asigna) el identificador entero de un valor
+        
+        Args:
+            value (any): Valor (generalmente el nombre del documento)
+            
+        Returns:
+            int: Identificador del valor
+        """
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = len(self._values)
+            self._value_ids[value] = value_id
+            self._values.append(value)
+        return value_id
+    
+    def _find_slot(self, key, key_hash):
+        """
+        Busca la posición de una clave o la primera posición libre de su secuencia de sondeo
+        
+        Args:
+            key (str | int): Clave a buscar
+            key_hash (int): Hash de 64 bits de la clave
+            
+        Returns:
+            int: Índice de la posición
+        """
+        mask = self.size - 1
+        index = key_hash & mask
+        keys = self._keys
+        hashes = self._hashes
+        
+        # Se compara primero el hash guardado para evitar comparar cadenas
+        while keys[index] is not self.EMPTY:
+            if hashes[index] == key_hash and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+        
+        return index
+    
+    def insert(self, key, value):
+        """
+        Inserta un elemento en la tabla hash
+        
+        Args:
+            key (str | int): Clave (n-grama o su identificador entero)
+            value (any): Valor asociado (generalmente el documento)
+        """
+        key_hash = hash64(key)
+        index = self._find_slot(key, key_hash)
+        value_id = self._value_id(value)
+        
+        postings = self._postings[index]
+        if postings is not self.EMPTY:
+            # Los documentos suelen insertarse en orden, basta revisar el último
+            if postings[-1] != value_id and (value_id > postings[-1] or value_id not in postings):
+                postings.append(value_id)
+            return
+        
+        self._keys[index] = key
+        self._hashes[index] = key_hash
+        self._postings[index] = array('I', [value_id])
+        self.count += 1
+        
+        # Verificar si es necesario redimensionar la tabla
+        if self.count > self.size * self.load_factor:
+            self._resize(self.size * 2)
+    
+    def search(self, key):
+        """
+        Busca un elemento en la tabla hash
+        
+        Args:
+            key (str | int): Clave a buscar
+            
+        Returns:
+            list: Valores asociados o None si no se encuentra
+        """
+        index = self._find_slot(key, hash64(key))
+        postings = self._postings[index]
+        if postings is self.EMPTY:
+            return None
+        
+        return [self._values[value_id] for value_id in postings]
+    
+    def search_ids(self, key):
+        """
+        Busca la lista de publicación de una clave como identificadores enteros
+        
+        Args:
+            key (str | int): Clave a buscar
+            
+        Returns:
+            array: Identificadores de los valores o None si no se encuentra
+        """
+        return self._postings[self._find_slot(key, hash64(key))]
+    
+    def _resize(self, new_size):
+        """
+        Redimensiona la tabla reutilizando los hashes guardados (sin volver a hashear)
+        
+        Args:
+            new_size (int): Nuevo tamaño de la tabla (potencia de 2)
+        """
+        old_keys = self._keys
+        old_hashes = self._hashes
+        old_postings = self._postings
+        
+        self.size = new_size
+        self.resize_count += 1
+        self._keys = [self.EMPTY] * new_size
+        self._hashes = array('Q', bytes(8 * new_size))
+        self._postings = [self.EMPTY] * new_size
+        mask = new_size - 1
+        
+        for old_index, key in enumerate(old_keys):
+            if key is self.EMPTY:
+                continue
+            key_hash = old_hashes[old_index]
+            index = key_hash & mask
+            while self._keys[index] is not self.EMPTY:
+                index = (index + 1) & mask
+            self._keys[index] = key
+            self._hashes[index] = key_hash
+            self._postings[index] = old_postings[old_index]
+    
+    def keys(self):
+        """
+        Obtiene todas las claves de la tabla hash
+        
+        Returns:
+            list: Lista de claves
+        """
+        return [key for key in self._keys if key is not self.EMPTY]
+    
+    def values(self):
+        """
+        Obtiene todos los valores de la tabla hash
+        
+        Returns:
+            list: Lista de valores sin duplicados
+        """
+        return list(self._values)
+    
+    def entries(self):
+        """
+        Obtiene todos los pares clave-valor de la tabla hash
+        
+        Returns:
+            list: Lista de tuplas (key, value)
+        """
+        values = self._values
+        return [
+            (key, [values[value_id] for value_id in postings])
+            for key, postings in zip(self._keys, self._postings)
+            if key is not self.EMPTY
+        ]
+    
+    def stats(self):
+        """
+        Obtiene estadísticas de ocupación de la tabla
+        
+        En direccionamiento abierto la longitud de cadena es el número de
+        posiciones que se sondean para llegar a cada clave
+        
+        Returns:
+            dict: Tamaño, claves, factor de carga, longitud promedio y máxima
+                  de sondeo y número de redimensionamientos
+        """
+        mask = self.size - 1
+        probe_lengths = [
+            ((index - (self._hashes[index] & mask)) & mask) + 1
+            for index, key in enumerate(self._keys)
+            if key is not self.EMPTY
+        ]
+        
+        return {
+            'table_size': self.size,
+            'table_keys': self.count,
+            'load_factor': self.count / self.size,
+            'chain_length_mean': sum(probe_lengths) / len(probe_lengths) if probe_lengths else 0.0,
+            'chain_length_max': max(probe_lengths, default=0),
+            'resize_count': self.resize_count
+        }
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    hash_table = HashTable(10)
+    
+    hash_table.insert("este es un", "doc1")
+    hash_table.insert("es un ejemplo", "doc1")
+    hash_table.insert("un ejemplo de", "doc1")
+    hash_table.insert("este es un", "doc2")
+    
+    print("Búsqueda 'este es un':", hash_table.search("este es un"))
+    print("Búsqueda 'no existe':", hash_table.search("no existe"))
+    print("Claves:", hash_table.keys())
+    print("Valores:", hash_table.values())
+    print("Estadísticas:", hash_table.stats())
+    
+    open_table = OpenAddressingHashTable(4)
+    open_table.insert("este es un", "doc1")
+    open_table.insert("es un ejemplo", "doc1")
+    open_table.insert("un ejemplo de", "doc1")
+    open_table.insert("este es un", "doc2")
+    
+    print("Búsqueda (direccionamiento abierto) 'este es un':", open_table.search("este es un"))
+    print("Entradas (direccionamiento abierto):", open_table.entries())
\ No newline at end of file
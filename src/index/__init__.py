@@ -0,0 +1 @@
+# Paquete de índices del corpus
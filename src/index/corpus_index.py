@@ -0,0 +1,346 @@
+# Índice persistente del corpus para consultas de un documento contra todos
+"""
+Índice invertido del corpus guardado en disco
+Asocia el hash de 64 bits de cada n-grama con los documentos que lo
+contienen y guarda el número de n-gramas distintos de cada documento.
+Las claves se guardan ordenadas en arreglos compactos, así que cargar el
+índice son unas pocas lecturas en bloque y cada búsqueda es una búsqueda
+binaria. Un documento nuevo se compara solo con los documentos que
+comparten alguno de sus n-gramas, sin recalcular todos los pares.
+Los documentos agregados después de construir el índice se guardan en
+un índice auxiliar en memoria hasta que compact() los combina
+"""
+
+import json
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from src.hash.fingerprint import hash64
+from src.sorting.top_n import TopNCollector
+from src.utils.preprocessing import iter_documents_from_directory, preprocess_document, preprocess_stream
+
+INDEX_MAGIC = b'NGINDEX1'
+
+class DuplicateDocumentError(ValueError):
+    """
+    Se produce al agregar un documento cuyo nombre ya está en el índice
+    """
+
+class CorpusIndex:
+    """
+    Clase CorpusIndex - Índice n-grama -> documentos con tamaños por documento
+    """
+
+    def __init__(self, ngram_size=3, encoding='text', window=None):
+        """
+        Constructor de un índice vacío
+
+        Args:
+            ngram_size (int): Tamaño de los n-gramas indexados
+            encoding (str): Codificación usada al preprocesar ('text' o 'ids')
+            window (int): Ventana de winnowing usada al preprocesar (None si no se usó)
+        """
+        self.ngram_size = ngram_size
+        self.encoding = encoding
+        self.window = window
+        self.document_names = []
+        # Número de n-gramas distintos de cada documento
+        self.document_sizes = array('I')
+        # Claves ordenadas, desplazamientos de cada lista y listas de publicación concatenadas
+        self.keys = array('Q')
+        self.offsets = array('Q', [0])
+        self.postings = array('I')
+        # Listas de publicación de los documentos agregados con add_document()
+        self._pending = {}
+        self._name_set = None
+
+    @classmethod
+    def build(cls, documents_ngrams, ngram_size=3, encoding='text', window=None):
+        """
+        Construye el índice a partir de los n-gramas de cada documento
+
+        Args:
+            documents_ngrams (dict | iterable): Diccionario o pares (nombre, n-gramas)
+            ngram_size (int): Tamaño de los n-gramas
+            encoding (str): Codificación usada al preprocesar
+            window (int): Ventana de winnowing usada al preprocesar
+
+        Returns:
+            CorpusIndex: Índice construido
+        """
+        index = cls(ngram_size, encoding, window)
+        items = documents_ngrams.items() if isinstance(documents_ngrams, dict) else documents_ngrams
+        postings = {}
+
+        for doc_id, (doc_name, ngrams) in enumerate(items):
+            hashes = {hash64(ngram) for ngram in ngrams}
+            index.document_names.append(doc_name)
+            index.document_sizes.append(len(hashes))
+            for key in hashes:
+                postings.setdefault(key, []).append(doc_id)
+
+        for key in sorted(postings):
+            index.keys.append(key)
+            index.postings.extend(postings[key])
+            index.offsets.append(len(index.postings))
+
+        return index
+
+    def lookup(self, key):
+        """
+        Busca la lista de publicación de un hash de n-grama
+
+        Args:
+            key (int): Hash de 64 bits del n-grama
+
+        Returns:
+            array: Identificadores de los documentos que lo contienen (vacío si no existe)
+        """
+        position = bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            found = self.postings[0:0]
+        else:
+            found = self.postings[self.offsets[position]:self.offsets[position + 1]]
+
+        extra = self._pending.get(key)
+        if extra:
+            found = found + array('I', extra)
+        return found
+
+    def add_document(self, doc_name, ngrams):
+        """
+        Agrega un documento al índice sin reconstruirlo
+
+        Args:
+            doc_name (str): Nombre del documento
+            ngrams (iterable): N-gramas del documento
+
+        Returns:
+            int: Identificador asignado al documento
+        """
+        if self._name_set is None:
+            self._name_set = set(self.document_names)
+        if doc_name in self._name_set:
+            raise DuplicateDocumentError(f"El documento {doc_name} ya está en el índice")
+
+        doc_id = len(self.document_names)
+        hashes = {hash64(ngram) for ngram in ngrams}
+        self.document_names.append(doc_name)
+        self._name_set.add(doc_name)
+        self.document_sizes.append(len(hashes))
+
+        for key in hashes:
+            self._pending.setdefault(key, []).append(doc_id)
+
+        return doc_id
+
+    def compact(self):
+        """
+        Combina el índice auxiliar con los arreglos ordenados (mezcla lineal de claves)
+        """
+        if not self._pending:
+            return
+
+        pending_keys = sorted(self._pending)
+        keys = array('Q')
+        offsets = array('Q', [0])
+        postings = array('I')
+        i = 0
+        j = 0
+
+        while i < len(self.keys) or j < len(pending_keys):
+            if j == len(pending_keys) or (i < len(self.keys) and self.keys[i] < pending_keys[j]):
+                key = self.keys[i]
+                postings.extend(self.postings[self.offsets[i]:self.offsets[i + 1]])
+                i += 1
+            elif i == len(self.keys) or pending_keys[j] < self.keys[i]:
+                key = pending_keys[j]
+                postings.extend(self._pending[key])
+                j += 1
+            else:
+                key = self.keys[i]
+                postings.extend(self.postings[self.offsets[i]:self.offsets[i + 1]])
+                postings.extend(self._pending[key])
+                i += 1
+                j += 1
+
+            keys.append(key)
+            offsets.append(len(postings))
+
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self._pending = {}
+
+    def query(self, ngrams, top_n=10, query_name='consulta', min_similarity=0.0):
+        """
+        Compara los n-gramas de un documento contra todo el corpus
+
+        Args:
+            ngrams (iterable): N-gramas del documento a consultar
+            top_n (int): Número de coincidencias a devolver
+            query_name (str): Nombre del documento consultado (campo doc_a)
+            min_similarity (float): Similitud mínima para incluir un documento
+
+        Returns:
+            list: Diccionarios {'doc_a', 'doc_b', 'similarity'} de mayor a menor similitud
+        """
+        hashes = {hash64(ngram) for ngram in ngrams}
+        query_size = len(hashes)
+        shared_counts = {}
+
+        # Solo se visitan los documentos que comparten algún n-grama con la consulta
+        for key in hashes:
+            for doc_id in self.lookup(key):
+                shared_counts[doc_id] = shared_counts.get(doc_id, 0) + 1
+
+        collector = TopNCollector(top_n)
+        for doc_id, shared in shared_counts.items():
+            similarity = shared / (query_size + self.document_sizes[doc_id] - shared)
+            if similarity >= min_similarity:
+                collector.add({
+                    'doc_a': query_name,
+                    'doc_b': self.document_names[doc_id],
+                    'similarity': similarity
+                })
+
+        return collector.results()
+
+    def query_text(self, text, top_n=10, query_name='consulta', min_similarity=0.0):
+        """
+        Preprocesa un texto con los mismos parámetros del índice y lo consulta
+
+        Args:
+            text (str): Contenido del documento
+            top_n (int): Número de coincidencias a devolver
+            query_name (str): Nombre del documento consultado
+            min_similarity (float): Similitud mínima para incluir un documento
+
+        Returns:
+            list: Coincidencias de mayor a menor similitud
+        """
+        ngrams = preprocess_document(text, self.ngram_size, self.encoding, self.window)
+        return self.query(ngrams, top_n, query_name, min_similarity)
+
+    def save(self, path):
+        """
+        Guarda el índice en un archivo binario
+
+        Args:
+            path (str): Ruta del archivo
+        """
+        self.compact()
+        metadata = json.dumps({
+            'ngram_size': self.ngram_size,
+            'encoding': self.encoding,
+            'window': self.window,
+            'document_names': self.document_names,
+            'key_count': len(self.keys),
+            'posting_count': len(self.postings)
+        }).encode('utf-8')
+
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(INDEX_MAGIC)
+            file.write(struct.pack('<Q', len(metadata)))
+            file.write(metadata)
+            self.document_sizes.tofile(file)
+            self.keys.tofile(file)
+            self.offsets.tofile(file)
+            self.postings.tofile(file)
+
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un índice guardado con save()
+
+        Args:
+            path (str): Ruta del archivo
+
+        Returns:
+            CorpusIndex: Índice cargado
+        """
+        with open(path, 'rb') as file:
+            if file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"El archivo {path} no es un índice de corpus")
+
+            metadata_length = struct.unpack('<Q', file.read(8))[0]
+            metadata = json.loads(file.read(metadata_length).decode('utf-8'))
+
+            index = cls(metadata['ngram_size'], metadata['encoding'], metadata['window'])
+            index.document_names = metadata['document_names']
+            index.document_sizes.fromfile(file, len(index.document_names))
+            index.keys.fromfile(file, metadata['key_count'])
+            index.offsets = array('Q')
+            index.offsets.fromfile(file, metadata['key_count'] + 1)
+            index.postings.fromfile(file, metadata['posting_count'])
+
+        return index
+
+    def __len__(self):
+        return len(self.document_names)
+
+def build_corpus_index(documents_dir, ngram_size=3, encoding='text', window=None, workers=1):
+    """
+    Construye el índice de todos los documentos de un directorio
+
+    Args:
+        documents_dir (str): Directorio con los documentos
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+        workers (int): Procesos para el preprocesamiento
+
+    Returns:
+        CorpusIndex: Índice construido
+    """
+    documents = iter_documents_from_directory(documents_dir)
+    stream = preprocess_stream(documents, ngram_size, workers, encoding=encoding, window=window)
+    return CorpusIndex.build(stream, ngram_size, encoding, window)
+
+# Ejecución desde la línea de comandos
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.utils.preprocessing import read_document
+    from src.visualization.graph import generate_similarity_table
+
+    parser = argparse.ArgumentParser(description="Índice del corpus para consultar documentos nuevos")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Construir el índice de un directorio")
+    build_parser.add_argument('documents_dir', help="Directorio con los documentos del corpus")
+    build_parser.add_argument('index_file', help="Archivo donde se guarda el índice")
+    build_parser.add_argument('--ngram-size', type=int, default=3, help="Tamaño de los n-gramas")
+    build_parser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación de los n-gramas")
+    build_parser.add_argument('--winnow', type=int, default=None, metavar='VENTANA', help="Ventana de winnowing")
+    build_parser.add_argument('-j', '--workers', type=int, default=1, help="Procesos para el preprocesamiento")
+
+    query_parser = subparsers.add_parser('query', help="Comparar documentos nuevos contra el índice")
+    query_parser.add_argument('index_file', help="Archivo del índice")
+    query_parser.add_argument('files', nargs='+', help="Documentos a consultar")
+    query_parser.add_argument('--top', type=int, default=10, help="Número de coincidencias por documento")
+    query_parser.add_argument('--min-similarity', type=float, default=0.0, help="Similitud mínima")
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start_time = time.time()
+        corpus_index = build_corpus_index(args.documents_dir, args.ngram_size, args.encoding, args.winnow, args.workers)
+        corpus_index.save(args.index_file)
+        print(f"Índice de {len(corpus_index)} documentos y {len(corpus_index.keys)} n-gramas "
+              f"guardado en {args.index_file} ({time.time() - start_time:.2f} segundos).")
+    else:
+        start_time = time.time()
+        corpus_index = CorpusIndex.load(args.index_file)
+        print(f"Índice de {len(corpus_index)} documentos cargado en {time.time() - start_time:.2f} segundos.\n")
+
+        for file_path in args.files:
+            start_time = time.time()
+            matches = corpus_index.query_text(read_document(file_path), args.top,
+                                              os.path.basename(file_path), args.min_similarity)
+            print(generate_similarity_table(matches))
+            print(f"Consulta completada en {time.time() - start_time:.3f} segundos.\n")
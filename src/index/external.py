@@ -0,0 +1,324 @@
+# Cálculo de similitud en memoria externa para corpus mayores que la RAM
+"""
+Módulo para calcular la similitud de todos los pares con un presupuesto de
+memoria fijo, sin que los n-gramas del corpus tengan que caber en memoria.
+El trabajo se divide en pasadas secuenciales sobre archivos temporales:
+
+1. Los documentos se leen uno por uno y sus registros (hash del n-grama,
+   documento) se acumulan en un búfer; cuando el búfer llena su parte del
+   presupuesto se ordena y se escribe como un archivo ordenado (run).
+2. Los runs se mezclan (k-way merge, como merge de Merge Sort pero con k
+   entradas); si hay más runs que MERGE_FAN_IN se mezclan primero por
+   grupos. La mezcla entrega las listas de publicación de cada n-grama
+   en orden de hash.
+3. Los n-gramas compartidos por cada par se cuentan en un diccionario; al
+   llenar su parte del presupuesto se escribe ordenado como un run de pares.
+4. Los runs de pares se mezclan sumando los conteos de cada par y se
+   calcula la similitud de Jaccard. Los pares se entregan uno por uno.
+
+En memoria solo quedan los nombres y tamaños de los documentos. El
+resultado es el mismo que el del motor 'index'
+"""
+
+import os
+import shutil
+import tempfile
+from array import array
+from src.hash.fingerprint import hash64
+from src.index.sharded import _merge_records, _read_records, _write_atomic
+from src.utils.preprocessing import iter_documents_from_directory, preprocess_document
+
+# Presupuesto de memoria por defecto (bytes)
+DEFAULT_MEMORY_BUDGET = 1 << 30
+
+# Costo aproximado en memoria de un registro del búfer (entero de 96 bits, puntero de la
+# lista y espacio auxiliar del ordenamiento) y de una entrada del diccionario de pares
+SPILL_RECORD_BYTES = 64
+PAIR_ENTRY_BYTES = 128
+
+# Máximo de runs que se mezclan a la vez (archivos abiertos y búferes de lectura)
+MERGE_FAN_IN = 64
+
+# Fracción del presupuesto destinada a los búferes de lectura durante una mezcla
+READ_BUFFER_SHARE = 8
+
+def _read_block_records(memory_budget, file_count):
+    """
+    Calcula cuántos registros se leen de cada run por bloque durante una mezcla
+
+    Args:
+        memory_budget (int): Presupuesto de memoria (bytes)
+        file_count (int): Número de runs que se mezclan a la vez
+
+    Returns:
+        int: Registros por bloque (al menos 1024)
+    """
+    return max(1024, memory_budget // READ_BUFFER_SHARE // (16 * max(1, file_count)))
+
+def _write_run(path, records):
+    """
+    Escribe un run de registros ordenados (hash << 32 | documento) como pares de 64 bits
+
+    Args:
+        path (str): Ruta del archivo
+        records (list): Registros empaquetados ya ordenados
+    """
+    values = array('Q')
+    for record in records:
+        values.append(record >> 32)
+        values.append(record & 0xFFFFFFFF)
+    _write_atomic(path, values)
+
+def spill_sorted_runs(documents, work_dir, memory_budget=DEFAULT_MEMORY_BUDGET, ngram_size=3,
+                      encoding='text', window=None):
+    """
+    Preprocesa los documentos y escribe sus registros (hash, documento) en runs ordenados
+
+    Args:
+        documents (iterable): Tuplas (nombre, texto); solo el documento actual está en memoria
+        work_dir (str): Directorio de los archivos temporales
+        memory_budget (int): Presupuesto de memoria (bytes)
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+
+    Returns:
+        tuple: (nombres, tamaños, rutas de los runs); tamaños es un array('I')
+               con el número de n-gramas distintos de cada documento
+    """
+    capacity = max(1, memory_budget // SPILL_RECORD_BYTES)
+    names = []
+    sizes = array('I')
+    run_paths = []
+    buffer = []
+
+    def spill():
+        # Los registros empaquetados se ordenan por hash y, para un mismo hash, por documento
+        buffer.sort()
+        path = os.path.join(work_dir, f"postings_{len(run_paths):06d}.run")
+        _write_run(path, buffer)
+        run_paths.append(path)
+        buffer.clear()
+
+    for doc_id, (doc_name, text) in enumerate(documents):
+        ngrams = preprocess_document(text, ngram_size, encoding, window)
+        hashes = {hash64(ngram) for ngram in ngrams}
+        names.append(doc_name)
+        sizes.append(len(hashes))
+
+        for key in hashes:
+            buffer.append(key << 32 | doc_id)
+            if len(buffer) >= capacity:
+                spill()
+
+    if buffer:
+        spill()
+
+    return names, sizes, run_paths
+
+def merge_runs(run_paths, work_dir, memory_budget=DEFAULT_MEMORY_BUDGET, sum_counts=False):
+    """
+    Mezcla runs ordenados en un solo flujo, con pasadas intermedias si hay más de MERGE_FAN_IN
+
+    Args:
+        run_paths (list): Rutas de los runs (se eliminan a medida que se consumen)
+        work_dir (str): Directorio de los archivos temporales
+        memory_budget (int): Presupuesto de memoria (bytes)
+        sum_counts (bool): Sumar los valores de los registros con la misma clave
+
+    Yields:
+        tuple: Registros (clave, valor) en orden
+    """
+    run_paths = list(run_paths)
+    merge_pass = 0
+
+    # Pasadas intermedias: cada grupo de MERGE_FAN_IN runs se convierte en un run mayor
+    while len(run_paths) > MERGE_FAN_IN:
+        block_records = _read_block_records(memory_budget, MERGE_FAN_IN)
+        merged_paths = []
+        for group_start in range(0, len(run_paths), MERGE_FAN_IN):
+            group = run_paths[group_start:group_start + MERGE_FAN_IN]
+            path = os.path.join(work_dir, f"merge_{merge_pass:02d}_{len(merged_paths):06d}.run")
+            streams = [_read_records(run_path, block_records) for run_path in group]
+
+            with open(path + '.tmp', 'wb') as file:
+                values = array('Q')
+                for record in _merge_records(streams, sum_counts):
+                    values.extend(record)
+                    if len(values) >= 2 * block_records:
+                        values.tofile(file)
+                        values = array('Q')
+                values.tofile(file)
+            os.replace(path + '.tmp', path)
+
+            for run_path in group:
+                os.remove(run_path)
+            merged_paths.append(path)
+        run_paths = merged_paths
+        merge_pass += 1
+
+    block_records = _read_block_records(memory_budget, len(run_paths))
+    yield from _merge_records([_read_records(path, block_records) for path in run_paths], sum_counts)
+
+    for path in run_paths:
+        os.remove(path)
+
+def iter_posting_lists(run_paths, work_dir, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Reconstruye las listas de publicación a partir de los runs de registros
+
+    Args:
+        run_paths (list): Rutas de los runs de spill_sorted_runs
+        work_dir (str): Directorio de los archivos temporales
+        memory_budget (int): Presupuesto de memoria (bytes)
+
+    Yields:
+        array: Identificadores de documento (en orden creciente) que contienen cada n-grama
+    """
+    current_key = None
+    posting_list = array('I')
+
+    for key, doc_id in merge_runs(run_paths, work_dir, memory_budget):
+        if key != current_key:
+            if len(posting_list) > 1:
+                yield posting_list
+            current_key = key
+            posting_list = array('I')
+        posting_list.append(doc_id)
+
+    if len(posting_list) > 1:
+        yield posting_list
+
+def count_shared_ngrams(posting_lists, work_dir, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Cuenta los n-gramas compartidos por cada par en lotes de memoria acotada
+
+    Args:
+        posting_lists (iterable): Listas de publicación (ver iter_posting_lists)
+        work_dir (str): Directorio de los archivos temporales
+        memory_budget (int): Presupuesto de memoria (bytes)
+
+    Returns:
+        list: Rutas de los runs de pares (clave a << 32 | b, n-gramas compartidos) ordenados por clave
+    """
+    capacity = max(1, memory_budget // PAIR_ENTRY_BYTES)
+    shared_counts = {}
+    run_paths = []
+
+    def spill():
+        values = array('Q')
+        for pair in sorted(shared_counts):
+            values.append(pair)
+            values.append(shared_counts[pair])
+        path = os.path.join(work_dir, f"pairs_{len(run_paths):06d}.run")
+        _write_atomic(path, values)
+        run_paths.append(path)
+        shared_counts.clear()
+
+    # La capacidad se revisa con cada par nuevo: una lista de publicación de m
+    # documentos genera m²/2 pares y puede repartirse entre varios runs
+    for posting_list in posting_lists:
+        for i in range(len(posting_list)):
+            high = posting_list[i] << 32
+            for j in range(i + 1, len(posting_list)):
+                pair = high | posting_list[j]
+                count = shared_counts.get(pair)
+                if count is not None:
+                    shared_counts[pair] = count + 1
+                    continue
+                shared_counts[pair] = 1
+                if len(shared_counts) >= capacity:
+                    spill()
+
+    if shared_counts:
+        spill()
+
+    return run_paths
+
+def iter_external_similarities(documents, work_dir=None, memory_budget=DEFAULT_MEMORY_BUDGET, ngram_size=3,
+                               encoding='text', window=None, threshold=0.0):
+    """
+    Calcula la similitud de Jaccard de todos los pares con memoria acotada
+
+    Args:
+        documents (iterable): Tuplas (nombre, texto)
+        work_dir (str): Directorio de los archivos temporales (por defecto uno temporal que se elimina al terminar)
+        memory_budget (int): Presupuesto de memoria (bytes)
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing
+        threshold (float): Similitud mínima para entregar un par
+
+    Yields:
+        dict: {'doc_a', 'doc_b', 'similarity'} en el mismo orden que el motor 'index'
+    """
+    temporary = work_dir is None
+    if temporary:
+        work_dir = tempfile.mkdtemp(prefix='plagio_')
+    else:
+        os.makedirs(work_dir, exist_ok=True)
+
+    try:
+        names, sizes, run_paths = spill_sorted_runs(documents, work_dir, memory_budget,
+                                                    ngram_size, encoding, window)
+        pair_paths = count_shared_ngrams(iter_posting_lists(run_paths, work_dir, memory_budget),
+                                         work_dir, memory_budget)
+
+        for pair, shared in merge_runs(pair_paths, work_dir, memory_budget, sum_counts=True):
+            i = pair >> 32
+            j = pair & 0xFFFFFFFF
+            similarity = shared / (sizes[i] + sizes[j] - shared)
+            if similarity >= threshold:
+                yield {
+                    'doc_a': names[i],
+                    'doc_b': names[j],
+                    'similarity': similarity
+                }
+    finally:
+        if temporary:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+def calculate_similarity_external(documents_dir, work_dir=None, memory_budget=DEFAULT_MEMORY_BUDGET,
+                                  ngram_size=3, encoding='text', window=None, threshold=0.0):
+    """
+    Calcula la similitud de los documentos de un directorio leyéndolos de uno en uno
+
+    Args:
+        documents_dir (str): Directorio con los documentos
+        work_dir (str): Directorio de los archivos temporales
+        memory_budget (int): Presupuesto de memoria (bytes)
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas
+        window (int): Ventana de winnowing
+        threshold (float): Similitud mínima para entregar un par
+
+    Yields:
+        dict: Pares de documentos con su similitud
+    """
+    yield from iter_external_similarities(iter_documents_from_directory(documents_dir), work_dir,
+                                          memory_budget, ngram_size, encoding, window, threshold)
+
+# Ejecución desde la línea de comandos
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.sorting.merge_sort import get_top_similar_pairs
+    from src.visualization.graph import generate_similarity_table
+
+    parser = argparse.ArgumentParser(description="Similitud de todos los pares en memoria externa")
+    parser.add_argument('documents_dir', help="Directorio con los documentos")
+    parser.add_argument('--memory', type=int, default=DEFAULT_MEMORY_BUDGET >> 20, metavar='MB',
+                        help="Presupuesto de memoria en MB")
+    parser.add_argument('--work-dir', default=None, help="Directorio de los archivos temporales")
+    parser.add_argument('--ngram-size', type=int, default=3, help="Tamaño de los n-gramas")
+    parser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación de los n-gramas")
+    parser.add_argument('--winnow', type=int, default=None, metavar='VENTANA', help="Ventana de winnowing")
+    parser.add_argument('--threshold', type=float, default=0.0, help="Similitud mínima")
+    parser.add_argument('--top', type=int, default=10, help="Número de pares a mostrar")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    similarity_pairs = calculate_similarity_external(args.documents_dir, args.work_dir, args.memory << 20,
+                                                     args.ngram_size, args.encoding, args.winnow, args.threshold)
+    print(generate_similarity_table(get_top_similar_pairs(similarity_pairs, args.top)))
+    print(f"Completado en {time.time() - start_time:.2f} segundos.")
@@ -0,0 +1,419 @@
+# Mantenimiento incremental de los resultados del detector
+"""
+Módulo para actualizar los resultados cuando cambia la carpeta de entregas
+sin recalcular todos los pares. El estado guarda, por documento, sus hashes
+de n-gramas y su tamaño, fecha de modificación y hash del contenido, además
+de la similitud de cada par con n-gramas en común y el top N actual.
+
+- Al agregar un documento solo se calculan sus pares con los documentos
+  existentes: un índice invertido n-grama -> documentos da los documentos que
+  comparten algún n-grama con él, así que el costo es O(n) y no O(n²).
+- Al eliminarlo se borran sus pares (guardados también por documento) y sus
+  entradas del índice; el top N solo se recalcula si contenía alguno de esos pares.
+- Un documento modificado se elimina y se vuelve a agregar.
+
+sync() compara el estado con un directorio y aplica los cambios; watch()
+lo repite periódicamente (sondeo, sin dependencias externas)
+"""
+
+import json
+import os
+import struct
+import time
+from array import array
+from src.hash.fingerprint import hash64
+from src.sorting.top_n import TopNCollector
+from src.utils.cache import content_digest
+from src.utils.preprocessing import list_document_paths, preprocess_document, read_document
+
+STATE_MAGIC = b'PLAGINC1'
+
+class IncrementalDetector:
+    """
+    Clase IncrementalDetector - Similitud de todos los pares mantenida documento a documento
+    """
+
+    def __init__(self, ngram_size=3, encoding='text', window=None, top_n=10, min_similarity=0.0):
+        """
+        Constructor de un estado vacío
+
+        Args:
+            ngram_size (int): Tamaño de los n-gramas
+            encoding (str): Codificación de los n-gramas ('text' o 'ids')
+            window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+            top_n (int): Número de pares del top N
+            min_similarity (float): Similitud mínima para guardar un par
+        """
+        self.ngram_size = ngram_size
+        self.encoding = encoding
+        self.window = window
+        self.top_n = top_n
+        self.min_similarity = min_similarity
+
+        # Por identificador de documento (None en los eliminados): nombre, hashes
+        # ordenados y (tamaño, mtime_ns, hash del contenido) del archivo
+        self.document_names = []
+        self.document_hashes = []
+        self.document_stats = []
+        self.document_ids = {}
+        # Similitudes guardadas en ambos sentidos: documento -> {otro documento: similitud}
+        self.neighbors = {}
+        # Índice invertido hash de n-grama -> documentos (se reconstruye al cargar)
+        self.postings = {}
+        self.top_pairs = []
+
+    def _pair(self, doc_id, other_id, similarity):
+        """
+        Construye el diccionario de un par con los nombres en orden
+
+        Args:
+            doc_id (int): Primer documento
+            other_id (int): Segundo documento
+            similarity (float): Similitud del par
+
+        Returns:
+            dict: {'doc_a', 'doc_b', 'similarity'}
+        """
+        doc_a, doc_b = sorted((self.document_names[doc_id], self.document_names[other_id]))
+        return {'doc_a': doc_a, 'doc_b': doc_b, 'similarity': similarity}
+
+    def _recompute_top(self):
+        """
+        Recalcula el top N a partir de todos los pares guardados
+        """
+        collector = TopNCollector(self.top_n)
+        for doc_id, partners in self.neighbors.items():
+            for other_id, similarity in partners.items():
+                if doc_id < other_id:
+                    collector.add(self._pair(doc_id, other_id, similarity))
+        self.top_pairs = collector.results()
+
+    def add_document(self, doc_name, ngrams, stat=None):
+        """
+        Agrega un documento y calcula solo sus pares con los documentos existentes
+
+        Args:
+            doc_name (str): Nombre del documento
+            ngrams (iterable): N-gramas del documento
+            stat (tuple): (tamaño, mtime_ns, hash del contenido) del archivo, si se conoce
+
+        Returns:
+            list: Pares nuevos guardados
+        """
+        if doc_name in self.document_ids:
+            self.remove_document(doc_name)
+
+        hashes = array('Q', sorted({hash64(ngram) for ngram in ngrams}))
+        doc_id = len(self.document_names)
+        self.document_names.append(doc_name)
+        self.document_hashes.append(hashes)
+        self.document_stats.append(stat)
+        self.document_ids[doc_name] = doc_id
+
+        # N-gramas compartidos con cada documento existente, solo a través del índice
+        shared_counts = {}
+        for key in hashes:
+            for other_id in self.postings.get(key, ()):
+                shared_counts[other_id] = shared_counts.get(other_id, 0) + 1
+
+        partners = {}
+        new_pairs = []
+        for other_id, shared in shared_counts.items():
+            similarity = shared / (len(hashes) + len(self.document_hashes[other_id]) - shared)
+            if similarity >= self.min_similarity:
+                partners[other_id] = similarity
+                self.neighbors[other_id][doc_id] = similarity
+                new_pairs.append(self._pair(doc_id, other_id, similarity))
+        self.neighbors[doc_id] = partners
+
+        for key in hashes:
+            self.postings.setdefault(key, []).append(doc_id)
+
+        # El nuevo top N sale del top actual y de los pares nuevos
+        collector = TopNCollector(self.top_n)
+        collector.add_many(self.top_pairs)
+        collector.add_many(new_pairs)
+        self.top_pairs = collector.results()
+
+        return new_pairs
+
+    def remove_document(self, doc_name):
+        """
+        Elimina un documento y todos sus pares
+
+        Args:
+            doc_name (str): Nombre del documento
+
+        Returns:
+            int: Número de pares eliminados
+        """
+        doc_id = self.document_ids.pop(doc_name)
+        partners = self.neighbors.pop(doc_id)
+        for other_id in partners:
+            del self.neighbors[other_id][doc_id]
+
+        for key in self.document_hashes[doc_id]:
+            documents = self.postings[key]
+            documents.remove(doc_id)
+            if not documents:
+                del self.postings[key]
+
+        self.document_names[doc_id] = None
+        self.document_hashes[doc_id] = None
+        self.document_stats[doc_id] = None
+
+        if any(doc_name in (pair['doc_a'], pair['doc_b']) for pair in self.top_pairs):
+            self._recompute_top()
+
+        return len(partners)
+
+    def sync(self, documents_dir, recursive=True):
+        """
+        Aplica al estado los documentos agregados, modificados y eliminados de un directorio
+
+        Args:
+            documents_dir (str): Directorio con los documentos
+            recursive (bool): Si es True también se recorren los subdirectorios
+
+        Returns:
+            dict: Listas de nombres 'added', 'changed' y 'removed'
+        """
+        changes = {'added': [], 'changed': [], 'removed': []}
+        current = set()
+
+        for doc_name, file_path in list_document_paths(documents_dir, recursive):
+            current.add(doc_name)
+            file_stat = os.stat(file_path)
+            doc_id = self.document_ids.get(doc_name)
+            previous = self.document_stats[doc_id] if doc_id is not None else None
+
+            # Mismo tamaño y fecha: el documento no cambió y no se lee
+            if previous and previous[:2] == (file_stat.st_size, file_stat.st_mtime_ns):
+                continue
+
+            text = read_document(file_path)
+            digest = content_digest(text)
+            stat = (file_stat.st_size, file_stat.st_mtime_ns, digest)
+            if previous and previous[2] == digest:
+                self.document_stats[doc_id] = stat
+                continue
+
+            ngrams = preprocess_document(text, self.ngram_size, self.encoding, self.window)
+            self.add_document(doc_name, ngrams, stat)
+            changes['changed' if previous else 'added'].append(doc_name)
+
+        for doc_name in [name for name in self.document_ids if name not in current]:
+            self.remove_document(doc_name)
+            changes['removed'].append(doc_name)
+
+        return changes
+
+    def iter_pairs(self):
+        """
+        Recorre todos los pares guardados
+
+        Yields:
+            dict: {'doc_a', 'doc_b', 'similarity'}
+        """
+        for doc_id, partners in self.neighbors.items():
+            for other_id, similarity in partners.items():
+                if doc_id < other_id:
+                    yield self._pair(doc_id, other_id, similarity)
+
+    def save(self, path):
+        """
+        Guarda el estado en un archivo binario (de forma atómica)
+
+        Los identificadores se renumeran sin los documentos eliminados
+
+        Args:
+            path (str): Ruta del archivo
+        """
+        live_ids = [doc_id for doc_id, name in enumerate(self.document_names) if name is not None]
+        new_ids = {doc_id: position for position, doc_id in enumerate(live_ids)}
+
+        hash_counts = array('Q')
+        hashes = array('Q')
+        for doc_id in live_ids:
+            hash_counts.append(len(self.document_hashes[doc_id]))
+            hashes.extend(self.document_hashes[doc_id])
+
+        pair_keys = array('Q')
+        similarities = array('d')
+        for doc_id in live_ids:
+            for other_id, similarity in self.neighbors[doc_id].items():
+                if doc_id < other_id:
+                    pair_keys.append(new_ids[doc_id] << 32 | new_ids[other_id])
+                    similarities.append(similarity)
+
+        metadata = json.dumps({
+            'ngram_size': self.ngram_size,
+            'encoding': self.encoding,
+            'window': self.window,
+            'top_n': self.top_n,
+            'min_similarity': self.min_similarity,
+            'documents': [
+                [self.document_names[doc_id]] + (
+                    [self.document_stats[doc_id][0], self.document_stats[doc_id][1], self.document_stats[doc_id][2].hex()]
+                    if self.document_stats[doc_id] else [])
+                for doc_id in live_ids
+            ],
+            'top_pairs': self.top_pairs,
+            'hash_count': len(hashes),
+            'pair_count': len(pair_keys)
+        }).encode('utf-8')
+
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(STATE_MAGIC)
+            file.write(struct.pack('<Q', len(metadata)))
+            file.write(metadata)
+            hash_counts.tofile(file)
+            hashes.tofile(file)
+            pair_keys.tofile(file)
+            similarities.tofile(file)
+
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Carga un estado guardado con save()
+
+        Args:
+            path (str): Ruta del archivo
+
+        Returns:
+            IncrementalDetector: Estado cargado
+        """
+        with open(path, 'rb') as file:
+            if file.read(len(STATE_MAGIC)) != STATE_MAGIC:
+                raise ValueError(f"El archivo {path} no es un estado del detector incremental")
+
+            metadata_length = struct.unpack('<Q', file.read(8))[0]
+            metadata = json.loads(file.read(metadata_length).decode('utf-8'))
+            document_count = len(metadata['documents'])
+
+            hash_counts = array('Q')
+            hash_counts.fromfile(file, document_count)
+            hashes = array('Q')
+            hashes.fromfile(file, metadata['hash_count'])
+            pair_keys = array('Q')
+            pair_keys.fromfile(file, metadata['pair_count'])
+            similarities = array('d')
+            similarities.fromfile(file, metadata['pair_count'])
+
+        detector = cls(metadata['ngram_size'], metadata['encoding'], metadata['window'],
+                       metadata['top_n'], metadata['min_similarity'])
+
+        offset = 0
+        for doc_id, (document, count) in enumerate(zip(metadata['documents'], hash_counts)):
+            document_hashes = hashes[offset:offset + count]
+            offset += count
+            detector.document_names.append(document[0])
+            detector.document_hashes.append(document_hashes)
+            detector.document_stats.append((document[1], document[2], bytes.fromhex(document[3]))
+                                           if len(document) > 1 else None)
+            detector.document_ids[document[0]] = doc_id
+            detector.neighbors[doc_id] = {}
+            for key in document_hashes:
+                detector.postings.setdefault(key, []).append(doc_id)
+
+        for pair, similarity in zip(pair_keys, similarities):
+            doc_id = pair >> 32
+            other_id = pair & 0xFFFFFFFF
+            detector.neighbors[doc_id][other_id] = similarity
+            detector.neighbors[other_id][doc_id] = similarity
+
+        detector.top_pairs = metadata['top_pairs']
+        return detector
+
+    def __len__(self):
+        return len(self.document_ids)
+
+def open_state(state_path, ngram_size=3, encoding='text', window=None, top_n=10, min_similarity=0.0):
+    """
+    Carga el estado si el archivo existe o crea uno vacío
+
+    Args:
+        state_path (str): Ruta del archivo de estado
+        ngram_size (int): Tamaño de los n-gramas (solo para un estado nuevo)
+        encoding (str): Codificación de los n-gramas (solo para un estado nuevo)
+        window (int): Ventana de winnowing (solo para un estado nuevo)
+        top_n (int): Número de pares del top N (solo para un estado nuevo)
+        min_similarity (float): Similitud mínima para guardar un par (solo para un estado nuevo)
+
+    Returns:
+        IncrementalDetector: Estado del detector
+    """
+    if os.path.exists(state_path):
+        return IncrementalDetector.load(state_path)
+    return IncrementalDetector(ngram_size, encoding, window, top_n, min_similarity)
+
+def watch(documents_dir, state_path, detector=None, interval=2.0, on_change=None, max_iterations=None):
+    """
+    Revisa periódicamente un directorio y actualiza el estado cuando cambia
+
+    Args:
+        documents_dir (str): Directorio con los documentos
+        state_path (str): Archivo donde se guarda el estado después de cada cambio
+        detector (IncrementalDetector): Estado inicial (por defecto se carga de state_path)
+        interval (float): Segundos entre revisiones
+        on_change (callable): Función que recibe (detector, cambios) después de cada cambio
+        max_iterations (int): Número de revisiones (None = sin límite)
+    """
+    if detector is None:
+        detector = open_state(state_path)
+
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        if iteration:
+            time.sleep(interval)
+        iteration += 1
+
+        changes = detector.sync(documents_dir)
+        if any(changes.values()):
+            detector.save(state_path)
+            if on_change:
+                on_change(detector, changes)
+
+# Ejecución desde la línea de comandos
+if __name__ == "__main__":
+    import argparse
+    from src.visualization.graph import generate_similarity_table
+
+    parser = argparse.ArgumentParser(description="Resultados incrementales del detector de plagio")
+    parser.add_argument('command', choices=['sync', 'watch', 'top'],
+                        help="sync: aplicar los cambios una vez; watch: revisar periódicamente; top: mostrar el top N")
+    parser.add_argument('documents_dir', nargs='?', default='./documentos', help="Directorio con los documentos")
+    parser.add_argument('--state', default='resultados/estado_incremental.bin', help="Archivo de estado")
+    parser.add_argument('--interval', type=float, default=2.0, help="Segundos entre revisiones (watch)")
+    parser.add_argument('--ngram-size', type=int, default=3, help="Tamaño de los n-gramas (estado nuevo)")
+    parser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación de los n-gramas (estado nuevo)")
+    parser.add_argument('--winnow', type=int, default=None, metavar='VENTANA', help="Ventana de winnowing (estado nuevo)")
+    parser.add_argument('--top', type=int, default=10, help="Número de pares del top N (estado nuevo)")
+    parser.add_argument('--min-similarity', type=float, default=0.0, help="Similitud mínima de un par guardado (estado nuevo)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.state)), exist_ok=True)
+    detector = open_state(args.state, args.ngram_size, args.encoding, args.winnow, args.top, args.min_similarity)
+
+    def report(detector, changes):
+        print(f"Agregados: {len(changes['added'])}, modificados: {len(changes['changed'])}, "
+              f"eliminados: {len(changes['removed'])} ({len(detector)} documentos)")
+        print(generate_similarity_table(detector.top_pairs))
+
+    if args.command == 'top':
+        print(generate_similarity_table(detector.top_pairs))
+    elif args.command == 'sync':
+        start_time = time.time()
+        changes = detector.sync(args.documents_dir)
+        detector.save(args.state)
+        report(detector, changes)
+        print(f"Completado en {time.time() - start_time:.2f} segundos.")
+    else:
+        print(f"Revisando {args.documents_dir} cada {args.interval} segundos (Ctrl+C para terminar)...")
+        try:
+            watch(args.documents_dir, args.state, detector, args.interval, report)
+        except KeyboardInterrupt:
+            print("\nRevisión terminada.")
@@ -0,0 +1,356 @@
+# Servicio del detector de plagio con el índice residente en memoria
+"""
+Servidor HTTP (asyncio) que carga o construye el índice del corpus una sola
+vez y lo mantiene en memoria. Recibe entregas nuevas para agregarlas al
+índice y responde consultas de similitud de forma concurrente.
+
+Las solicitudes se agrupan en lotes. El preprocesamiento (limpieza y
+n-gramas, la parte costosa en CPU) de cada lote se reparte entre los
+procesos de un pool configurable y se mantienen varios lotes en curso a la
+vez (dos por proceso). La puntuación contra el índice y las altas se hacen
+en un hilo dedicado, en el orden de llegada, así que el bucle de eventos
+sigue atendiendo /stats y nuevas solicitudes mientras se puntúa un lote.
+
+Rutas:
+    POST /query  {"name": ..., "text": ..., "top": 10, "min_similarity": 0.0, "add": false}
+    POST /add    {"name": ..., "text": ...}
+    POST /save   guarda el índice (incluidos los documentos agregados)
+    GET  /stats  número de documentos y n-gramas del índice
+"""
+
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.index.corpus_index import CorpusIndex, DuplicateDocumentError, build_corpus_index
+from src.utils.preprocessing import preprocess_document
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 409: 'Conflict', 500: 'Internal Server Error'}
+
+def _preprocess_requests(items, n, encoding, window):
+    """
+    Preprocesa el texto de un lote de solicitudes (se ejecuta en el pool de procesos)
+
+    Args:
+        items (list): Lista de tuplas (nombre, texto)
+        n (int): Tamaño del n-grama
+        encoding (str): Codificación de los n-gramas
+        window (int): Ventana de winnowing
+
+    Returns:
+        list: N-gramas de cada solicitud, en el mismo orden
+    """
+    return [preprocess_document(text, n, encoding, window) for _, text in items]
+
+class DetectorService:
+    """
+    Clase DetectorService - Atiende consultas y altas sobre un CorpusIndex residente
+    """
+
+    def __init__(self, corpus_index, index_file=None, workers=1, batch_size=32, batch_delay=0.005):
+        """
+        Constructor del servicio
+
+        Args:
+            corpus_index (CorpusIndex): Índice del corpus ya cargado
+            index_file (str): Archivo donde /save guarda el índice
+            workers (int): Procesos para el preprocesamiento de los lotes
+            batch_size (int): Máximo de solicitudes por lote
+            batch_delay (float): Segundos que se espera para completar un lote
+        """
+        self.index = corpus_index
+        self.index_file = index_file
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.executor = None
+        # Hilo único dueño del índice: puntúa, agrega y guarda sin carreras entre sí
+        self.index_executor = None
+        self.queue = None
+        self._in_flight = None
+        self._tasks = []
+
+    async def start(self):
+        """
+        Inicia los pools y las tareas que preparan y aplican los lotes
+        """
+        self.queue = asyncio.Queue()
+        # Lotes con el preprocesamiento en curso: como máximo dos por proceso
+        self._in_flight = asyncio.Queue(maxsize=2 * max(1, self.workers))
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Crear los procesos antes de aceptar conexiones: un proceso creado con fork
+            # más tarde heredaría los sockets abiertos y las respuestas no se cerrarían
+            await asyncio.get_running_loop().run_in_executor(self.executor, int)
+        self.index_executor = ThreadPoolExecutor(max_workers=1)
+        self._tasks = [asyncio.create_task(self._batch_loop()), asyncio.create_task(self._apply_loop())]
+
+    async def stop(self):
+        """
+        Detiene las tareas de lotes y los pools
+        """
+        for task in self._tasks:
+            task.cancel()
+        if self.executor:
+            self.executor.shutdown()
+        if self.index_executor:
+            self.index_executor.shutdown()
+
+    async def submit(self, operation, request):
+        """
+        Encola una solicitud y espera su resultado
+
+        Args:
+            operation (str): 'query' o 'add'
+            request (dict): Cuerpo de la solicitud
+
+        Returns:
+            dict: Resultado de la operación
+        """
+        if not isinstance(request, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON")
+        if not isinstance(request.get('name'), str) or not isinstance(request.get('text'), str):
+            raise ValueError("Se requieren los campos 'name' y 'text'")
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((operation, request, future))
+        return await future
+
+    async def save(self):
+        """
+        Guarda el índice en index_file desde el hilo del índice
+
+        Returns:
+            dict: Archivo y número de documentos guardados
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.index_executor, self.index.save, self.index_file)
+        return {'saved': self.index_file, 'documents': len(self.index)}
+
+    async def _batch_loop(self):
+        """
+        Agrupa las solicitudes pendientes en lotes y reparte su preprocesamiento
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_delay
+
+            # Completar el lote con lo que llegue antes del plazo
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Un trozo del lote por proceso; el preprocesamiento se hace fuera del bucle de eventos
+            items = [(request['name'], request['text']) for _, request, _ in batch]
+            chunk_size = -(-len(items) // max(1, self.workers))
+            preprocessing = asyncio.gather(*(
+                loop.run_in_executor(self.executor, _preprocess_requests, items[start:start + chunk_size],
+                                     self.index.ngram_size, self.index.encoding, self.index.window)
+                for start in range(0, len(items), chunk_size)
+            ))
+
+            # Espera solo si ya hay demasiados lotes en curso
+            await self._in_flight.put((batch, preprocessing))
+
+    async def _apply_loop(self):
+        """
+        Aplica los lotes ya preprocesados en el orden de llegada, en el hilo del índice
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch, preprocessing = await self._in_flight.get()
+            try:
+                chunks = await preprocessing
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            operations = [(operation, request) for operation, request, _ in batch]
+            batch_ngrams = [ngrams for chunk in chunks for ngrams in chunk]
+            outcomes = await loop.run_in_executor(self.index_executor, self._apply_batch, operations, batch_ngrams)
+
+            for (_, _, future), (error, result) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _apply_batch(self, operations, batch_ngrams):
+        """
+        Aplica un lote de operaciones (se ejecuta en el hilo del índice)
+
+        Args:
+            operations (list): Tuplas (operación, solicitud) en el orden de llegada
+            batch_ngrams (list): N-gramas de cada solicitud, en el mismo orden
+
+        Returns:
+            list: Tuplas (excepción o None, resultado) de cada solicitud
+        """
+        outcomes = []
+        for (operation, request), ngrams in zip(operations, batch_ngrams):
+            try:
+                outcomes.append((None, self._apply(operation, request, ngrams)))
+            except Exception as e:
+                outcomes.append((e, None))
+        return outcomes
+
+    def _apply(self, operation, request, ngrams):
+        """
+        Puntúa o agrega un documento ya preprocesado
+
+        Args:
+            operation (str): 'query' o 'add'
+            request (dict): Cuerpo de la solicitud
+            ngrams (list | array): N-gramas del documento
+
+        Returns:
+            dict: Resultado de la operación
+        """
+        name = request['name']
+        result = {'name': name}
+
+        if operation == 'query':
+            result['matches'] = self.index.query(ngrams, int(request.get('top', 10)), name,
+                                                 float(request.get('min_similarity', 0.0)))
+
+        if operation == 'add' or request.get('add'):
+            result['doc_id'] = self.index.add_document(name, ngrams)
+
+        return result
+
+    def stats(self):
+        """
+        Obtiene información básica del índice
+
+        Returns:
+            dict: Documentos, n-gramas indexados y parámetros de preprocesamiento
+        """
+        return {
+            'documents': len(self.index),
+            'ngram_keys': len(self.index.keys),
+            'ngram_size': self.index.ngram_size,
+            'encoding': self.index.encoding,
+            'window': self.index.window
+        }
+
+    async def handle_connection(self, reader, writer):
+        """
+        Atiende una conexión HTTP (una solicitud por conexión)
+
+        Args:
+            reader (StreamReader): Flujo de lectura
+            writer (StreamWriter): Flujo de escritura
+        """
+        status = 200
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            method, path, _ = request_line.split(' ', 2)
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            body = json.loads(await reader.readexactly(length)) if length else {}
+
+            if method == 'GET' and path == '/stats':
+                response = self.stats()
+            elif method == 'POST' and path in ('/query', '/add'):
+                response = await self.submit(path[1:], body)
+            elif method == 'POST' and path == '/save' and self.index_file:
+                response = await self.save()
+            else:
+                status, response = 404, {'error': f"Ruta no encontrada: {method} {path}"}
+        except DuplicateDocumentError as e:
+            status, response = 409, {'error': str(e)}
+        except ValueError as e:
+            status, response = 400, {'error': str(e)}
+        except Exception as e:
+            status, response = 500, {'error': str(e)}
+
+        payload = json.dumps(response, ensure_ascii=False).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + payload
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+async def serve(service, host='127.0.0.1', port=8765, unix_socket=None):
+    """
+    Inicia el servidor y atiende solicitudes hasta que se interrumpa
+
+    Args:
+        service (DetectorService): Servicio a exponer
+        host (str): Dirección de escucha TCP
+        port (int): Puerto TCP
+        unix_socket (str): Si se indica, se escucha en este socket Unix en lugar de TCP
+    """
+    await service.start()
+
+    if unix_socket:
+        server = await asyncio.start_unix_server(service.handle_connection, path=unix_socket)
+        print(f"Servicio escuchando en {unix_socket}")
+    else:
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        print(f"Servicio escuchando en http://{host}:{port}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+# Ejecución desde la línea de comandos
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servicio del detector de plagio con el índice en memoria")
+    parser.add_argument('--index', help="Archivo de índice (se carga si existe, se crea con /save)")
+    parser.add_argument('--documents', help="Directorio para construir el índice si no hay archivo")
+    parser.add_argument('--ngram-size', type=int, default=3, help="Tamaño de los n-gramas al construir")
+    parser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación al construir")
+    parser.add_argument('--winnow', type=int, default=None, metavar='VENTANA', help="Ventana de winnowing al construir")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección de escucha")
+    parser.add_argument('--port', type=int, default=8765, help="Puerto de escucha")
+    parser.add_argument('--unix-socket', default=None, help="Socket Unix en lugar de TCP")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="Procesos para preprocesar los lotes")
+    parser.add_argument('--batch-size', type=int, default=32, help="Máximo de solicitudes por lote")
+    parser.add_argument('--batch-delay', type=float, default=0.005, help="Espera máxima para completar un lote (s)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.index and os.path.exists(args.index):
+        corpus_index = CorpusIndex.load(args.index)
+    elif args.documents:
+        corpus_index = build_corpus_index(args.documents, args.ngram_size, args.encoding, args.winnow, args.workers)
+    else:
+        corpus_index = CorpusIndex(args.ngram_size, args.encoding, args.winnow)
+    print(f"Índice de {len(corpus_index)} documentos listo en {time.time() - start_time:.2f} segundos.")
+
+    service = DetectorService(corpus_index, args.index, args.workers, args.batch_size, args.batch_delay)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix_socket))
+    except KeyboardInterrupt:
+        print("\nServicio detenido.")
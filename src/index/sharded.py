@@ -0,0 +1,402 @@
+# Indexado por fragmentos (map-reduce) para corpus muy grandes
+"""
+Construcción del índice invertido y conteo de n-gramas compartidos en
+fases independientes, pensadas para ejecutarse en varios procesos o en
+varias máquinas que comparten un sistema de archivos:
+
+1. plan: se listan los documentos y se reparten en fragmentos contiguos;
+   cada documento recibe un identificador global (su posición en la lista).
+2. map: cada fragmento se preprocesa por separado y escribe, por cada rango
+   de hash, un archivo con los pares (hash del n-grama, documento) ordenados,
+   además del número de n-gramas distintos de cada documento.
+3. reduce: cada rango de hash mezcla (k-way merge) los archivos de todos los
+   fragmentos, obtiene la lista de publicación de cada n-grama y cuenta los
+   n-gramas compartidos por cada par de documentos.
+4. combine: mezcla (k-way merge) los conteos ordenados de todos los rangos,
+   suma los de cada par y calcula la similitud de Jaccard; los pares se
+   entregan uno por uno, sin reunirlos en memoria.
+
+El resultado es el mismo que el del motor 'index' en un solo proceso
+"""
+
+import heapq
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from src.hash.fingerprint import hash64
+from src.utils.preprocessing import list_document_paths, preprocess_document, read_document
+
+MANIFEST_FILE = 'manifest.json'
+
+# Registros (hash, documento) que se leen de cada archivo en cada bloque
+READ_BLOCK = 1 << 16
+
+def _shard_path(work_dir, shard, suffix):
+    """
+    Obtiene la ruta de un archivo de un fragmento
+
+    Args:
+        work_dir (str): Directorio de trabajo
+        shard (int): Número de fragmento
+        suffix (str): Final del nombre ('.sizes' o '_range_NNNN.postings')
+
+    Returns:
+        str: Ruta del archivo
+    """
+    return os.path.join(work_dir, f"shard_{shard:04d}{suffix}")
+
+def _range_path(work_dir, range_id):
+    """
+    Obtiene la ruta del archivo de conteos de un rango de hash
+
+    Args:
+        work_dir (str): Directorio de trabajo
+        range_id (int): Número de rango
+
+    Returns:
+        str: Ruta del archivo
+    """
+    return os.path.join(work_dir, f"range_{range_id:04d}.pairs")
+
+def _write_atomic(path, *arrays):
+    """
+    Escribe uno o más arreglos en un archivo de forma atómica (archivo temporal + reemplazo)
+
+    Args:
+        path (str): Ruta del archivo
+        *arrays (array): Arreglos a escribir en orden
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        for values in arrays:
+            values.tofile(file)
+    os.replace(temporary_path, path)
+
+def hash_range(key, range_count):
+    """
+    Obtiene el rango al que pertenece el hash de un n-grama
+
+    Args:
+        key (int): Hash de 64 bits
+        range_count (int): Número de rangos
+
+    Returns:
+        int: Rango entre 0 y range_count - 1
+    """
+    return (key * range_count) >> 64
+
+def plan_shards(documents_dir, work_dir, shard_count, range_count=None, ngram_size=3,
+                encoding='text', window=None, recursive=True):
+    """
+    Reparte los documentos de un directorio en fragmentos y guarda el plan
+
+    Args:
+        documents_dir (str): Directorio con los documentos
+        work_dir (str): Directorio de trabajo compartido
+        shard_count (int): Número de fragmentos (tareas map)
+        range_count (int): Número de rangos de hash (tareas reduce); por defecto shard_count
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+        recursive (bool): Si es True también se recorren los subdirectorios
+
+    Returns:
+        dict: Plan guardado en manifest.json
+    """
+    documents = list_document_paths(documents_dir, recursive)
+    shard_count = max(1, min(shard_count, len(documents) or 1))
+
+    # Fragmentos contiguos con un número similar de documentos
+    bounds = []
+    for shard in range(shard_count):
+        start = len(documents) * shard // shard_count
+        end = len(documents) * (shard + 1) // shard_count
+        bounds.append([start, end])
+
+    manifest = {
+        'ngram_size': ngram_size,
+        'encoding': encoding,
+        'window': window,
+        'shard_count': shard_count,
+        'range_count': range_count or shard_count,
+        'documents': [[name, os.path.abspath(path)] for name, path in documents],
+        'shard_bounds': bounds
+    }
+
+    os.makedirs(work_dir, exist_ok=True)
+    with open(os.path.join(work_dir, MANIFEST_FILE), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+
+    return manifest
+
+def load_manifest(work_dir):
+    """
+    Lee el plan de un directorio de trabajo
+
+    Args:
+        work_dir (str): Directorio de trabajo
+
+    Returns:
+        dict: Plan guardado por plan_shards
+    """
+    with open(os.path.join(work_dir, MANIFEST_FILE), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+def map_shard(work_dir, shard):
+    """
+    Preprocesa los documentos de un fragmento y escribe sus listas de publicación por rango
+
+    Args:
+        work_dir (str): Directorio de trabajo
+        shard (int): Número de fragmento
+
+    Returns:
+        int: Número de documentos procesados
+    """
+    manifest = load_manifest(work_dir)
+    start, end = manifest['shard_bounds'][shard]
+    range_count = manifest['range_count']
+    records = [[] for _ in range(range_count)]
+    sizes = array('I')
+
+    for doc_id in range(start, end):
+        _, path = manifest['documents'][doc_id]
+        ngrams = preprocess_document(read_document(path), manifest['ngram_size'],
+                                     manifest['encoding'], manifest['window'])
+        hashes = {hash64(ngram) for ngram in ngrams}
+        sizes.append(len(hashes))
+
+        for key in hashes:
+            records[hash_range(key, range_count)].append((key, doc_id))
+
+    for range_id, range_records in enumerate(records):
+        range_records.sort()
+        values = array('Q')
+        for key, doc_id in range_records:
+            values.append(key)
+            values.append(doc_id)
+        _write_atomic(_shard_path(work_dir, shard, f"_range_{range_id:04d}.postings"), values)
+
+    # El archivo de tamaños se escribe al final: su existencia indica que el fragmento terminó
+    _write_atomic(_shard_path(work_dir, shard, '.sizes'), sizes)
+    return end - start
+
+def _read_records(path, block_records=READ_BLOCK):
+    """
+    Lee por bloques los registros (hash, documento) de un archivo de fragmento
+
+    Args:
+        path (str): Ruta del archivo
+        block_records (int): Registros leídos en cada bloque
+
+    Yields:
+        tuple: (hash, identificador de documento) en orden
+    """
+    with open(path, 'rb') as file:
+        while True:
+            block = array('Q')
+            block.frombytes(file.read(block_records * 2 * block.itemsize))
+            if not block:
+                return
+            yield from zip(block[0::2], block[1::2])
+
+def _merge_records(streams, sum_counts):
+    """
+    Mezcla flujos ordenados de registros (clave, valor)
+
+    Args:
+        streams (list): Iteradores de registros ordenados
+        sum_counts (bool): Si es True los registros con la misma clave se combinan sumando sus valores
+
+    Yields:
+        tuple: Registros (clave, valor) en orden
+    """
+    merged = heapq.merge(*streams)
+    if not sum_counts:
+        yield from merged
+        return
+
+    current_key = None
+    total = 0
+    for key, value in merged:
+        if key != current_key:
+            if current_key is not None:
+                yield current_key, total
+            current_key = key
+            total = 0
+        total += value
+    if current_key is not None:
+        yield current_key, total
+
+def _count_pairs(posting_list, shared_counts):
+    """
+    Suma 1 a cada par de documentos de una lista de publicación
+
+    Args:
+        posting_list (list): Identificadores de documento en orden creciente
+        shared_counts (dict): Conteos {a << 32 | b: n-gramas compartidos}
+    """
+    for i in range(len(posting_list)):
+        high = posting_list[i] << 32
+        for j in range(i + 1, len(posting_list)):
+            pair = high | posting_list[j]
+            shared_counts[pair] = shared_counts.get(pair, 0) + 1
+
+def reduce_range(work_dir, range_id):
+    """
+    Mezcla las listas de publicación de un rango de hash y cuenta los n-gramas compartidos por par
+
+    Args:
+        work_dir (str): Directorio de trabajo
+        range_id (int): Número de rango
+
+    Returns:
+        int: Número de pares con al menos un n-grama compartido en este rango
+    """
+    manifest = load_manifest(work_dir)
+    paths = [_shard_path(work_dir, shard, f"_range_{range_id:04d}.postings")
+             for shard in range(manifest['shard_count'])]
+    shared_counts = {}
+    current_key = None
+    posting_list = []
+
+    # Los registros llegan ordenados por hash y, para un mismo hash, por documento
+    for key, doc_id in heapq.merge(*(_read_records(path) for path in paths)):
+        if key != current_key:
+            _count_pairs(posting_list, shared_counts)
+            current_key = key
+            posting_list = []
+        posting_list.append(doc_id)
+    _count_pairs(posting_list, shared_counts)
+
+    # Registros (par, conteo) ordenados por par, para mezclarlos después en combine_ranges
+    records = array('Q')
+    for pair in sorted(shared_counts):
+        records.append(pair)
+        records.append(shared_counts[pair])
+    _write_atomic(_range_path(work_dir, range_id), records)
+    return len(shared_counts)
+
+def combine_ranges(work_dir):
+    """
+    Mezcla los conteos de todos los rangos y calcula la similitud de cada par
+
+    Cada archivo de rango está ordenado por par, así que basta una mezcla k-way
+    que suma los conteos de un mismo par; en memoria solo quedan los nombres y
+    tamaños de los documentos y un bloque de lectura por rango
+
+    Args:
+        work_dir (str): Directorio de trabajo
+
+    Yields:
+        dict: {'doc_a', 'doc_b', 'similarity'} en el mismo orden que el motor 'index'
+    """
+    manifest = load_manifest(work_dir)
+    names = [name for name, _ in manifest['documents']]
+
+    sizes = array('I')
+    for shard in range(manifest['shard_count']):
+        with open(_shard_path(work_dir, shard, '.sizes'), 'rb') as file:
+            sizes.frombytes(file.read())
+
+    streams = [_read_records(_range_path(work_dir, range_id)) for range_id in range(manifest['range_count'])]
+    for pair, shared in _merge_records(streams, sum_counts=True):
+        i = pair >> 32
+        j = pair & 0xFFFFFFFF
+        yield {
+            'doc_a': names[i],
+            'doc_b': names[j],
+            'similarity': shared / (sizes[i] + sizes[j] - shared)
+        }
+
+def run_sharded(documents_dir, work_dir, workers=4, shard_count=None, range_count=None,
+                ngram_size=3, encoding='text', window=None):
+    """
+    Ejecuta localmente todas las fases con varios procesos
+
+    Args:
+        documents_dir (str): Directorio con los documentos
+        work_dir (str): Directorio de trabajo
+        workers (int): Número de procesos
+        shard_count (int): Número de fragmentos; por defecto uno por proceso
+        range_count (int): Número de rangos de hash; por defecto uno por proceso
+        ngram_size (int): Tamaño de los n-gramas
+        encoding (str): Codificación de los n-gramas
+        window (int): Ventana de winnowing
+
+    Returns:
+        iterator: Pares de documentos con su similitud (ver combine_ranges)
+    """
+    manifest = plan_shards(documents_dir, work_dir, shard_count or workers, range_count or workers,
+                           ngram_size, encoding, window)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        shards = range(manifest['shard_count'])
+        list(executor.map(map_shard, [work_dir] * len(shards), shards))
+
+        ranges = range(manifest['range_count'])
+        list(executor.map(reduce_range, [work_dir] * len(ranges), ranges))
+
+    return combine_ranges(work_dir)
+
+# Ejecución desde la línea de comandos
+if __name__ == "__main__":
+    import argparse
+    import time
+    from src.sorting.merge_sort import get_top_similar_pairs
+    from src.visualization.graph import generate_similarity_table
+
+    parser = argparse.ArgumentParser(description="Indexado por fragmentos (map-reduce)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = subparsers.add_parser('plan', help="Repartir los documentos en fragmentos")
+    plan_parser.add_argument('documents_dir', help="Directorio con los documentos")
+    plan_parser.add_argument('work_dir', help="Directorio de trabajo compartido")
+    plan_parser.add_argument('--shards', type=int, required=True, help="Número de fragmentos")
+    plan_parser.add_argument('--ranges', type=int, default=None, help="Número de rangos de hash")
+
+    map_parser = subparsers.add_parser('map', help="Procesar un fragmento")
+    map_parser.add_argument('work_dir', help="Directorio de trabajo compartido")
+    map_parser.add_argument('shard', type=int, help="Número de fragmento")
+
+    reduce_parser = subparsers.add_parser('reduce', help="Contar los n-gramas compartidos de un rango")
+    reduce_parser.add_argument('work_dir', help="Directorio de trabajo compartido")
+    reduce_parser.add_argument('range_id', type=int, help="Número de rango")
+
+    combine_parser = subparsers.add_parser('combine', help="Combinar los rangos y mostrar los pares")
+    combine_parser.add_argument('work_dir', help="Directorio de trabajo compartido")
+
+    run_parser = subparsers.add_parser('run', help="Ejecutar todas las fases localmente")
+    run_parser.add_argument('documents_dir', help="Directorio con los documentos")
+    run_parser.add_argument('work_dir', help="Directorio de trabajo")
+    run_parser.add_argument('-j', '--workers', type=int, default=4, help="Número de procesos")
+
+    for subparser in (plan_parser, run_parser):
+        subparser.add_argument('--ngram-size', type=int, default=3, help="Tamaño de los n-gramas")
+        subparser.add_argument('--encoding', default='text', choices=['text', 'ids'], help="Codificación de los n-gramas")
+        subparser.add_argument('--winnow', type=int, default=None, metavar='VENTANA', help="Ventana de winnowing")
+    for subparser in (combine_parser, run_parser):
+        subparser.add_argument('--top', type=int, default=10, help="Número de pares a mostrar")
+
+    args = parser.parse_args()
+    start_time = time.time()
+
+    if args.command == 'plan':
+        manifest = plan_shards(args.documents_dir, args.work_dir, args.shards, args.ranges,
+                               args.ngram_size, args.encoding, args.winnow)
+        print(f"{len(manifest['documents'])} documentos en {manifest['shard_count']} fragmentos "
+              f"y {manifest['range_count']} rangos.")
+    elif args.command == 'map':
+        print(f"Fragmento {args.shard}: {map_shard(args.work_dir, args.shard)} documentos procesados.")
+    elif args.command == 'reduce':
+        print(f"Rango {args.range_id}: {reduce_range(args.work_dir, args.range_id)} pares con n-gramas compartidos.")
+    else:
+        if args.command == 'run':
+            similarity_matrix = run_sharded(args.documents_dir, args.work_dir, args.workers,
+                                            ngram_size=args.ngram_size, encoding=args.encoding, window=args.winnow)
+        else:
+            similarity_matrix = combine_ranges(args.work_dir)
+        print(generate_similarity_table(get_top_similar_pairs(similarity_matrix, args.top)))
+
+    print(f"Completado en {time.time() - start_time:.2f} segundos.")
@@ -1,106 +1,302 @@
-# Punto de entrada principal del detector de plagio
-"""
-Detector de Plagio para Trabajos Estudiantiles
-Programa principal que integra todos los componentes
-"""
-
-import os
-import time
-from datetime import datetime
-from src.utils.preprocessing import preprocess_document, load_documents_from_directory
-from src.hash.hash_table import HashTable
-from src.hash.bloom_filter import BloomFilter
-from src.similarity.jaccard import calculate_similarity_matrix
-from src.sorting.merge_sort import get_top_similar_pairs
-from src.visualization.graph import generate_ascii_graph, generate_similarity_table
-
-def detect_plagiarism(documents_dir=r"C:\Users\ferne\OneDrive\Documentos\100Archivos\archivos", ngram_size=3, top_n=10, similarity_threshold=0.3):
-    """
-    Función principal del detector de plagio
-    
-    Args:
-        documents_dir (str): Directorio con los documentos a analizar
-        ngram_size (int): Tamaño de los n-gramas
-        top_n (int): Número de pares más similares a mostrar
-        similarity_threshold (float): Umbral de similitud para el grafo
-    """
-    print("=== Detector de Plagio para Trabajos Estudiantiles ===\n")
-    print(f"Analizando documentos en: {documents_dir}")
-    print(f"Tamaño de n-gramas: {ngram_size}")
-    
-    # Paso 1: Cargar documentos
-    print("\nCargando documentos...")
-    documents = load_documents_from_directory(documents_dir)
-    document_count = len(documents)
-    
-    if document_count == 0:
-        print("No se encontraron documentos para analizar.")
-        return
-    
-    print(f"Se cargaron {document_count} documentos.")
-    
-    # Paso 2: Preprocesar documentos y generar n-gramas
-    print("\nPreprocesando documentos y generando n-gramas...")
-    documents_ngrams = {}
-    hash_table = HashTable()
-    bloom_filter = BloomFilter(100000, 3)
-    
-    # Para cada documento, preprocesar y generar n-gramas
-    for doc_name, content in documents.items():
-        ngrams = preprocess_document(content, ngram_size)
-        documents_ngrams[doc_name] = ngrams
-        
-        # Paso 3: Almacenar n-gramas en la tabla hash y filtro de Bloom
-        for ngram in ngrams:
-            hash_table.insert(ngram, doc_name)
-            bloom_filter.add(ngram)
-        
-        print(f"  - {doc_name}: {len(ngrams)} n-gramas generados")
-    
-    # Paso 4: Calcular similitud entre documentos
-    print("\nCalculando similitud entre documentos...")
-    similarity_matrix = calculate_similarity_matrix(documents_ngrams)
-    
-    # Paso 5: Ordenar resultados usando Merge Sort
-    print("\nOrdenando resultados...")
-    top_similar_pairs = get_top_similar_pairs(similarity_matrix, top_n)
-    
-    # Paso 6: Mostrar los N pares más similares
-    print(f"\nTop {top_n} pares de documentos más similares:")
-    print(generate_similarity_table(top_similar_pairs))
-    
-    # Visualización adicional: grafo de similitud
-    print("\nGrafo de similitud entre documentos:")
-    print(generate_ascii_graph(top_similar_pairs, similarity_threshold))
-    
-    # Guardar resultados en un archivo
-    results_dir = './resultados'
-    if not os.path.exists(results_dir):
-        os.makedirs(results_dir)
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    results_file = os.path.join(results_dir, f"resultados_{timestamp}.txt")
-    
-    results = "=== RESULTADOS DEL DETECTOR DE PLAGIO ===\n\n"
-    results += f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    results += f"Documentos analizados: {document_count}\n"
-    results += f"Tamaño de n-gramas: {ngram_size}\n\n"
-    results += generate_similarity_table(top_similar_pairs)
-    results += "\n\n"
-    results += generate_ascii_graph(top_similar_pairs, similarity_threshold)
-    
-    with open(results_file, 'w', encoding='utf-8') as f:
-        f.write(results)
-    
-    print(f"\nResultados guardados en: {results_file}")
-
-if __name__ == "__main__":
-    import sys
-    
-    # Obtener argumentos de la línea de comandos
-    documents_dir = sys.argv[1] if len(sys.argv) > 1 else './documentos'
-    ngram_size = int(sys.argv[2]) if len(sys.argv) > 2 else 3
-    top_n = int(sys.argv[3]) if len(sys.argv) > 3 else 10
-    similarity_threshold = float(sys.argv[4]) if len(sys.argv) > 4 else 0.3
-    
-    detect_plagiarism(documents_dir, ngram_size, top_n, similarity_threshold)
\ No newline at end of file
+# Punto de entrada principal del detector de plagio
+"""
+Detector de Plagio para Trabajos Estudiantiles
+Programa principal que integra todos los componentes
+"""
+
+import os
+import time
+from datetime import datetime
+from src.utils.preprocessing import iter_documents_from_directory, list_document_paths, preprocess_stream, read_document
+from src.utils.cache import load_fingerprints
+from src.utils.metrics import PipelineMetrics, count_items, ngram_counts
+from src.hash.hash_table import HashTable, OpenAddressingHashTable
+from src.hash.bloom_filter import BloomFilter
+from src.similarity.jaccard import iter_similarities
+from src.similarity import minhash, lsh, parallel, ppjoin, sparse
+from src.similarity.inverted_index import calculate_similarity_from_index
+from src.similarity.simhash import find_near_duplicates
+from src.similarity.alignment import align_pairs, format_alignment
+from src.sorting.merge_sort import get_top_similar_pairs
+from src.visualization.graph import generate_ascii_graph, generate_similarity_table
+
+def index_documents(documents_ngrams, hash_table_type='chaining', verbose=True):
+    """
+    Almacena los n-gramas de cada documento en la tabla hash y el filtro de Bloom
+    
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        hash_table_type (str): 'chaining' (encadenamiento) u 'open' (direccionamiento abierto)
+        verbose (bool): Si es True muestra el número de n-gramas de cada documento
+        
+    Returns:
+        tuple: (hash_table, bloom_filter, document_sizes)
+    """
+    document_sizes = {}
+    hash_table = OpenAddressingHashTable() if hash_table_type == 'open' else HashTable()
+    bloom_filter = BloomFilter(100000, 3)
+    
+    # Para cada documento, registrar sus n-gramas
+    for doc_name, ngrams in documents_ngrams.items():
+        document_sizes[doc_name] = len(set(ngrams))
+        
+        for ngram in ngrams:
+            hash_table.insert(ngram, doc_name)
+        bloom_filter.add_many(ngrams)
+        
+        if verbose:
+            print(f"  - {doc_name}: {len(ngrams)} n-gramas generados")
+    
+    return hash_table, bloom_filter, document_sizes
+
+def calculate_similarities(documents_ngrams, similarity_method='jaccard', similarity_threshold=0.3,
+                           num_perm=128, workers=1, hash_table=None, document_sizes=None):
+    """
+    Calcula la similitud entre documentos con el motor indicado
+    
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        similarity_method (str): Motor de similitud (ver detect_plagiarism)
+        similarity_threshold (float): Umbral usado por 'lsh' para elegir bandas y filas y por
+            'ppjoin' como similitud mínima
+        num_perm (int): Número de permutaciones MinHash
+        workers (int): Procesos para 'jaccard'
+        hash_table (HashTable): Índice n-grama -> documentos, requerido por 'index'
+        document_sizes (dict): N-gramas distintos por documento, requerido por 'index'
+        
+    Returns:
+        iterable: Pares de documentos con su similitud (lista o generador)
+    """
+    if similarity_method == 'minhash':
+        return minhash.calculate_similarity_matrix(documents_ngrams, num_perm)
+    if similarity_method == 'lsh':
+        return lsh.calculate_similarity_matrix(documents_ngrams, similarity_threshold, num_perm)
+    if similarity_method == 'index':
+        return calculate_similarity_from_index(hash_table, document_sizes)
+    if similarity_method == 'sparse':
+        return sparse.calculate_similarity_matrix(documents_ngrams)
+    if similarity_method == 'ppjoin':
+        return ppjoin.calculate_similarity_matrix(documents_ngrams, similarity_threshold)
+    if workers > 1:
+        return parallel.iter_similarities(documents_ngrams, workers)
+    
+    # Los pares se consumen a medida que se generan, sin materializar la lista completa
+    return iter_similarities(documents_ngrams)
+
+def detect_plagiarism(documents_dir=r"C:\Users\ferne\OneDrive\Documentos\100Archivos\archivos", ngram_size=3, top_n=10, similarity_threshold=0.3,
+                      similarity_method='jaccard', num_perm=128, workers=1,
+                      ngram_encoding='text', hash_table_type='chaining', cache_file=None,
+                      winnow_window=None, metrics=None, simhash_distance=None, align_passages=False):
+    """
+    Función principal del detector de plagio
+    
+    Args:
+        documents_dir (str): Directorio con los documentos a analizar
+        ngram_size (int): Tamaño de los n-gramas
+        top_n (int): Número de pares más similares a mostrar
+        similarity_threshold (float): Umbral de similitud para el grafo
+        similarity_method (str): 'jaccard' (exacto), 'minhash' (estimado con firmas)
+            'lsh' (solo pares candidatos según similarity_threshold), 'index'
+            (exacto, a partir de las listas de publicación de la tabla hash), 'sparse'
+            (exacto, producto de matrices dispersas con NumPy/SciPy) o 'ppjoin' (exacto,
+            solo los pares con similitud >= similarity_threshold, con filtros de tamaño y prefijo)
+        num_perm (int): Número de permutaciones MinHash
+        workers (int): Procesos para el preprocesamiento y, con 'jaccard', para el cálculo de similitud
+        ngram_encoding (str): 'text' (n-gramas como cadenas) o 'ids' (enteros de 64 bits con hash rodante)
+        hash_table_type (str): 'chaining' (encadenamiento) u 'open' (direccionamiento abierto)
+        cache_file (str): Archivo de caché de n-gramas; si se indica, solo se procesan
+            los documentos nuevos o modificados desde la ejecución anterior
+        winnow_window (int): Si se indica, solo se indexan y comparan las huellas
+            seleccionadas por winnowing con esa ventana
+        metrics (PipelineMetrics): Si se indica, registra tiempo, memoria y contadores
+            de cada etapa (preprocess, simhash, index, similarity, align, report)
+        simhash_distance (int): Si se indica, antes de calcular la similitud se marcan
+            como casi duplicados los pares cuya huella SimHash difiere en a lo sumo esos bits
+        align_passages (bool): Si es True, en los N pares más similares se localizan los
+            pasajes copiados (desplazamientos en caracteres y contención en cada dirección)
+    """
+    print("=== Detector de Plagio para Trabajos Estudiantiles ===\n")
+    print(f"Analizando documentos en: {documents_dir}")
+    print(f"Tamaño de n-gramas: {ngram_size}")
+    
+    # Sin registro de métricas las etapas no miden nada
+    if metrics is None:
+        metrics = PipelineMetrics(enabled=False)
+    metrics.labels.update(method=similarity_method, ngram_size=ngram_size)
+    
+    with metrics.stage('preprocess') as counters:
+        if cache_file:
+            # Pasos 1 y 2 con caché: solo se leen y preprocesan los documentos nuevos o modificados
+            print("\nCargando n-gramas desde la caché...")
+            documents_ngrams, cache_stats = load_fingerprints(documents_dir, ngram_size, cache_file,
+                                                              ngram_encoding, workers, window=winnow_window)
+            counters.update(cache_hits=cache_stats['hits'], cache_misses=cache_stats['misses'])
+        else:
+            # Pasos 1 y 2: Cargar (recursivamente) y preprocesar los documentos uno por uno;
+            # el texto de cada documento se descarta en cuanto se generan sus n-gramas
+            print("\nCargando y preprocesando documentos...")
+            documents = iter_documents_from_directory(documents_dir)
+            documents_ngrams = dict(preprocess_stream(documents, ngram_size, workers, encoding=ngram_encoding,
+                                                      window=winnow_window))
+        
+        if metrics.enabled:
+            counters.update(ngram_counts(documents_ngrams))
+    
+    document_count = len(documents_ngrams)
+    if document_count == 0:
+        print("No se encontraron documentos para analizar.")
+        return
+    
+    if cache_file:
+        print(f"Se cargaron {document_count} documentos "
+              f"({cache_stats['hits']} desde la caché, {cache_stats['misses']} procesados).")
+    else:
+        print(f"Se cargaron {document_count} documentos.")
+    
+    # Primera pasada rápida: casi duplicados por distancia de Hamming entre huellas SimHash
+    near_duplicates = []
+    if simhash_distance is not None:
+        with metrics.stage('simhash') as counters:
+            near_duplicates = find_near_duplicates(documents_ngrams, simhash_distance)
+            counters['near_duplicates'] = len(near_duplicates)
+        
+        print(f"\nCasi duplicados (SimHash, distancia <= {simhash_distance}): {len(near_duplicates)}")
+        for pair in near_duplicates:
+            print(f"  - {pair['doc_a']} <-> {pair['doc_b']} ({pair['distance']} bits distintos)")
+    
+    # Paso 3: Almacenar n-gramas en la tabla hash y filtro de Bloom
+    with metrics.stage('index') as counters:
+        hash_table, bloom_filter, document_sizes = index_documents(documents_ngrams, hash_table_type)
+        
+        if metrics.enabled:
+            counters.update(hash_table.stats())
+            counters['bloom_fill_ratio'] = bloom_filter.fill_ratio()
+    
+    # Pasos 4 y 5: Calcular la similitud y seleccionar los N pares más similares con un
+    # montículo acotado; con los motores en streaming ambos pasos ocurren a la vez
+    with metrics.stage('similarity') as counters:
+        print("\nCalculando similitud entre documentos...")
+        similarity_matrix = calculate_similarities(documents_ngrams, similarity_method, similarity_threshold,
+                                                   num_perm, workers, hash_table, document_sizes)
+        if metrics.enabled:
+            similarity_matrix = count_items(similarity_matrix, counters)
+        
+        print("\nSeleccionando los pares más similares...")
+        top_similar_pairs = get_top_similar_pairs(similarity_matrix, top_n)
+    
+    # Alineación de pasajes: solo se releen los documentos de los N pares más similares
+    alignments = []
+    if align_passages:
+        with metrics.stage('align') as counters:
+            print("\nAlineando los pasajes de los pares más similares...")
+            document_paths = dict(list_document_paths(documents_dir))
+            texts = {}
+            
+            def read_text(doc_name):
+                if doc_name not in texts:
+                    texts[doc_name] = read_document(document_paths[doc_name])
+                return texts[doc_name]
+            
+            aligned_pairs = align_pairs(top_similar_pairs, read_text, ngram_size)
+            alignments = [format_alignment(pair, read_text(pair['doc_a'])) for pair in aligned_pairs]
+            counters['pairs_aligned'] = len(aligned_pairs)
+            counters['spans'] = sum(len(pair['alignment']['spans']) for pair in aligned_pairs)
+    
+    with metrics.stage('report') as counters:
+        # Paso 6: Mostrar los N pares más similares
+        print(f"\nTop {top_n} pares de documentos más similares:")
+        print(generate_similarity_table(top_similar_pairs))
+        
+        if alignments:
+            print("\nPasajes coincidentes:")
+            print('\n'.join(alignments))
+        
+        # Visualización adicional: grafo de similitud
+        print("\nGrafo de similitud entre documentos:")
+        print(generate_ascii_graph(top_similar_pairs, similarity_threshold))
+        
+        # Guardar resultados en un archivo
+        results_dir = './resultados'
+        if not os.path.exists(results_dir):
+            os.makedirs(results_dir)
+        
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        results_file = os.path.join(results_dir, f"resultados_{timestamp}.txt")
+        
+        results = "=== RESULTADOS DEL DETECTOR DE PLAGIO ===\n\n"
+        results += f"Fecha y hora: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        results += f"Documentos analizados: {document_count}\n"
+        results += f"Tamaño de n-gramas: {ngram_size}\n\n"
+        if simhash_distance is not None:
+            results += f"Casi duplicados (SimHash, distancia <= {simhash_distance}): {len(near_duplicates)}\n"
+            for pair in near_duplicates:
+                results += f"  - {pair['doc_a']} <-> {pair['doc_b']} ({pair['distance']} bits distintos)\n"
+            results += "\n"
+        results += generate_similarity_table(top_similar_pairs)
+        results += "\n\n"
+        if alignments:
+            results += "Pasajes coincidentes:\n"
+            results += '\n'.join(alignments)
+            results += "\n\n"
+        results += generate_ascii_graph(top_similar_pairs, similarity_threshold)
+        
+        with open(results_file, 'w', encoding='utf-8') as f:
+            f.write(results)
+        counters['pairs_reported'] = len(top_similar_pairs)
+    
+    print(f"\nResultados guardados en: {results_file}")
+    
+    if metrics.enabled:
+        print("\nTiempo por etapa:")
+        print(metrics.summary())
+
+if __name__ == "__main__":
+    import argparse
+    
+    # Obtener argumentos de la línea de comandos
+    parser = argparse.ArgumentParser(description="Detector de Plagio para Trabajos Estudiantiles")
+    parser.add_argument('documents_dir', nargs='?', default='./documentos', help="Directorio con los documentos")
+    parser.add_argument('ngram_size', nargs='?', type=int, default=3, help="Tamaño de los n-gramas")
+    parser.add_argument('top_n', nargs='?', type=int, default=10, help="Número de pares a mostrar")
+    parser.add_argument('similarity_threshold', nargs='?', type=float, default=0.3, help="Umbral de similitud")
+    parser.add_argument('similarity_method', nargs='?', default='jaccard',
+                        choices=['jaccard', 'minhash', 'lsh', 'index', 'sparse', 'ppjoin'], help="Motor de similitud")
+    parser.add_argument('--num-perm', type=int, default=128, help="Permutaciones MinHash")
+    parser.add_argument('-j', '--workers', type=int, default=1, help="Procesos para el preprocesamiento y la similitud")
+    parser.add_argument('--encoding', default='text', choices=['text', 'ids'],
+                        help="Codificación de los n-gramas")
+    parser.add_argument('--hash-table', default='chaining', choices=['chaining', 'open'],
+                        help="Implementación de la tabla hash")
+    parser.add_argument('--cache', nargs='?', const='.ngram_cache.bin', default=None, metavar='ARCHIVO',
+                        help="Reutilizar los n-gramas de ejecuciones anteriores")
+    parser.add_argument('--winnow', type=int, default=None, metavar='VENTANA',
+                        help="Conservar solo las huellas elegidas por winnowing")
+    parser.add_argument('--simhash', nargs='?', type=int, const=3, default=None, metavar='K',
+                        help="Marcar primero los casi duplicados (huellas SimHash a distancia <= K)")
+    parser.add_argument('--align', action='store_true',
+                        help="Localizar los pasajes copiados en los pares más similares")
+    parser.add_argument('--metrics', default=None, metavar='ARCHIVO',
+                        help="Guardar las métricas por etapa en este archivo")
+    parser.add_argument('--metrics-format', default='jsonl', choices=['jsonl', 'prometheus'],
+                        help="Formato del archivo de métricas")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Medir la memoria asignada por etapa (tracemalloc)")
+    parser.add_argument('--profile', default=None, metavar='ARCHIVO',
+                        help="Guardar el perfil cProfile de la etapa más costosa")
+    args = parser.parse_args()
+    
+    metrics = None
+    if args.metrics or args.trace_memory or args.profile:
+        metrics = PipelineMetrics(trace_memory=args.trace_memory, profile_path=args.profile)
+    
+    detect_plagiarism(args.documents_dir, args.ngram_size, args.top_n, args.similarity_threshold,
+                      args.similarity_method, args.num_perm, args.workers, args.encoding,
+                      args.hash_table, args.cache, args.winnow, metrics, args.simhash, args.align)
+    
+    if metrics and args.metrics:
+        metrics.export(args.metrics, args.metrics_format)
+        print(f"Métricas guardadas en: {args.metrics}")
+    if metrics and args.profile:
+        stage = metrics.write_profile()
+        if stage:
+            print(f"Perfil de la etapa '{stage}' guardado en: {args.profile}")
\ No newline at end of file
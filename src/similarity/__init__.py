@@ -1 +1 @@
-# Paquete de cálculo de similitud
+# Paquete de cálculo de similitud
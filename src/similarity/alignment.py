@@ -0,0 +1,219 @@
+# Alineación de pasajes copiados entre dos documentos
+"""
+Módulo para localizar los fragmentos de texto que comparten dos documentos
+Se aplica solo a los pares más similares. Para cada par se construye un
+índice posicional de los n-gramas de palabras del primer documento
+(n-grama -> posiciones). Se recorre el segundo documento: cada n-grama
+compartido es una semilla que se extiende palabra por palabra hasta el
+tramo coincidente más largo. Las semillas que caen dentro de un tramo ya
+encontrado en la misma diagonal se descartan sin compararlas, así que el
+costo por par es casi lineal en la longitud de los documentos.
+
+Cada tramo se informa con sus desplazamientos en caracteres en ambos
+textos originales, junto con la contención en cada dirección: la fracción
+de las palabras de cada documento que forma parte de algún tramo
+"""
+
+from src.utils.tokenizer import iter_token_spans
+
+# Máximo de apariciones de un n-grama en el primer documento para usarlo como
+# semilla; las frases muy repetidas harían cuadrática la búsqueda
+MAX_SEED_OCCURRENCES = 32
+
+def build_positional_index(words, n=3):
+    """
+    Construye el índice posicional de los n-gramas de palabras de un documento
+
+    Args:
+        words (list): Palabras del documento en orden
+        n (int): Tamaño del n-grama
+
+    Returns:
+        dict: N-grama (tupla de palabras) -> lista de posiciones de inicio
+    """
+    index = {}
+    for position in range(len(words) - n + 1):
+        index.setdefault(tuple(words[position:position + n]), []).append(position)
+    return index
+
+def find_matching_spans(words_a, words_b, n=3, max_occurrences=MAX_SEED_OCCURRENCES):
+    """
+    Encuentra los tramos maximales de palabras consecutivas que comparten dos documentos
+
+    Args:
+        words_a (list): Palabras del documento A
+        words_b (list): Palabras del documento B
+        n (int): Tamaño del n-grama semilla (longitud mínima de un tramo)
+        max_occurrences (int): Apariciones máximas de un n-grama en A para usarlo como semilla
+
+    Returns:
+        list: Tuplas (inicio en A, inicio en B, longitud en palabras) ordenadas por posición en B
+    """
+    index = build_positional_index(words_a, n)
+    length_a = len(words_a)
+    length_b = len(words_b)
+
+    # Por diagonal (inicio en A - inicio en B): fin en B del último tramo encontrado
+    covered_until = {}
+    spans = []
+
+    for start_b in range(length_b - n + 1):
+        positions = index.get(tuple(words_b[start_b:start_b + n]))
+        if positions is None or len(positions) > max_occurrences:
+            continue
+
+        for start_a in positions:
+            diagonal = start_a - start_b
+            if covered_until.get(diagonal, -1) > start_b:
+                continue
+
+            # Extender la semilla hacia adelante y, si se omitió una semilla frecuente
+            # justo antes, también hacia atrás
+            length = n
+            while (start_a + length < length_a and start_b + length < length_b
+                   and words_a[start_a + length] == words_b[start_b + length]):
+                length += 1
+
+            covered_until[diagonal] = start_b + length
+            first_a, first_b = start_a, start_b
+            while first_a > 0 and first_b > 0 and words_a[first_a - 1] == words_b[first_b - 1]:
+                first_a -= 1
+                first_b -= 1
+            spans.append((first_a, first_b, length + start_b - first_b))
+
+    return spans
+
+def _covered_words(intervals):
+    """
+    Cuenta las palabras cubiertas por la unión de varios intervalos
+
+    Args:
+        intervals (list): Tuplas (inicio, fin) de posiciones de palabra
+
+    Returns:
+        int: Número de posiciones cubiertas por al menos un intervalo
+    """
+    covered = 0
+    current_end = 0
+    for start, end in sorted(intervals):
+        if end <= current_end:
+            continue
+        covered += end - max(start, current_end)
+        current_end = end
+    return covered
+
+def align_texts(text_a, text_b, n=3, min_words=None, normalize=False):
+    """
+    Alinea los pasajes que comparten dos textos
+
+    Args:
+        text_a (str): Texto original del documento A
+        text_b (str): Texto original del documento B
+        n (int): Tamaño del n-grama semilla
+        min_words (int): Longitud mínima de un tramo en palabras (por defecto n)
+        normalize (bool): Comparar las palabras sin acentos (NFKD)
+
+    Returns:
+        dict: 'spans' (lista de tramos con 'start_a', 'end_a', 'start_b', 'end_b' en
+              caracteres y 'words'), 'containment_a' (fracción de A presente en B)
+              y 'containment_b' (fracción de B presente en A)
+    """
+    tokens_a = list(iter_token_spans(text_a, normalize))
+    tokens_b = list(iter_token_spans(text_b, normalize))
+    words_a = [token[0] for token in tokens_a]
+    words_b = [token[0] for token in tokens_b]
+    min_words = min_words or n
+
+    matches = [match for match in find_matching_spans(words_a, words_b, n) if match[2] >= min_words]
+
+    spans = []
+    for start_a, start_b, length in sorted(matches):
+        spans.append({
+            'start_a': tokens_a[start_a][1],
+            'end_a': tokens_a[start_a + length - 1][2],
+            'start_b': tokens_b[start_b][1],
+            'end_b': tokens_b[start_b + length - 1][2],
+            'words': length
+        })
+
+    covered_a = _covered_words([(start_a, start_a + length) for start_a, _, length in matches])
+    covered_b = _covered_words([(start_b, start_b + length) for _, start_b, length in matches])
+
+    return {
+        'spans': spans,
+        'containment_a': covered_a / len(words_a) if words_a else 0.0,
+        'containment_b': covered_b / len(words_b) if words_b else 0.0
+    }
+
+def align_pairs(similarity_pairs, read_text, n=3, min_words=None):
+    """
+    Alinea los pasajes de una lista de pares (por ejemplo, los de get_top_similar_pairs)
+
+    Args:
+        similarity_pairs (list): Pares de documentos con su similitud
+        read_text (callable): Función que recibe el nombre de un documento y devuelve su texto
+        n (int): Tamaño del n-grama semilla
+        min_words (int): Longitud mínima de un tramo en palabras
+
+    Returns:
+        list: Copia de cada par con la clave adicional 'alignment' (ver align_texts)
+    """
+    texts = {}
+    aligned_pairs = []
+
+    for pair in similarity_pairs:
+        for doc_name in (pair['doc_a'], pair['doc_b']):
+            if doc_name not in texts:
+                texts[doc_name] = read_text(doc_name)
+        alignment = align_texts(texts[pair['doc_a']], texts[pair['doc_b']], n, min_words)
+        aligned_pairs.append(dict(pair, alignment=alignment))
+
+    return aligned_pairs
+
+def format_alignment(aligned_pair, text_a=None, max_spans=5, excerpt_length=60):
+    """
+    Genera un resumen en texto de la alineación de un par
+
+    Args:
+        aligned_pair (dict): Par con la clave 'alignment'
+        text_a (str): Texto del documento A; si se indica, se muestra el inicio de cada tramo
+        max_spans (int): Número máximo de tramos a mostrar (los más largos)
+        excerpt_length (int): Caracteres del extracto de cada tramo
+
+    Returns:
+        str: Resumen de los tramos coincidentes
+    """
+    alignment = aligned_pair['alignment']
+    lines = [
+        f"{aligned_pair['doc_a']} <-> {aligned_pair['doc_b']}: "
+        f"{len(alignment['spans'])} tramos, "
+        f"{alignment['containment_a'] * 100:.1f}% de A en B, "
+        f"{alignment['containment_b'] * 100:.1f}% de B en A"
+    ]
+
+    longest = sorted(alignment['spans'], key=lambda span: span['words'], reverse=True)[:max_spans]
+    for span in sorted(longest, key=lambda span: span['start_a']):
+        line = (f"  - A[{span['start_a']}:{span['end_a']}] = B[{span['start_b']}:{span['end_b']}] "
+                f"({span['words']} palabras)")
+        if text_a is not None:
+            excerpt = ' '.join(text_a[span['start_a']:span['end_a']].split())
+            if len(excerpt) > excerpt_length:
+                excerpt = excerpt[:excerpt_length] + '...'
+            line += f' "{excerpt}"'
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    text_a = "La educación es un derecho humano fundamental. Todos los estudiantes deben tener acceso a ella."
+    text_b = ("Según el informe, la educación es un derecho humano fundamental; "
+              "sin embargo, muchos estudiantes deben tener acceso a internet.")
+
+    alignment = align_texts(text_a, text_b)
+    for span in alignment['spans']:
+        print(f"A: {text_a[span['start_a']:span['end_a']]!r}")
+        print(f"B: {text_b[span['start_b']:span['end_b']]!r}")
+
+    pair = {'doc_a': 'doc1.txt', 'doc_b': 'doc2.txt', 'similarity': 0.4, 'alignment': alignment}
+    print(format_alignment(pair, text_a))
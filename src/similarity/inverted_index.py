@@ -0,0 +1,98 @@
+# Similitud de Jaccard a partir del índice invertido de n-gramas
+"""
+Módulo para calcular la similitud usando la tabla hash como índice invertido
+La tabla hash asocia cada n-grama con los documentos que lo contienen
+(lista de publicación). Recorriendo esas listas una sola vez se obtiene
+cuántos n-gramas comparte cada par de documentos; los pares que no
+comparten ningún n-grama nunca se visitan
+"""
+
+from src.hash.hash_table import HashTable
+
+def count_shared_ngrams(hash_table, document_names):
+    """
+    Cuenta los n-gramas compartidos por cada par de documentos
+
+    Args:
+        hash_table (HashTable): Tabla hash n-grama -> lista de documentos
+        document_names (list): Nombres de documentos en el orden de salida
+
+    Returns:
+        dict: Diccionario {(índice_a, índice_b): n-gramas compartidos} con índice_a < índice_b
+    """
+    positions = {doc_name: index for index, doc_name in enumerate(document_names)}
+    shared_counts = {}
+
+    for _, posting_list in hash_table.entries():
+        if len(posting_list) < 2:
+            continue
+
+        indices = sorted(positions[doc_name] for doc_name in posting_list)
+        for i in range(len(indices)):
+            doc_a = indices[i]
+            for j in range(i + 1, len(indices)):
+                pair = (doc_a, indices[j])
+                shared_counts[pair] = shared_counts.get(pair, 0) + 1
+
+    return shared_counts
+
+def calculate_similarity_from_index(hash_table, document_sizes):
+    """
+    Calcula la similitud de Jaccard a partir de las listas de publicación
+    Fórmula: J(A,B) = |A ∩ B| / (|A| + |B| - |A ∩ B|)
+
+    Args:
+        hash_table (HashTable): Tabla hash n-grama -> lista de documentos
+        document_sizes (dict): Número de n-gramas distintos de cada documento
+
+    Returns:
+        list: Lista de diccionarios con los pares que comparten al menos un n-grama
+    """
+    document_names = list(document_sizes.keys())
+    shared_counts = count_shared_ngrams(hash_table, document_names)
+    similarity_matrix = []
+
+    for (i, j), shared in sorted(shared_counts.items()):
+        doc_a = document_names[i]
+        doc_b = document_names[j]
+        union = document_sizes[doc_a] + document_sizes[doc_b] - shared
+
+        similarity_matrix.append({
+            'doc_a': doc_a,
+            'doc_b': doc_b,
+            'similarity': shared / union
+        })
+
+    return similarity_matrix
+
+def calculate_similarity_matrix(documents_ngrams, hash_table=None):
+    """
+    Calcula la matriz de similitud usando el índice invertido
+    Compatible con jaccard.calculate_similarity_matrix, pero los pares sin
+    n-gramas compartidos (similitud 0) no aparecen en el resultado
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos como claves y listas de n-gramas como valores
+        hash_table (HashTable): Índice ya construido; si es None se construye aquí
+
+    Returns:
+        list: Lista de diccionarios con pares de documentos y su similitud
+    """
+    if hash_table is None:
+        hash_table = HashTable()
+        for doc_name, ngrams in documents_ngrams.items():
+            for ngram in ngrams:
+                hash_table.insert(ngram, doc_name)
+
+    document_sizes = {doc_name: len(set(ngrams)) for doc_name, ngrams in documents_ngrams.items()}
+    return calculate_similarity_from_index(hash_table, document_sizes)
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    print("Matriz de similitud (índice invertido):", calculate_similarity_matrix(documents_ngrams))
@@ -0,0 +1,171 @@
+# Generación de pares candidatos con LSH (locality-sensitive hashing)
+"""
+Módulo LSH por bandas sobre firmas MinHash
+La firma de cada documento se divide en b bandas de r filas; dos documentos
+son candidatos si coinciden por completo en al menos una banda. Solo los
+pares candidatos se comparan, evitando el recorrido de todos los pares
+"""
+
+from src.similarity.jaccard import jaccard_similarity
+from src.similarity.minhash import compute_signatures, estimate_similarity
+
+def candidate_probability(similarity, bands, rows):
+    """
+    Probabilidad de que un par con cierta similitud sea candidato
+    Fórmula: P(s) = 1 - (1 - s^r)^b
+
+    Args:
+        similarity (float): Similitud de Jaccard del par
+        bands (int): Número de bandas
+        rows (int): Filas por banda
+
+    Returns:
+        float: Probabilidad de que el par sea candidato
+    """
+    return 1 - (1 - similarity ** rows) ** bands
+
+def _integrate(function, start, end, steps=100):
+    """
+    Integra numéricamente una función con la regla del trapecio
+
+    Args:
+        function (callable): Función a integrar
+        start (float): Límite inferior
+        end (float): Límite superior
+        steps (int): Número de subintervalos
+
+    Returns:
+        float: Valor aproximado de la integral
+    """
+    if end <= start:
+        return 0.0
+
+    width = (end - start) / steps
+    total = (function(start) + function(end)) / 2
+    for i in range(1, steps):
+        total += function(start + i * width)
+
+    return total * width
+
+def optimal_bands_rows(threshold, num_perm=128, false_positive_weight=0.5, false_negative_weight=0.5):
+    """
+    Elige el número de bandas y filas que minimiza el error ponderado
+    alrededor del umbral de similitud
+
+    Args:
+        threshold (float): Umbral de similitud buscado
+        num_perm (int): Longitud de las firmas MinHash
+        false_positive_weight (float): Peso de los falsos positivos (costo en tiempo)
+        false_negative_weight (float): Peso de los falsos negativos (pérdida de recall)
+
+    Returns:
+        tuple: (bands, rows) con bands * rows <= num_perm
+    """
+    best = (num_perm, 1)
+    best_error = float('inf')
+
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            # Falsos positivos: pares bajo el umbral que resultan candidatos
+            false_positive = _integrate(lambda s: candidate_probability(s, bands, rows), 0.0, threshold)
+            # Falsos negativos: pares sobre el umbral que no resultan candidatos
+            false_negative = _integrate(lambda s: 1 - candidate_probability(s, bands, rows), threshold, 1.0)
+
+            error = false_positive * false_positive_weight + false_negative * false_negative_weight
+            if error < best_error:
+                best_error = error
+                best = (bands, rows)
+
+    return best
+
+def candidate_pairs(signatures, bands, rows):
+    """
+    Obtiene los pares candidatos agrupando las bandas de las firmas en cubetas
+
+    Args:
+        signatures (dict): Diccionario con nombres de documentos y firmas MinHash
+        bands (int): Número de bandas
+        rows (int): Filas por banda
+
+    Returns:
+        list: Lista ordenada de tuplas (índice_a, índice_b) con índice_a < índice_b,
+              según el orden de los documentos en signatures
+    """
+    document_names = list(signatures.keys())
+    candidates = set()
+
+    for band in range(bands):
+        start = band * rows
+        end = start + rows
+        buckets = {}
+
+        # Documentos con la misma banda caen en la misma cubeta
+        for index, doc_name in enumerate(document_names):
+            key = signatures[doc_name][start:end].tobytes()
+            buckets.setdefault(key, []).append(index)
+
+        for bucket in buckets.values():
+            if len(bucket) < 2:
+                continue
+            for i in range(len(bucket)):
+                for j in range(i + 1, len(bucket)):
+                    candidates.add((bucket[i], bucket[j]))
+
+    return sorted(candidates)
+
+def calculate_similarity_matrix(documents_ngrams, threshold=0.3, num_perm=128, seed=1, exact=True,
+                                false_positive_weight=0.5, false_negative_weight=0.5):
+    """
+    Calcula la similitud solo para los pares candidatos que genera LSH
+    Compatible con jaccard.calculate_similarity_matrix, pero los pares que no
+    resultan candidatos no aparecen en el resultado
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos como claves y listas de n-gramas como valores
+        threshold (float): Umbral de similitud usado para elegir bandas y filas
+        num_perm (int): Longitud de las firmas MinHash
+        seed (int): Semilla de las permutaciones
+        exact (bool): Si es True los candidatos se puntúan con Jaccard exacto,
+                      si es False con la estimación MinHash
+        false_positive_weight (float): Peso de los falsos positivos al elegir bandas
+        false_negative_weight (float): Peso de los falsos negativos al elegir bandas
+
+    Returns:
+        list: Lista de diccionarios con pares candidatos y su similitud
+    """
+    bands, rows = optimal_bands_rows(threshold, num_perm, false_positive_weight, false_negative_weight)
+    signatures = compute_signatures(documents_ngrams, num_perm, seed)
+    document_names = list(documents_ngrams.keys())
+
+    # Los conjuntos se construyen una sola vez por documento
+    document_sets = [set(documents_ngrams[doc_name]) for doc_name in document_names] if exact else None
+
+    similarity_matrix = []
+    for i, j in candidate_pairs(signatures, bands, rows):
+        doc_a = document_names[i]
+        doc_b = document_names[j]
+
+        if exact:
+            similarity = jaccard_similarity(document_sets[i], document_sets[j])
+        else:
+            similarity = estimate_similarity(signatures[doc_a], signatures[doc_b])
+
+        similarity_matrix.append({
+            'doc_a': doc_a,
+            'doc_b': doc_b,
+            'similarity': similarity
+        })
+
+    return similarity_matrix
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    print("Bandas y filas para umbral 0.5:", optimal_bands_rows(0.5, 128))
+
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto', 'de texto largo'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    print("Pares candidatos (LSH):", calculate_similarity_matrix(documents_ngrams, 0.5))
@@ -0,0 +1,242 @@
+# Estimación de similitud de Jaccard mediante firmas MinHash
+"""
+Módulo MinHash para estimar la similitud de Jaccard entre documentos
+Cada documento se resume en una firma de tamaño fijo (num_perm enteros),
+de modo que la memoria es O(documentos × num_perm) y comparar dos
+documentos cuesta lo mismo sin importar su longitud
+
+Si NumPy está instalado, las num_perm permutaciones se evalúan de forma
+vectorizada sobre todos los n-gramas del documento con aritmética exacta
+módulo 2^61 - 1 en enteros uint64 (el resultado es idéntico al cálculo
+con enteros de Python)
+"""
+
+import random
+from array import array
+from src.hash.fingerprint import hash64
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Primo de Mersenne 2^61 - 1 usado para las permutaciones universales
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = MERSENNE_PRIME
+
+# Elementos máximos (permutaciones × n-gramas) de cada bloque de la versión vectorizada
+SIGNATURE_BLOCK = 1 << 18
+
+def _split32(values):
+    """
+    Divide un arreglo uint64 en sus 32 bits altos y sus 32 bits bajos
+
+    Args:
+        values (ndarray): Enteros menores que 2^61
+
+    Returns:
+        tuple: (altos, bajos), con altos < 2^29 y bajos < 2^32
+    """
+    return values >> np.uint64(32), values & np.uint64(0xFFFFFFFF)
+
+def _reduce_mersenne(values):
+    """
+    Reduce módulo 2^61 - 1 un arreglo uint64 menor que 2^64 - 8
+
+    Args:
+        values (ndarray): Enteros uint64
+
+    Returns:
+        ndarray: Enteros menores que 2^61 - 1
+    """
+    p = np.uint64(MERSENNE_PRIME)
+    # 2^61 ≡ 1 (mod p): los bits altos se suman a los 61 bits bajos
+    values = (values & p) + (values >> np.uint64(61))
+    return np.where(values >= p, values - p, values)
+
+def _permute_mersenne(a_high, a_low, b, x_high, x_low):
+    """
+    Calcula (a·x + b) mod (2^61 - 1) con enteros uint64 sin desbordamiento
+
+    Con a = a1·2^32 + a0 y x = x1·2^32 + x0:
+    a·x = a1·x1·2^64 + (a1·x0 + a0·x1)·2^32 + a0·x0, y cada producto parcial cabe
+    en 64 bits. Como 2^61 ≡ 1 (mod p), 2^64 ≡ 8 y el término central se parte en
+    sus 29 bits bajos (por 2^32) y el resto (por 2^61 ≡ 1)
+
+    Args:
+        a_high (ndarray): 32 bits altos de a (menores que 2^29)
+        a_low (ndarray): 32 bits bajos de a
+        b (ndarray): Término independiente (menor que p)
+        x_high (ndarray): 32 bits altos de x (menores que 2^29)
+        x_low (ndarray): 32 bits bajos de x
+
+    Returns:
+        ndarray: (a·x + b) mod p con la forma de la difusión de los argumentos
+    """
+    p = np.uint64(MERSENNE_PRIME)
+    middle = a_high * x_low + a_low * x_high
+    low = a_low * x_low
+
+    # 8·a1·x1 < 2^61, cada término siguiente < 2^61 + 8: la suma cabe en 64 bits
+    total = (a_high * x_high) << np.uint64(3)
+    total += middle >> np.uint64(29)
+    total += (middle & np.uint64((1 << 29) - 1)) << np.uint64(32)
+    total += (low & p) + (low >> np.uint64(61))
+
+    total = _reduce_mersenne(total) + b
+    return np.where(total >= p, total - p, total)
+
+class MinHash:
+    """
+    Clase MinHash - Genera firmas MinHash con permutaciones h(x) = (a·x + b) mod p
+    """
+
+    def __init__(self, num_perm=128, seed=1):
+        """
+        Constructor del generador de firmas
+
+        Args:
+            num_perm (int): Número de permutaciones (longitud de la firma)
+            seed (int): Semilla para generar las permutaciones de forma reproducible
+        """
+        if num_perm <= 0:
+            raise ValueError("num_perm debe ser mayor que cero")
+
+        self.num_perm = num_perm
+        self.seed = seed
+
+        generator = random.Random(seed)
+        self.coefficients = [
+            (generator.randint(1, MERSENNE_PRIME - 1), generator.randint(0, MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+        # Coeficientes como columnas uint64 para evaluar todas las permutaciones a la vez
+        if np is not None:
+            a_values = np.array([a for a, _ in self.coefficients], dtype=np.uint64).reshape(-1, 1)
+            self._a_high, self._a_low = _split32(a_values)
+            self._b = np.array([b for _, b in self.coefficients], dtype=np.uint64).reshape(-1, 1)
+
+    def signature(self, ngrams):
+        """
+        Calcula la firma MinHash de un documento
+
+        Args:
+            ngrams (iterable): N-gramas del documento (texto o enteros)
+
+        Returns:
+            array: Firma de num_perm enteros sin signo de 64 bits
+        """
+        hashes = [hash64(ngram) % MERSENNE_PRIME for ngram in set(ngrams)]
+
+        # Un documento vacío se representa con una firma de valores máximos
+        if not hashes:
+            return array('Q', [MAX_HASH] * self.num_perm)
+
+        if np is not None:
+            return self._signature_numpy(hashes)
+
+        p = MERSENNE_PRIME
+        return array('Q', [
+            min((a * x + b) % p for x in hashes)
+            for a, b in self.coefficients
+        ])
+
+    def _signature_numpy(self, hashes):
+        """
+        Calcula la firma con NumPy: una matriz permutaciones × n-gramas por bloque
+
+        Args:
+            hashes (list): Hashes de los n-gramas, menores que 2^61 - 1
+
+        Returns:
+            array: Firma de num_perm enteros sin signo de 64 bits
+        """
+        values = np.array(hashes, dtype=np.uint64)
+        block = max(1, SIGNATURE_BLOCK // self.num_perm)
+        minimum = None
+
+        for start in range(0, len(values), block):
+            x_high, x_low = _split32(values[start:start + block])
+            permuted = _permute_mersenne(self._a_high, self._a_low, self._b, x_high, x_low)
+            block_minimum = permuted.min(axis=1)
+            minimum = block_minimum if minimum is None else np.minimum(minimum, block_minimum)
+
+        signature = array('Q')
+        signature.frombytes(minimum.tobytes())
+        return signature
+
+def estimate_similarity(signature_a, signature_b):
+    """
+    Estima la similitud de Jaccard a partir de dos firmas MinHash
+
+    Args:
+        signature_a (array): Firma del primer documento
+        signature_b (array): Firma del segundo documento
+
+    Returns:
+        float: Similitud estimada (entre 0 y 1)
+    """
+    if len(signature_a) != len(signature_b):
+        raise ValueError("Las firmas deben tener el mismo número de permutaciones")
+
+    matches = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return matches / len(signature_a)
+
+def compute_signatures(documents_ngrams, num_perm=128, seed=1):
+    """
+    Calcula las firmas MinHash de varios documentos
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        num_perm (int): Número de permutaciones
+        seed (int): Semilla de las permutaciones
+
+    Returns:
+        dict: Diccionario con nombres de documentos como claves y firmas como valores
+    """
+    minhash = MinHash(num_perm, seed)
+    return {doc_name: minhash.signature(ngrams) for doc_name, ngrams in documents_ngrams.items()}
+
+def calculate_similarity_matrix(documents_ngrams, num_perm=128, seed=1):
+    """
+    Calcula la matriz de similitud estimada con MinHash
+    Compatible con jaccard.calculate_similarity_matrix
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos como claves y listas de n-gramas como valores
+        num_perm (int): Número de permutaciones
+        seed (int): Semilla de las permutaciones
+
+    Returns:
+        list: Lista de diccionarios con pares de documentos y su similitud estimada
+    """
+    signatures = compute_signatures(documents_ngrams, num_perm, seed)
+    document_names = list(signatures.keys())
+    similarity_matrix = []
+
+    # Comparar las firmas de cada par de documentos
+    for i in range(len(document_names)):
+        doc_a = document_names[i]
+        signature_a = signatures[doc_a]
+
+        for j in range(i + 1, len(document_names)):
+            doc_b = document_names[j]
+
+            similarity_matrix.append({
+                'doc_a': doc_a,
+                'doc_b': doc_b,
+                'similarity': estimate_similarity(signature_a, signatures[doc_b])
+            })
+
+    return similarity_matrix
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    print("Matriz de similitud (MinHash):", calculate_similarity_matrix(documents_ngrams, 256))
@@ -0,0 +1,247 @@
+# Cálculo de la matriz de similitud en varios núcleos
+"""
+Módulo para calcular la similitud de Jaccard de todos los pares en paralelo
+El triángulo superior de la matriz se divide en bloques de filas con una
+cantidad similar de pares y cada bloque se procesa en un pool de procesos.
+Los n-gramas de todos los documentos se escriben una sola vez en un archivo
+mapeado en memoria (mmap) como arreglos ordenados de hashes de 64 bits; los
+procesos trabajadores comparan esos tramos ordenados directamente sobre el
+archivo mapeado (con los núcleos de src.similarity.profile), sin copiar el
+corpus, y los resultados de los bloques se entregan a medida que terminan
+"""
+
+import mmap
+import os
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from src.hash.fingerprint import hash64
+from src.similarity.profile import block_intersection_counts, sorted_intersection_count
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Pares máximos por bloque: acota la memoria de cada resultado parcial
+MAX_BLOCK_PAIRS = 1 << 20
+
+# Archivo mapeado en cada proceso trabajador: hashes concatenados y desplazamientos
+_worker_values = None
+_worker_offsets = None
+
+def _write_ngram_file(documents_ngrams, file_path):
+    """
+    Escribe los n-gramas de todos los documentos en un archivo binario
+
+    Formato: [número de documentos][desplazamientos (n + 1)][hashes de 64 bits],
+    todo como enteros sin signo de 64 bits. Los hashes de cada documento están
+    ordenados y sin repetidos; se escriben documento por documento y los
+    desplazamientos se completan al final
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        file_path (str): Ruta del archivo a escribir
+    """
+    count = len(documents_ngrams)
+    offsets = array('Q', [0])
+
+    with open(file_path, 'wb') as file:
+        array('Q', [count]).tofile(file)
+        file.seek(8 * (count + 1), os.SEEK_CUR)
+
+        for ngrams in documents_ngrams.values():
+            values = array('Q', sorted({hash64(ngram) for ngram in ngrams}))
+            values.tofile(file)
+            offsets.append(offsets[-1] + len(values))
+
+        file.seek(8)
+        offsets.tofile(file)
+
+def _open_worker_file(file_path):
+    """
+    Inicializador de los procesos trabajadores: mapea el archivo de n-gramas
+
+    El mapeo queda abierto durante toda la vida del proceso; los valores se leen
+    del archivo mapeado sin copiarlos (arreglo NumPy o memoryview con formato 'Q')
+
+    Args:
+        file_path (str): Ruta del archivo con los n-gramas
+    """
+    global _worker_values, _worker_offsets
+
+    with open(file_path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(mapped).cast('Q')
+    count = view[0]
+    base = count + 2
+
+    if np is not None:
+        _worker_offsets = np.array(view[1:base], dtype=np.int64)
+        _worker_values = np.frombuffer(mapped, dtype=np.uint64, offset=8 * base)
+    else:
+        _worker_offsets = view[1:base].tolist()
+        _worker_values = view[base:]
+
+def _similarity_block(row_start, row_end):
+    """
+    Calcula la similitud de las filas [row_start, row_end) del triángulo superior
+
+    Args:
+        row_start (int): Primera fila del bloque
+        row_end (int): Fila siguiente a la última del bloque
+
+    Returns:
+        array: Similitudes en orden (i, j) con i < j
+    """
+    values = _worker_values
+    offsets = _worker_offsets
+    count = len(offsets) - 1
+    similarities = array('d')
+
+    if np is not None:
+        # Un solo recorrido de los documentos siguientes para todo el bloque
+        sizes = np.diff(offsets)
+        block_counts = block_intersection_counts(values, offsets, row_start, row_end)
+        for i in range(row_start, row_end):
+            shared = block_counts[i - row_start, i - row_start:]
+            union = sizes[i] + sizes[i + 1:] - shared
+            row = np.ones(len(union))
+            np.divide(shared, union, out=row, where=union > 0)
+            similarities.frombytes(row.tobytes())
+        return similarities
+
+    for i in range(row_start, row_end):
+        values_a = values[offsets[i]:offsets[i + 1]]
+        size_a = len(values_a)
+
+        for j in range(i + 1, count):
+            values_b = values[offsets[j]:offsets[j + 1]]
+            shared = sorted_intersection_count(values_a, values_b)
+            union = size_a + len(values_b) - shared
+            similarities.append(shared / union if union else 1)
+
+    return similarities
+
+def balanced_row_blocks(document_count, block_count):
+    """
+    Divide las filas del triángulo superior en bloques con un número similar de pares
+
+    Args:
+        document_count (int): Número de documentos
+        block_count (int): Número de bloques deseado
+
+    Returns:
+        list: Lista de tuplas (fila_inicial, fila_final)
+    """
+    total_pairs = document_count * (document_count - 1) // 2
+    if total_pairs == 0:
+        return []
+
+    target = total_pairs / max(1, block_count)
+    blocks = []
+    row_start = 0
+    accumulated = 0
+
+    # La fila i tiene (n - 1 - i) pares, por eso las primeras filas forman bloques más cortos
+    for i in range(document_count - 1):
+        accumulated += document_count - 1 - i
+        if accumulated >= target:
+            blocks.append((row_start, i + 1))
+            row_start = i + 1
+            accumulated = 0
+
+    if row_start < document_count - 1:
+        blocks.append((row_start, document_count - 1))
+
+    return blocks
+
+def iter_similarities(documents_ngrams, workers=None, blocks_per_worker=4):
+    """
+    Genera la similitud de Jaccard de cada par usando varios procesos
+    Los pares salen en el mismo orden que en jaccard.iter_similarities; solo hay
+    en vuelo unos pocos bloques por proceso, así que la memoria no crece con el
+    número de pares
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos como claves y listas de n-gramas como valores
+        workers (int): Número de procesos; si es None se usan todos los núcleos
+        blocks_per_worker (int): Bloques por proceso para equilibrar la carga (como mínimo)
+
+    Yields:
+        dict: Par de documentos con su similitud
+    """
+    workers = workers or os.cpu_count() or 1
+    document_names = list(documents_ngrams.keys())
+    document_count = len(document_names)
+    total_pairs = document_count * (document_count - 1) // 2
+    block_count = max(workers * blocks_per_worker, -(-total_pairs // MAX_BLOCK_PAIRS))
+    blocks = balanced_row_blocks(document_count, block_count)
+
+    if not blocks:
+        return
+
+    file_descriptor, file_path = tempfile.mkstemp(suffix='.ngrams')
+    os.close(file_descriptor)
+
+    try:
+        _write_ngram_file(documents_ngrams, file_path)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_file,
+                                 initargs=(file_path,)) as executor:
+            pending = deque()
+            next_block = 0
+
+            try:
+                while pending or next_block < len(blocks):
+                    # Mantener dos bloques en vuelo por proceso
+                    while next_block < len(blocks) and len(pending) < 2 * workers:
+                        row_start, row_end = blocks[next_block]
+                        pending.append((row_start, row_end, executor.submit(_similarity_block, row_start, row_end)))
+                        next_block += 1
+
+                    # Los resultados parciales se entregan en el orden de los bloques
+                    row_start, row_end, future = pending.popleft()
+                    similarities = future.result()
+                    position = 0
+                    for i in range(row_start, row_end):
+                        doc_a = document_names[i]
+                        for j in range(i + 1, document_count):
+                            yield {
+                                'doc_a': doc_a,
+                                'doc_b': document_names[j],
+                                'similarity': similarities[position]
+                            }
+                            position += 1
+            finally:
+                for _, _, future in pending:
+                    future.cancel()
+    finally:
+        os.remove(file_path)
+
+def calculate_similarity_matrix(documents_ngrams, workers=None, blocks_per_worker=4):
+    """
+    Calcula la matriz de similitud de Jaccard usando varios procesos
+    Compatible con jaccard.calculate_similarity_matrix
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos como claves y listas de n-gramas como valores
+        workers (int): Número de procesos; si es None se usan todos los núcleos
+        blocks_per_worker (int): Bloques por proceso para equilibrar la carga
+
+    Returns:
+        list: Lista de diccionarios con pares de documentos y su similitud
+    """
+    return list(iter_similarities(documents_ngrams, workers, blocks_per_worker))
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    print("Matriz de similitud (paralela):", calculate_similarity_matrix(documents_ngrams, 2))
@@ -0,0 +1,181 @@
+# Unión por similitud exacta con filtros de tamaño y de prefijo (AllPairs / PPJoin)
+"""
+Módulo para obtener exactamente los pares con similitud de Jaccard mayor o
+igual que un umbral t sin comparar todos los pares de documentos:
+
+- Filtro de tamaño: si |A| < t·|B| la similitud no puede llegar a t, así que
+  solo se comparan documentos de tamaño parecido.
+- Filtro de prefijo: los n-gramas de cada documento se ordenan de forma
+  global del menos frecuente al más frecuente. Dos documentos con similitud
+  >= t comparten al menos un n-grama en sus prefijos (los primeros
+  |A| - ⌈t·|A|⌉ + 1 n-gramas), así que solo se indexan y consultan los prefijos.
+- Filtro posicional (PPJoin): con la posición del n-grama compartido en cada
+  prefijo se acota cuántos n-gramas más pueden compartir; los candidatos que
+  no alcanzan el mínimo se descartan antes de verificarlos.
+
+Los candidatos que pasan los filtros se verifican con la intersección exacta,
+por lo que el resultado es el mismo que el del motor 'jaccard' filtrado por t
+"""
+
+import math
+
+# Tolerancia para que el redondeo de los límites nunca descarte un par válido
+EPSILON = 1e-9
+
+def _ceil(value):
+    """
+    Redondea hacia arriba tolerando el error de punto flotante (3.0000000000000004 -> 3)
+
+    Args:
+        value (float): Valor a redondear
+
+    Returns:
+        int: Entero inmediatamente mayor o igual
+    """
+    return math.ceil(value - EPSILON)
+
+def order_by_rarity(documents_ngrams):
+    """
+    Convierte los n-gramas de cada documento en rangos globales ordenados por rareza
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+
+    Returns:
+        list: Por documento, lista ordenada de rangos (0 = n-grama menos frecuente del corpus)
+    """
+    document_sets = [set(ngrams) for ngrams in documents_ngrams.values()]
+
+    frequencies = {}
+    for ngram_set in document_sets:
+        for ngram in ngram_set:
+            frequencies[ngram] = frequencies.get(ngram, 0) + 1
+
+    # sorted es estable: ante igual frecuencia se respeta el orden de aparición
+    ranks = {ngram: rank for rank, ngram in enumerate(sorted(frequencies, key=frequencies.__getitem__))}
+    return [sorted(ranks[ngram] for ngram in ngram_set) for ngram_set in document_sets]
+
+def similarity_join(records, threshold, stats=None):
+    """
+    Encuentra los pares de registros con similitud de Jaccard >= threshold
+
+    Args:
+        records (list): Listas ordenadas de rangos (ver order_by_rarity)
+        threshold (float): Umbral de similitud (mayor que 0)
+        stats (dict): Si se indica, se guardan 'candidates' (pares que llegaron a la
+            verificación) y 'pruned' (pares descartados por el filtro posicional)
+
+    Yields:
+        tuple: (i, j, n-gramas compartidos) con i < j en el orden original de los registros
+    """
+    if stats is None:
+        stats = {}
+    stats['candidates'] = 0
+    stats['pruned'] = 0
+
+    sets = [set(record) for record in records]
+    order = sorted(range(len(records)), key=lambda position: len(records[position]))
+    index = {}
+
+    for x in order:
+        record = records[x]
+        size = len(record)
+        if size == 0:
+            continue
+
+        # Tamaño mínimo de un documento comparable y prefijos de consulta y de indexado
+        min_size = max(1, _ceil(threshold * size))
+        probe_prefix = size - min_size + 1
+        index_prefix = size - max(1, _ceil(2 * threshold / (1 + threshold) * size)) + 1
+
+        overlaps = {}
+        for i in range(probe_prefix):
+            postings = index.get(record[i])
+            if postings is None:
+                continue
+
+            # Filtro de tamaño: las listas están en orden creciente de tamaño y los
+            # registros siguientes son mayores, así que los pequeños se eliminan
+            expired = 0
+            while expired < len(postings) and len(records[postings[expired][0]]) < min_size:
+                expired += 1
+            if expired:
+                del postings[:expired]
+
+            for y, j in postings:
+                overlap = overlaps.get(y, 0)
+                if overlap < 0:
+                    continue
+
+                # Filtro posicional: n-gramas compartidos posibles después de esta posición
+                other_size = len(records[y])
+                required = _ceil(threshold / (1 + threshold) * (size + other_size))
+                if overlap + 1 + min(size - i - 1, other_size - j - 1) >= required:
+                    overlaps[y] = overlap + 1
+                else:
+                    overlaps[y] = -1
+                    stats['pruned'] += 1
+
+        for i in range(index_prefix):
+            index.setdefault(record[i], []).append((x, i))
+
+        # Verificación exacta de los candidatos
+        for y, overlap in overlaps.items():
+            if overlap < 0:
+                continue
+            stats['candidates'] += 1
+            shared = len(sets[x].intersection(sets[y]))
+            if shared / (size + len(records[y]) - shared) >= threshold:
+                yield (y, x, shared) if y < x else (x, y, shared)
+
+def calculate_similarity_matrix(documents_ngrams, threshold=0.3, stats=None):
+    """
+    Calcula exactamente los pares con similitud >= threshold
+
+    Con threshold <= 0 no hay nada que filtrar y se devuelven los pares con al menos
+    un n-grama compartido (igual que el motor 'index')
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        threshold (float): Similitud mínima
+        stats (dict): Contadores de la unión (ver similarity_join)
+
+    Returns:
+        list: Lista de diccionarios con pares de documentos y su similitud, en orden (i, j)
+    """
+    document_names = list(documents_ngrams.keys())
+    records = order_by_rarity(documents_ngrams)
+    threshold = max(threshold, EPSILON)
+
+    pairs = list(similarity_join(records, threshold, stats))
+
+    # Dos documentos vacíos tienen similitud 1 (igual que jaccard_similarity)
+    empty = [position for position, record in enumerate(records) if not record]
+    for a in range(len(empty)):
+        for b in range(a + 1, len(empty)):
+            pairs.append((empty[a], empty[b], 0))
+
+    similarity_matrix = []
+    for i, j, shared in sorted(pairs):
+        size_a = len(records[i])
+        size_b = len(records[j])
+        similarity_matrix.append({
+            'doc_a': document_names[i],
+            'doc_b': document_names[j],
+            'similarity': shared / (size_a + size_b - shared) if size_a or size_b else 1
+        })
+
+    return similarity_matrix
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto', 'de texto largo'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido'],
+        'doc4.txt': ['otro documento', 'documento diferente', 'diferente contenido', 'contenido nuevo']
+    }
+
+    stats = {}
+    print("Pares con similitud >= 0.5:", calculate_similarity_matrix(documents_ngrams, 0.5, stats))
+    print("Candidatos verificados:", stats['candidates'], "de", len(documents_ngrams) * (len(documents_ngrams) - 1) // 2)
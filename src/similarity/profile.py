@@ -0,0 +1,312 @@
+# Perfiles de documento precalculados e intersección de arreglos ordenados
+"""
+Módulo con el perfil de cada documento para el motor 'jaccard'
+El perfil se construye una sola vez por documento: un arreglo ordenado y sin
+repetidos con el hash de 64 bits de cada n-grama y su cardinalidad. La
+similitud de un par se obtiene contando la intersección de los dos arreglos
+ordenados, sin construir conjuntos intermedios:
+
+    J(A,B) = |A ∩ B| / (|A| + |B| − |A ∩ B|)
+
+El conteo usa NumPy si está instalado (búsqueda binaria vectorizada de un
+arreglo en el otro y, al comparar un bloque de documentos con todos los
+siguientes, un índice invertido del bloque contra los perfiles concatenados). Sin NumPy se usa búsqueda
+galopante cuando un arreglo es mucho menor que el otro y, si no, un recorrido
+con dos índices sobre los dos arreglos ordenados; ninguno reserva memoria
+proporcional al tamaño de los documentos
+"""
+
+from array import array
+from bisect import bisect_left
+from src.hash.fingerprint import hash64
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A partir de esta proporción de tamaños se usa búsqueda galopante en lugar de la mezcla
+GALLOP_RATIO = 8
+
+class DocumentProfile:
+    """
+    Clase DocumentProfile - N-gramas de un documento como arreglo ordenado de hashes
+    """
+
+    __slots__ = ('name', 'values', 'size')
+
+    def __init__(self, name, ngrams):
+        """
+        Constructor del perfil
+
+        Args:
+            name (str): Nombre del documento
+            ngrams (iterable): N-gramas del documento (texto o identificadores enteros)
+        """
+        self.name = name
+        self.values = array('Q', sorted({hash64(ngram) for ngram in ngrams}))
+        self.size = len(self.values)
+
+    def __len__(self):
+        return self.size
+
+def _merge_count(values_a, values_b):
+    """
+    Cuenta los elementos comunes recorriendo dos arreglos ordenados sin repetidos
+
+    Un índice por arreglo avanza siempre sobre el menor de los dos valores
+    actuales; cuando son iguales se cuenta y avanzan ambos
+
+    Args:
+        values_a (array): Primer arreglo ordenado (no vacío)
+        values_b (array): Segundo arreglo ordenado (no vacío)
+
+    Returns:
+        int: Tamaño de la intersección
+    """
+    length_a = len(values_a)
+    length_b = len(values_b)
+    count = 0
+    i = 0
+    j = 0
+    value_a = values_a[0]
+    value_b = values_b[0]
+
+    while True:
+        if value_a < value_b:
+            i += 1
+            if i == length_a:
+                break
+            value_a = values_a[i]
+        elif value_b < value_a:
+            j += 1
+            if j == length_b:
+                break
+            value_b = values_b[j]
+        else:
+            count += 1
+            i += 1
+            j += 1
+            if i == length_a or j == length_b:
+                break
+            value_a = values_a[i]
+            value_b = values_b[j]
+
+    return count
+
+def _gallop_count(small, large):
+    """
+    Cuenta los elementos comunes buscando cada elemento del arreglo pequeño en el grande
+
+    La búsqueda avanza con saltos de tamaño creciente (1, 2, 4, ...) desde la
+    última posición encontrada y termina con una búsqueda binaria en el último salto
+
+    Args:
+        small (array): Arreglo ordenado pequeño
+        large (array): Arreglo ordenado grande
+
+    Returns:
+        int: Tamaño de la intersección
+    """
+    count = 0
+    position = 0
+    length = len(large)
+
+    for value in small:
+        step = 1
+        while position + step < length and large[position + step] < value:
+            step *= 2
+        position = bisect_left(large, value, position + step // 2, min(position + step + 1, length))
+        if position == length:
+            break
+        if large[position] == value:
+            count += 1
+
+    return count
+
+def sorted_intersection_count(values_a, values_b):
+    """
+    Cuenta los elementos comunes de dos arreglos ordenados sin repetidos
+
+    Args:
+        values_a (array): Primer arreglo de enteros de 64 bits sin signo (array('Q'),
+            memoryview con formato 'Q' o ndarray uint64)
+        values_b (array): Segundo arreglo, del mismo tipo
+
+    Returns:
+        int: Tamaño de la intersección
+    """
+    if len(values_a) > len(values_b):
+        values_a, values_b = values_b, values_a
+    if len(values_a) == 0:
+        return 0
+
+    if np is not None:
+        small = np.frombuffer(values_a, dtype=np.uint64)
+        large = np.frombuffer(values_b, dtype=np.uint64)
+        positions = np.searchsorted(large, small)
+        np.minimum(positions, len(large) - 1, out=positions)
+        return int(np.count_nonzero(large[positions] == small))
+
+    if len(values_b) >= GALLOP_RATIO * len(values_a):
+        return _gallop_count(values_a, values_b)
+    return _merge_count(values_a, values_b)
+
+def intersection_count(profile_a, profile_b):
+    """
+    Cuenta los n-gramas que comparten dos perfiles
+
+    Args:
+        profile_a (DocumentProfile): Primer perfil
+        profile_b (DocumentProfile): Segundo perfil
+
+    Returns:
+        int: |A ∩ B|
+    """
+    return sorted_intersection_count(profile_a.values, profile_b.values)
+
+def profile_similarity(profile_a, profile_b):
+    """
+    Calcula la similitud de Jaccard entre dos perfiles
+
+    Args:
+        profile_a (DocumentProfile): Primer perfil
+        profile_b (DocumentProfile): Segundo perfil
+
+    Returns:
+        float: Coeficiente de Jaccard (1 si ambos documentos están vacíos)
+    """
+    shared = intersection_count(profile_a, profile_b)
+    union = profile_a.size + profile_b.size - shared
+    return shared / union if union else 1
+
+def build_profiles(documents_ngrams):
+    """
+    Construye el perfil de cada documento
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+
+    Returns:
+        list: Perfiles en el orden del diccionario
+    """
+    return [DocumentProfile(doc_name, ngrams) for doc_name, ngrams in documents_ngrams.items()]
+
+# Valores de los documentos siguientes que block_intersection_counts examina en cada paso
+COLUMN_CHUNK = 1 << 20
+
+# Pares aproximados por bloque de filas en iter_profile_similarities
+BLOCK_PAIRS = 1 << 20
+
+def block_intersection_counts(values, offsets, row_start, row_end, column_chunk=COLUMN_CHUNK):
+    """
+    Cuenta con NumPy la intersección de un bloque de filas con todos los perfiles siguientes
+
+    Los valores del bloque se ordenan una sola vez (índice invertido del bloque:
+    hash -> filas) y los perfiles siguientes se recorren una vez, por tramos de
+    column_chunk valores; solo se expanden los valores que aparecen en el bloque.
+    La memoria temporal es O(column_chunk + valores del bloque) y no depende del
+    tamaño del corpus
+
+    Args:
+        values (ndarray): Valores uint64 de todos los perfiles concatenados
+        offsets (ndarray): Inicio int64 de cada perfil en values (más el final)
+        row_start (int): Primera fila del bloque
+        row_end (int): Fila siguiente a la última del bloque
+        column_chunk (int): Valores de los perfiles siguientes por paso
+
+    Returns:
+        ndarray: Matriz (row_end - row_start) × (n - row_start - 1) con |A_i ∩ A_j|
+                 en la posición [i - row_start, j - row_start - 1]; solo son válidas
+                 las posiciones con j > i
+    """
+    count = len(offsets) - 1
+    row_count = row_end - row_start
+    width = count - row_start - 1
+    counts = np.zeros(row_count * width, dtype=np.int64)
+    if width <= 0 or offsets[row_start] == offsets[row_end]:
+        return counts.reshape(row_count, max(width, 0))
+
+    # Índice invertido del bloque: valores ordenados con la fila de cada uno
+    block = values[offsets[row_start]:offsets[row_end]]
+    block_rows = np.repeat(np.arange(row_count, dtype=np.int64), np.diff(offsets[row_start:row_end + 1]))
+    order = np.argsort(block, kind='stable')
+    sorted_block = block[order]
+    sorted_rows = block_rows[order]
+
+    column_start = row_start + 1
+    while column_start < count:
+        # Tramo de documentos completos con unos column_chunk valores (al menos un documento)
+        limit = offsets[column_start] + column_chunk
+        column_end = max(column_start + 1, min(count, int(np.searchsorted(offsets, limit, 'right')) - 1))
+        base = offsets[column_start]
+        column_values = values[base:offsets[column_end]]
+
+        low = np.searchsorted(sorted_block, column_values, 'left')
+        high = np.searchsorted(sorted_block, column_values, 'right')
+        matched = np.flatnonzero(high > low)
+
+        if matched.size:
+            lengths = high[matched] - low[matched]
+            columns = np.searchsorted(offsets, base + matched, 'right') - 1 - (row_start + 1)
+
+            # Cada valor compartido suma 1 a cada fila del bloque que lo contiene
+            ends = np.cumsum(lengths)
+            positions = np.repeat(low[matched] - ends + lengths, lengths) + np.arange(ends[-1])
+            cells = sorted_rows[positions] * width + np.repeat(columns, lengths)
+            counts += np.bincount(cells, minlength=counts.size)
+
+        column_start = column_end
+
+    return counts.reshape(row_count, width)
+
+def iter_profile_similarities(profiles):
+    """
+    Genera la similitud de cada par de perfiles en orden (i, j) con i < j
+
+    Args:
+        profiles (list): Perfiles de los documentos
+
+    Yields:
+        tuple: (i, j, similitud)
+    """
+    count = len(profiles)
+
+    if np is None:
+        for i in range(count):
+            profile_a = profiles[i]
+            for j in range(i + 1, count):
+                yield i, j, profile_similarity(profile_a, profiles[j])
+        return
+
+    sizes = np.array([profile.size for profile in profiles], dtype=np.int64)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    values = np.frombuffer(b''.join(profile.values.tobytes() for profile in profiles), dtype=np.uint64)
+
+    # Bloques de filas con unos BLOCK_PAIRS pares: un recorrido de los perfiles siguientes por bloque
+    row_start = 0
+    while row_start < count - 1:
+        row_end = min(count - 1, row_start + max(1, BLOCK_PAIRS // (count - row_start)))
+        block_counts = block_intersection_counts(values, offsets, row_start, row_end)
+
+        for i in range(row_start, row_end):
+            shared = block_counts[i - row_start, i - row_start:]
+            union = sizes[i] + sizes[i + 1:] - shared
+            for j, shared_count, union_count in zip(range(i + 1, count), shared.tolist(), union.tolist()):
+                yield i, j, shared_count / union_count if union_count else 1
+
+        row_start = row_end
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    profiles = build_profiles(documents_ngrams)
+    print("Similitud doc1-doc2:", profile_similarity(profiles[0], profiles[1]))
+    for i, j, similarity in iter_profile_similarities(profiles):
+        print(f"{profiles[i].name} - {profiles[j].name}: {similarity:.2f}")
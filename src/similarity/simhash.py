@@ -0,0 +1,277 @@
+# Detección rápida de casi duplicados con SimHash
+"""
+Módulo para detectar documentos casi idénticos antes del cálculo de similitud
+Cada documento se resume en una huella SimHash de 64 o 128 bits calculada a
+partir de sus n-gramas: documentos con n-gramas casi iguales tienen huellas
+que difieren en pocos bits (distancia de Hamming pequeña).
+
+Las huellas se guardan en tablas permutadas (Manku et al.): la huella se
+divide en k + 1 bloques y por cada bloque hay una tabla ordenada donde ese
+bloque ocupa los bits más significativos. Si dos huellas difieren en a lo
+sumo k bits, al menos un bloque coincide exactamente (principio del
+palomar), así que basta buscar con bisección el rango de cada tabla que
+comparte ese bloque y verificar solo esos candidatos
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left
+from src.hash.fingerprint import hash64, MASK_64
+
+def _feature_hash(ngram, bits=64):
+    """
+    Calcula el hash de un n-grama con el número de bits de la huella
+
+    Args:
+        ngram (str | int): N-grama en texto o identificador entero
+        bits (int): 64 o 128
+
+    Returns:
+        int: Hash del n-grama
+    """
+    if bits == 64:
+        # Mezcla final de MurmurHash3 para que todos los bits de los identificadores enteros sean uniformes
+        value = hash64(ngram)
+        value ^= value >> 33
+        value = (value * 0xFF51AFD7ED558CCD) & MASK_64
+        return value ^ (value >> 33)
+
+    data = ngram.encode('utf-8') if isinstance(ngram, str) else (ngram & MASK_64).to_bytes(8, 'little')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=bits // 8).digest(), 'little')
+
+def simhash(ngrams, bits=64):
+    """
+    Calcula la huella SimHash de un documento
+
+    Cada n-grama distinto vota +1 o -1 en cada posición según el bit de su hash;
+    el bit de la huella es 1 si los votos positivos son mayoría
+
+    Args:
+        ngrams (iterable): N-gramas del documento
+        bits (int): Tamaño de la huella (64 o 128)
+
+    Returns:
+        int: Huella del documento
+    """
+    hashes = [_feature_hash(ngram, bits) for ngram in set(ngrams)]
+    if not hashes:
+        return 0
+
+    # Las columnas de las cadenas binarias dan el conteo de unos de cada bit
+    binary = [format(value, f'0{bits}b') for value in hashes]
+    half = len(hashes) / 2
+    fingerprint = 0
+    for column in zip(*binary):
+        fingerprint = (fingerprint << 1) | (column.count('1') > half)
+
+    return fingerprint
+
+def hamming_distance(first, second):
+    """
+    Calcula el número de bits distintos entre dos huellas
+
+    Args:
+        first (int): Primera huella
+        second (int): Segunda huella
+
+    Returns:
+        int: Distancia de Hamming
+    """
+    return bin(first ^ second).count('1')
+
+class SimHashIndex:
+    """
+    Clase SimHashIndex - Búsqueda de huellas a distancia de Hamming <= k con tablas permutadas
+    """
+
+    def __init__(self, bits=64, max_distance=3):
+        """
+        Constructor del índice
+
+        Args:
+            bits (int): Tamaño de las huellas (64 o 128)
+            max_distance (int): Distancia de Hamming máxima k que se busca
+        """
+        if max_distance >= bits:
+            raise ValueError("La distancia máxima debe ser menor que el número de bits")
+
+        self.bits = bits
+        self.max_distance = max_distance
+        self.mask = (1 << bits) - 1
+        self.names = []
+        self.fingerprints = []
+
+        # k + 1 bloques (inicio desde el bit menos significativo, ancho)
+        block_count = max_distance + 1
+        self.blocks = []
+        start = 0
+        for i in range(block_count):
+            width = bits // block_count + (1 if i < bits % block_count else 0)
+            self.blocks.append((start, width))
+            start += width
+
+        # Una tabla ordenada por bloque: huellas permutadas y posición del documento
+        self.tables = [(array('Q') if bits == 64 else [], array('I')) for _ in self.blocks]
+        self._sorted = True
+
+    def _permute(self, fingerprint, block):
+        """
+        Rota la huella para que el bloque indicado quede en los bits más significativos
+
+        Args:
+            fingerprint (int): Huella original
+            block (int): Número de bloque
+
+        Returns:
+            int: Huella permutada
+        """
+        start, width = self.blocks[block]
+        shift = self.bits - (start + width)
+        if shift == 0:
+            return fingerprint
+        return ((fingerprint << shift) | (fingerprint >> (self.bits - shift))) & self.mask
+
+    def add(self, name, fingerprint):
+        """
+        Agrega la huella de un documento
+
+        Args:
+            name (str): Nombre del documento
+            fingerprint (int): Huella SimHash
+        """
+        position = len(self.names)
+        self.names.append(name)
+        self.fingerprints.append(fingerprint)
+
+        for block, (values, positions) in enumerate(self.tables):
+            values.append(self._permute(fingerprint, block))
+            positions.append(position)
+        self._sorted = False
+
+    def _sort_tables(self):
+        """
+        Ordena cada tabla por su huella permutada
+        """
+        sorted_tables = []
+        for values, positions in self.tables:
+            order = sorted(range(len(values)), key=values.__getitem__)
+            sorted_values = [values[i] for i in order]
+            # Las huellas de 64 bits caben en un arreglo compacto; las de 128 bits quedan en una lista
+            if isinstance(values, array):
+                sorted_values = array('Q', sorted_values)
+            sorted_tables.append((sorted_values, array('I', (positions[i] for i in order))))
+        self.tables = sorted_tables
+        self._sorted = True
+
+    def _block_range(self, values, permuted, block):
+        """
+        Busca el rango de una tabla cuyo bloque principal coincide con el de la huella
+
+        Args:
+            values (array | list): Huellas permutadas ordenadas
+            permuted (int): Huella consultada, ya permutada
+            block (int): Número de bloque
+
+        Returns:
+            tuple: (inicio, fin) del rango
+        """
+        low_bits = self.bits - self.blocks[block][1]
+        prefix = permuted >> low_bits
+        return bisect_left(values, prefix << low_bits), bisect_left(values, (prefix + 1) << low_bits)
+
+    def query(self, fingerprint, max_distance=None):
+        """
+        Busca los documentos con huella a distancia <= max_distance
+
+        Args:
+            fingerprint (int): Huella consultada
+            max_distance (int): Distancia máxima (por defecto la del índice; no puede ser mayor)
+
+        Returns:
+            list: Tuplas (nombre, distancia) ordenadas por distancia
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        if not self._sorted:
+            self._sort_tables()
+
+        found = {}
+        for block, (values, positions) in enumerate(self.tables):
+            start, end = self._block_range(values, self._permute(fingerprint, block), block)
+            for position in positions[start:end]:
+                if position not in found:
+                    found[position] = hamming_distance(fingerprint, self.fingerprints[position])
+
+        matches = [(self.names[position], distance) for position, distance in found.items()
+                   if distance <= max_distance]
+        return sorted(matches, key=lambda match: match[1])
+
+    def near_duplicate_pairs(self):
+        """
+        Obtiene todos los pares de documentos indexados a distancia <= max_distance
+
+        Returns:
+            list: Diccionarios {'doc_a', 'doc_b', 'distance'} en orden de inserción de los documentos
+        """
+        if not self._sorted:
+            self._sort_tables()
+
+        found = {}
+        for block, (values, positions) in enumerate(self.tables):
+            low_bits = self.bits - self.blocks[block][1]
+            run_start = 0
+
+            # Los documentos que comparten el bloque principal quedan contiguos en la tabla
+            for i in range(1, len(values) + 1):
+                if i < len(values) and values[i] >> low_bits == values[run_start] >> low_bits:
+                    continue
+                run = sorted(positions[run_start:i])
+                for a in range(len(run)):
+                    for b in range(a + 1, len(run)):
+                        pair = (run[a], run[b])
+                        if pair not in found:
+                            found[pair] = hamming_distance(self.fingerprints[run[a]], self.fingerprints[run[b]])
+                run_start = i
+
+        return [
+            {'doc_a': self.names[a], 'doc_b': self.names[b], 'distance': distance}
+            for (a, b), distance in sorted(found.items())
+            if distance <= self.max_distance
+        ]
+
+    def __len__(self):
+        return len(self.names)
+
+def find_near_duplicates(documents_ngrams, max_distance=3, bits=64):
+    """
+    Calcula la huella de cada documento y devuelve los pares casi idénticos
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        max_distance (int): Distancia de Hamming máxima entre huellas
+        bits (int): Tamaño de las huellas (64 o 128)
+
+    Returns:
+        list: Diccionarios {'doc_a', 'doc_b', 'distance'}
+    """
+    index = SimHashIndex(bits, max_distance)
+    for doc_name, ngrams in documents_ngrams.items():
+        index.add(doc_name, simhash(ngrams, bits))
+
+    return index.near_duplicate_pairs()
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de', 'ejemplo de texto', 'de texto largo'],
+        'doc2.txt': ['este es un', 'es un ejemplo', 'un ejemplo de', 'ejemplo de texto', 'de texto corto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    fingerprints = {doc_name: simhash(ngrams) for doc_name, ngrams in documents_ngrams.items()}
+    for doc_name, fingerprint in fingerprints.items():
+        print(f"{doc_name}: {fingerprint:016x}")
+
+    print("Distancia doc1-doc2:", hamming_distance(fingerprints['doc1.txt'], fingerprints['doc2.txt']))
+    print("Distancia doc1-doc3:", hamming_distance(fingerprints['doc1.txt'], fingerprints['doc3.txt']))
+    print("Casi duplicados (k=3):", find_near_duplicates(documents_ngrams, 3))
@@ -0,0 +1,162 @@
+# Similitud de Jaccard vectorizada con matrices dispersas
+"""
+Módulo para calcular la similitud de Jaccard de todos los pares con NumPy/SciPy
+Los documentos se representan como una matriz binaria dispersa (CSR) de
+documentos × n-gramas que se construye una sola vez. El producto X·Xᵀ da el
+número de n-gramas compartidos por cada par; la unión se obtiene como
+|A| + |B| − |A∩B|. El producto se calcula por bloques de filas para acotar
+la memoria. Los pares que no comparten ningún n-grama no aparecen en el
+resultado (igual que en el motor 'index')
+
+Requiere numpy y scipy (pip install numpy scipy)
+"""
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+def _require_scipy():
+    """
+    Verifica que numpy y scipy estén instalados
+
+    Raises:
+        ImportError: Si falta alguna de las dos bibliotecas
+    """
+    if np is None or sparse is None:
+        raise ImportError("El motor 'sparse' requiere numpy y scipy: pip install numpy scipy")
+
+def build_document_matrix(documents_ngrams):
+    """
+    Construye la matriz binaria dispersa documentos × n-gramas
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+
+    Returns:
+        csr_matrix: Matriz (documentos × n-gramas distintos) con 1 donde el documento contiene el n-grama
+    """
+    _require_scipy()
+
+    columns = {}
+    indptr = [0]
+    indices = []
+
+    # Cada n-grama distinto del corpus recibe un número de columna
+    for ngrams in documents_ngrams.values():
+        for ngram in set(ngrams):
+            indices.append(columns.setdefault(ngram, len(columns)))
+        indptr.append(len(indices))
+
+    indices = np.array(indices, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.int32)
+    matrix = sparse.csr_matrix((data, indices, np.array(indptr, dtype=np.int64)),
+                               shape=(len(documents_ngrams), len(columns)))
+    matrix.sort_indices()
+    return matrix
+
+def similarity_blocks(matrix, threshold=0.0, block_size=256):
+    """
+    Calcula por bloques de filas las similitudes del triángulo superior
+
+    Args:
+        matrix (csr_matrix): Matriz binaria documentos × n-gramas
+        threshold (float): Similitud mínima para conservar un par
+        block_size (int): Filas por bloque del producto disperso
+
+    Yields:
+        tuple: (filas, columnas, similitudes) de cada bloque como arreglos de NumPy,
+               ordenados por fila y luego por columna
+    """
+    _require_scipy()
+
+    sizes = np.diff(matrix.indptr).astype(np.float64)
+    transposed = matrix.T.tocsr()
+    document_count = matrix.shape[0]
+
+    for row_start in range(0, document_count, block_size):
+        row_end = min(row_start + block_size, document_count)
+
+        # Intersecciones del bloque con todos los documentos en un solo producto disperso
+        shared = (matrix[row_start:row_end] @ transposed).tocoo()
+        rows = shared.row.astype(np.int64) + row_start
+        columns = shared.col.astype(np.int64)
+        counts = shared.data.astype(np.float64)
+
+        # Solo el triángulo superior (i < j)
+        upper = columns > rows
+        rows = rows[upper]
+        columns = columns[upper]
+        counts = counts[upper]
+
+        similarities = counts / (sizes[rows] + sizes[columns] - counts)
+        if threshold > 0:
+            keep = similarities >= threshold
+            rows = rows[keep]
+            columns = columns[keep]
+            similarities = similarities[keep]
+
+        order = np.lexsort((columns, rows))
+        yield rows[order], columns[order], similarities[order]
+
+def calculate_sparse_similarity(documents_ngrams, threshold=0.0, block_size=256):
+    """
+    Calcula las similitudes como matriz dispersa triangular superior
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        threshold (float): Similitud mínima para conservar un par
+        block_size (int): Filas por bloque del producto disperso
+
+    Returns:
+        csr_matrix: Matriz documentos × documentos con la similitud de cada par (i < j)
+    """
+    matrix = build_document_matrix(documents_ngrams)
+    blocks = list(similarity_blocks(matrix, threshold, block_size))
+    document_count = matrix.shape[0]
+
+    if not blocks:
+        return sparse.csr_matrix((document_count, document_count))
+
+    rows, columns, similarities = (np.concatenate(parts) for parts in zip(*blocks))
+    return sparse.csr_matrix((similarities, (rows, columns)), shape=(document_count, document_count))
+
+def calculate_similarity_matrix(documents_ngrams, threshold=0.0, block_size=256):
+    """
+    Calcula la matriz de similitud de Jaccard con productos de matrices dispersas
+    Compatible con jaccard.calculate_similarity_matrix, pero omite los pares sin n-gramas compartidos
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y listas de n-gramas
+        threshold (float): Similitud mínima para incluir un par
+        block_size (int): Filas por bloque del producto disperso
+
+    Returns:
+        list: Lista de diccionarios con pares de documentos y su similitud, en orden (i, j)
+    """
+    document_names = list(documents_ngrams.keys())
+    matrix = build_document_matrix(documents_ngrams)
+    similarity_matrix = []
+
+    for rows, columns, similarities in similarity_blocks(matrix, threshold, block_size):
+        for i, j, similarity in zip(rows.tolist(), columns.tolist(), similarities.tolist()):
+            similarity_matrix.append({
+                'doc_a': document_names[i],
+                'doc_b': document_names[j],
+                'similarity': similarity
+            })
+
+    return similarity_matrix
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    documents_ngrams = {
+        'doc1.txt': ['este es un', 'es un ejemplo', 'un ejemplo de'],
+        'doc2.txt': ['es un ejemplo', 'un ejemplo de', 'ejemplo de texto'],
+        'doc3.txt': ['otro documento', 'documento diferente', 'diferente contenido']
+    }
+
+    print("Matriz de similitud (dispersa):", calculate_similarity_matrix(documents_ngrams))
+    print("Matriz dispersa:\n", calculate_sparse_similarity(documents_ngrams))
@@ -1 +1,3 @@
-# Paquete de algoritmos de ordenamiento
+# Paquete de algoritmos de ordenamiento
+from src.sorting.merge_sort import merge_sort, get_top_similar_pairs
+from src.sorting.top_n import TopNCollector
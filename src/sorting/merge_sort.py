@@ -1 +1,127 @@
-# Implementación del algoritmo Merge Sort
+# Implementación del algoritmo Merge Sort
+"""
+Módulo de ordenamiento de los resultados de similitud
+Incluye Merge Sort (estable, O(n log n)) y la selección de los N pares
+más similares con un montículo acotado
+"""
+
+from src.sorting.top_n import TopNCollector
+
+def _key_function(key):
+    """
+    Convierte el parámetro key en una función
+
+    Args:
+        key (str | callable | None): Nombre del campo, función o None
+
+    Returns:
+        callable: Función que obtiene el valor de comparación de un elemento
+    """
+    if key is None:
+        return lambda item: item
+    if callable(key):
+        return key
+    return lambda item: item[key]
+
+def merge_sort(arr, key=None, ascending=False):
+    """
+    Ordena una lista con Merge Sort (estable)
+    Usa un único arreglo auxiliar en lugar de copiar sublistas en cada llamada
+
+    Args:
+        arr (list): Lista a ordenar (no se modifica)
+        key (str | callable): Campo del diccionario o función para comparar
+        ascending (bool): True para orden ascendente, False para descendente
+
+    Returns:
+        list: Nueva lista ordenada
+    """
+    items = list(arr)
+    if len(items) <= 1:
+        return items
+
+    get_value = _key_function(key)
+    values = [get_value(item) for item in items]
+    order = list(range(len(items)))
+    buffer = order[:]
+
+    # Merge Sort de abajo hacia arriba: se combinan tramos de tamaño 1, 2, 4, ...
+    width = 1
+    length = len(order)
+    while width < length:
+        for start in range(0, length, 2 * width):
+            middle = min(start + width, length)
+            end = min(start + 2 * width, length)
+            merge(order, buffer, start, middle, end, values, ascending)
+        order, buffer = buffer, order
+        width *= 2
+
+    return [items[index] for index in order]
+
+def merge(source, target, start, middle, end, values, ascending):
+    """
+    Combina los tramos ordenados source[start:middle] y source[middle:end] en target
+
+    Args:
+        source (list): Índices con los dos tramos ordenados
+        target (list): Arreglo donde se escribe el resultado
+        start (int): Inicio del primer tramo
+        middle (int): Inicio del segundo tramo
+        end (int): Fin del segundo tramo
+        values (list): Valores de comparación por índice
+        ascending (bool): Orden ascendente o descendente
+    """
+    left_index = start
+    right_index = middle
+    position = start
+
+    while left_index < middle and right_index < end:
+        left_value = values[source[left_index]]
+        right_value = values[source[right_index]]
+
+        # Ante empate se toma el de la izquierda para mantener la estabilidad
+        if ascending:
+            should_take_left = left_value <= right_value
+        else:
+            should_take_left = left_value >= right_value
+
+        if should_take_left:
+            target[position] = source[left_index]
+            left_index += 1
+        else:
+            target[position] = source[right_index]
+            right_index += 1
+        position += 1
+
+    # Copiar los elementos restantes
+    remaining = source[left_index:middle] + source[right_index:end]
+    target[position:end] = remaining
+
+def get_top_similar_pairs(similarity_pairs, n=10):
+    """
+    Devuelve los N pares más similares sin ordenar la lista completa
+    Acepta cualquier iterable (por ejemplo, un generador de pares), por lo que
+    la lista completa de pares no necesita existir en memoria
+
+    Args:
+        similarity_pairs (iterable): Pares de documentos con su similitud
+        n (int): Número de pares a devolver
+
+    Returns:
+        list: Los N pares con mayor similitud, de mayor a menor
+    """
+    collector = TopNCollector(n)
+    collector.add_many(similarity_pairs)
+    return collector.results()
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    similarity_pairs = [
+        {'doc_a': 'doc1.txt', 'doc_b': 'doc2.txt', 'similarity': 0.85},
+        {'doc_a': 'doc1.txt', 'doc_b': 'doc3.txt', 'similarity': 0.35},
+        {'doc_a': 'doc2.txt', 'doc_b': 'doc3.txt', 'similarity': 0.55},
+        {'doc_a': 'doc3.txt', 'doc_b': 'doc4.txt', 'similarity': 0.25}
+    ]
+
+    print("Ordenados (Merge Sort):", merge_sort(similarity_pairs, 'similarity', False))
+    print("Top 2:", get_top_similar_pairs(iter(similarity_pairs), 2))
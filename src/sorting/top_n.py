@@ -0,0 +1,90 @@
+# Selección de los N mejores resultados con un montículo acotado
+"""
+Módulo para seleccionar los N pares más similares en streaming
+Se mantiene un montículo mínimo de tamaño N: cada par nuevo solo se compara
+con el peor de los N guardados, así el costo es O(P log N) en tiempo y
+O(N) en memoria para P pares
+"""
+
+import heapq
+from itertools import count
+
+class TopNCollector:
+    """
+    Clase TopNCollector - Conserva los N elementos con mayor valor vistos hasta ahora
+    """
+
+    def __init__(self, n=10, key='similarity'):
+        """
+        Constructor del colector
+
+        Args:
+            n (int): Número de elementos a conservar
+            key (str | callable): Campo del diccionario o función que da el valor a maximizar
+        """
+        self.n = n
+        self.key = key if callable(key) else (lambda item: item[key])
+        self._heap = []
+        # Contador de llegada: ante empate se conserva el elemento que llegó primero
+        self._sequence = count()
+
+    def add(self, item):
+        """
+        Considera un elemento para el top N
+
+        Args:
+            item (any): Elemento (por ejemplo, un diccionario de par de documentos)
+        """
+        if self.n <= 0:
+            return
+
+        entry = (self.key(item), -next(self._sequence), item)
+
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def add_many(self, items):
+        """
+        Considera varios elementos, consumiéndolos a medida que se producen
+
+        Args:
+            items (iterable): Elementos a considerar
+        """
+        for item in items:
+            self.add(item)
+
+    def minimum(self):
+        """
+        Obtiene el menor valor que todavía entra en el top N
+
+        Returns:
+            any: Valor mínimo del top N, o None si aún no hay N elementos
+        """
+        if len(self._heap) < self.n:
+            return None
+        return self._heap[0][0]
+
+    def results(self):
+        """
+        Obtiene los elementos conservados de mayor a menor
+
+        Returns:
+            list: Lista de elementos ordenada por valor descendente
+        """
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    collector = TopNCollector(2)
+    collector.add_many([
+        {'doc_a': 'doc1.txt', 'doc_b': 'doc2.txt', 'similarity': 0.85},
+        {'doc_a': 'doc1.txt', 'doc_b': 'doc3.txt', 'similarity': 0.35},
+        {'doc_a': 'doc2.txt', 'doc_b': 'doc3.txt', 'similarity': 0.55}
+    ])
+
+    print("Top 2:", collector.results())
@@ -1 +1 @@
-# Paquete de utilidades
+# Paquete de utilidades
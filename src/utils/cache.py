@@ -0,0 +1,298 @@
+# Caché persistente de huellas de n-gramas
+"""
+Caché en disco de los n-gramas procesados de cada documento
+Cada entrada se identifica por ruta + tamaño + fecha de modificación + hash
+del contenido + tamaño de n-grama + codificación + ventana de winnowing. En una nueva ejecución
+solo se vuelven a procesar los archivos nuevos o modificados; el resto se
+carga en bloque desde un archivo binario compacto
+"""
+
+import hashlib
+import os
+import struct
+from array import array
+from src.utils.preprocessing import list_document_paths, read_document, preprocess_stream
+
+CACHE_MAGIC = b'NGCACHE2'
+ENCODINGS = ('text', 'ids')
+
+# Cabecera de cada entrada: longitud de la ruta, tamaño, mtime (ns), tamaño de n-grama,
+# ventana de winnowing (0 = sin winnowing), codificación, longitud de los datos,
+# hash del contenido (16 bytes)
+ENTRY_HEADER = struct.Struct('<IqqHHBQ16s')
+
+def content_digest(text):
+    """
+    Calcula el hash del contenido de un documento
+
+    Args:
+        text (str): Contenido del documento
+
+    Returns:
+        bytes: Hash de 16 bytes
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def _encode_ngrams(ngrams, encoding):
+    """
+    Serializa los n-gramas de un documento
+
+    Args:
+        ngrams (list | array): N-gramas del documento
+        encoding (str): 'text' o 'ids'
+
+    Returns:
+        bytes: N-gramas serializados
+    """
+    if encoding == 'ids':
+        return array('Q', ngrams).tobytes()
+    # Los n-gramas limpios nunca contienen saltos de línea
+    return '\n'.join(ngrams).encode('utf-8')
+
+def _decode_ngrams(data, encoding):
+    """
+    Reconstruye los n-gramas de un documento
+
+    Args:
+        data (bytes): N-gramas serializados
+        encoding (str): 'text' o 'ids'
+
+    Returns:
+        list | array: N-gramas del documento
+    """
+    if encoding == 'ids':
+        ngrams = array('Q')
+        ngrams.frombytes(data)
+        return ngrams
+    if not data:
+        return []
+    return data.decode('utf-8').split('\n')
+
+class FingerprintCache:
+    """
+    Clase FingerprintCache - Caché de n-gramas por documento guardada en un archivo binario
+    """
+
+    def __init__(self, cache_path):
+        """
+        Constructor de la caché; carga el archivo si existe
+
+        Args:
+            cache_path (str): Ruta del archivo de caché
+        """
+        self.cache_path = cache_path
+        # (ruta, tamaño de n-grama, codificación, ventana) -> (tamaño, mtime_ns, hash, n-gramas serializados)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        """
+        Carga todas las entradas del archivo de caché en una sola lectura
+
+        Un archivo truncado o dañado se trata igual que uno no reconocido: la caché
+        empieza vacía y se reconstruye al guardarla
+        """
+        self.entries = {}
+
+        try:
+            with open(self.cache_path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            return
+
+        if not data.startswith(CACHE_MAGIC):
+            print(f"Caché no reconocida, se ignorará: {self.cache_path}")
+            return
+
+        view = memoryview(data)
+        offset = len(CACHE_MAGIC)
+
+        try:
+            while offset < len(data):
+                path_length, size, mtime_ns, ngram_size, window, encoding_code, data_length, digest = \
+                    ENTRY_HEADER.unpack_from(data, offset)
+                offset += ENTRY_HEADER.size
+
+                path = bytes(view[offset:offset + path_length]).decode('utf-8')
+                offset += path_length
+                payload = bytes(view[offset:offset + data_length])
+                offset += data_length
+                if offset > len(data):
+                    raise ValueError("entrada truncada")
+
+                key = (path, ngram_size, ENCODINGS[encoding_code], window)
+                self.entries[key] = (size, mtime_ns, digest, payload)
+        except (struct.error, ValueError, IndexError):
+            print(f"Caché dañada, se reconstruirá: {self.cache_path}")
+            self.entries = {}
+
+    def save(self):
+        """
+        Guarda la caché de forma atómica (archivo temporal + reemplazo)
+        """
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = self.cache_path + '.tmp'
+
+        with open(temporary_path, 'wb') as file:
+            file.write(CACHE_MAGIC)
+            for (path, ngram_size, encoding, window), (size, mtime_ns, digest, payload) in self.entries.items():
+                encoded_path = path.encode('utf-8')
+                file.write(ENTRY_HEADER.pack(len(encoded_path), size, mtime_ns, ngram_size, window,
+                                             ENCODINGS.index(encoding), len(payload), digest))
+                file.write(encoded_path)
+                file.write(payload)
+
+        os.replace(temporary_path, self.cache_path)
+
+    def get(self, path, ngram_size, encoding, size, mtime_ns, digest=None, window=0):
+        """
+        Busca los n-gramas guardados de un documento
+
+        Si el tamaño y la fecha de modificación coinciden, la entrada se considera
+        válida sin leer el archivo; si no, se compara el hash del contenido
+
+        Args:
+            path (str): Ruta absoluta del documento
+            ngram_size (int): Tamaño de n-grama
+            encoding (str): Codificación de los n-gramas
+            size (int): Tamaño actual del archivo
+            mtime_ns (int): Fecha de modificación actual en nanosegundos
+            digest (bytes): Hash del contenido actual (opcional)
+            window (int): Ventana de winnowing (0 = sin winnowing)
+
+        Returns:
+            list | array: N-gramas guardados o None si no hay una entrada válida
+        """
+        key = (path, ngram_size, encoding, window)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        cached_size, cached_mtime_ns, cached_digest, payload = entry
+        if cached_size == size and cached_mtime_ns == mtime_ns:
+            return _decode_ngrams(payload, encoding)
+
+        if digest is not None and digest == cached_digest:
+            # El contenido no cambió (por ejemplo, el archivo solo se copió): actualizar la fecha
+            self.entries[key] = (size, mtime_ns, cached_digest, payload)
+            return _decode_ngrams(payload, encoding)
+
+        return None
+
+    def put(self, path, ngram_size, encoding, size, mtime_ns, digest, ngrams, window=0):
+        """
+        Guarda los n-gramas de un documento
+
+        Args:
+            path (str): Ruta absoluta del documento
+            ngram_size (int): Tamaño de n-grama
+            encoding (str): Codificación de los n-gramas
+            size (int): Tamaño del archivo
+            mtime_ns (int): Fecha de modificación en nanosegundos
+            digest (bytes): Hash del contenido
+            ngrams (list | array): N-gramas del documento
+            window (int): Ventana de winnowing (0 = sin winnowing)
+        """
+        self.entries[(path, ngram_size, encoding, window)] = (size, mtime_ns, digest, _encode_ngrams(ngrams, encoding))
+
+    def prune(self, existing_paths, directory=None):
+        """
+        Elimina las entradas de documentos que ya no existen
+
+        Args:
+            existing_paths (set): Rutas absolutas de los documentos actuales
+            directory (str): Si se indica, solo se revisan las entradas bajo ese directorio
+
+        Returns:
+            int: Número de entradas eliminadas
+        """
+        prefix = os.path.join(directory, '') if directory is not None else ''
+        removed = [
+            key for key in self.entries
+            if key[0] not in existing_paths and key[0].startswith(prefix)
+        ]
+        for key in removed:
+            del self.entries[key]
+        return len(removed)
+
+def load_fingerprints(dir_path, n=3, cache_path=None, encoding='text', workers=1, recursive=True, window=None):
+    """
+    Obtiene los n-gramas de todos los documentos de un directorio usando la caché
+
+    Args:
+        dir_path (str): Ruta del directorio
+        n (int): Tamaño del n-grama
+        cache_path (str): Archivo de caché; por defecto .ngram_cache.bin dentro del directorio
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        workers (int): Procesos para preprocesar los documentos nuevos o modificados
+        recursive (bool): Si es True también se recorren los subdirectorios
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+
+    Returns:
+        tuple: (documents_ngrams, estadísticas) donde estadísticas es un diccionario
+               con 'hits', 'misses' y 'removed'
+    """
+    if cache_path is None:
+        cache_path = os.path.join(dir_path, '.ngram_cache.bin')
+
+    # Las huellas de winnowing siempre son enteros de 64 bits
+    window = window or 0
+    if window:
+        encoding = 'ids'
+
+    cache = FingerprintCache(cache_path)
+    documents_ngrams = {}
+    pending_info = {}
+    existing_paths = set()
+    stats = {'hits': 0, 'misses': 0, 'removed': 0}
+
+    try:
+        files = list_document_paths(dir_path, recursive)
+    except Exception as e:
+        print(f"Error al cargar documentos del directorio: {e}")
+        return {}, stats
+
+    def iter_misses():
+        """
+        Recorre los archivos, resuelve los aciertos de la caché y entrega el texto de los fallos
+        """
+        for file, file_path in files:
+            path = os.path.abspath(file_path)
+            existing_paths.add(path)
+            file_stat = os.stat(path)
+
+            # Primero se intenta sin leer el archivo (tamaño + fecha de modificación)
+            ngrams = cache.get(path, n, encoding, file_stat.st_size, file_stat.st_mtime_ns, window=window)
+            if ngrams is None:
+                text = read_document(path)
+                digest = content_digest(text)
+                ngrams = cache.get(path, n, encoding, file_stat.st_size, file_stat.st_mtime_ns, digest, window)
+
+            # Se reserva la posición para conservar el orden de los archivos
+            documents_ngrams[file] = ngrams
+            if ngrams is None:
+                pending_info[file] = (path, file_stat.st_size, file_stat.st_mtime_ns, digest)
+                yield file, text
+
+    # Solo los documentos nuevos o modificados se preprocesan, a medida que se leen:
+    # el texto de cada fallo se descarta en cuanto su lote termina
+    for file, ngrams in preprocess_stream(iter_misses(), n, workers, encoding=encoding, window=window):
+        path, size, mtime_ns, digest = pending_info[file]
+        cache.put(path, n, encoding, size, mtime_ns, digest, ngrams, window)
+        documents_ngrams[file] = ngrams
+
+    stats['misses'] = len(pending_info)
+    stats['hits'] = len(files) - len(pending_info)
+    stats['removed'] = cache.prune(existing_paths, os.path.abspath(dir_path))
+    cache.save()
+
+    return documents_ngrams, stats
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else './documentos'
+    documents_ngrams, stats = load_fingerprints(directory)
+    print(f"Documentos: {len(documents_ngrams)} (en caché: {stats['hits']}, procesados: {stats['misses']})")
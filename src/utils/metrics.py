@@ -0,0 +1,257 @@
+# Instrumentación de las etapas del detector
+"""
+Módulo para medir cada etapa del flujo del detector de plagio
+Cada etapa registra tiempo real, tiempo de CPU y, si se activa, la memoria
+asignada (tracemalloc), junto con contadores propios de la etapa (n-gramas
+por documento, factor de carga de la tabla hash, pares evaluados, etc.).
+Los resultados se exportan como líneas JSON o en el formato de texto de
+Prometheus. Opcionalmente cada etapa se ejecuta con cProfile y se guarda
+el perfil de la etapa más costosa
+"""
+
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+METRIC_PREFIX = 'plagio'
+
+class PipelineMetrics:
+    """
+    Clase PipelineMetrics - Registro de métricas por etapa del detector
+    """
+
+    def __init__(self, enabled=True, trace_memory=False, profile_path=None):
+        """
+        Constructor del registro de métricas
+
+        Args:
+            enabled (bool): Si es False las etapas no registran nada (sin costo adicional)
+            trace_memory (bool): Medir la memoria asignada por etapa con tracemalloc
+            profile_path (str): Si se indica, se perfila cada etapa con cProfile y se
+                guarda en este archivo el perfil de la etapa con mayor tiempo real
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.profile_path = profile_path
+        self.labels = {}
+        self.stages = []
+        self._profiles = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Mide el bloque de código de una etapa
+
+        Args:
+            name (str): Nombre de la etapa
+
+        Yields:
+            dict: Contadores de la etapa; el bloque puede agregar valores
+        """
+        counters = {}
+        if not self.enabled:
+            yield counters
+            return
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+
+        profiler = cProfile.Profile() if self.profile_path else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield counters
+        finally:
+            if profiler:
+                profiler.disable()
+                self._profiles[name] = profiler
+
+            record = {
+                'stage': name,
+                'wall_seconds': time.perf_counter() - wall_start,
+                'cpu_seconds': time.process_time() - cpu_start
+            }
+            if self.trace_memory:
+                memory_current, memory_peak = tracemalloc.get_traced_memory()
+                record['memory_allocated_bytes'] = memory_current - memory_start
+                record['memory_peak_bytes'] = memory_peak - memory_start
+            record.update(counters)
+            self.stages.append(record)
+
+    def record(self, name, **counters):
+        """
+        Agrega contadores a una etapa ya registrada (o crea una etapa sin tiempos)
+
+        Args:
+            name (str): Nombre de la etapa
+            **counters: Valores a registrar
+        """
+        if not self.enabled:
+            return
+
+        for record in self.stages:
+            if record['stage'] == name:
+                record.update(counters)
+                return
+        self.stages.append(dict(stage=name, **counters))
+
+    def hottest_stage(self):
+        """
+        Obtiene la etapa con mayor tiempo real
+
+        Returns:
+            str: Nombre de la etapa o None si no hay etapas medidas
+        """
+        timed = [record for record in self.stages if 'wall_seconds' in record]
+        if not timed:
+            return None
+        return max(timed, key=lambda record: record['wall_seconds'])['stage']
+
+    def write_profile(self):
+        """
+        Guarda el perfil cProfile de la etapa más costosa en profile_path
+
+        Returns:
+            str: Etapa perfilada o None si no se perfiló ninguna
+        """
+        stage = self.hottest_stage()
+        if not self.profile_path or stage not in self._profiles:
+            return None
+
+        self._profiles[stage].dump_stats(self.profile_path)
+        return stage
+
+    def to_json_lines(self):
+        """
+        Convierte las métricas a líneas JSON (una por etapa)
+
+        Returns:
+            str: Texto con un objeto JSON por línea
+        """
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        return ''.join(
+            json.dumps(dict(timestamp=timestamp, **self.labels, **record), ensure_ascii=False) + '\n'
+            for record in self.stages
+        )
+
+    def to_prometheus(self, prefix=METRIC_PREFIX):
+        """
+        Convierte las métricas al formato de texto de Prometheus
+
+        Args:
+            prefix (str): Prefijo de los nombres de métrica
+
+        Returns:
+            str: Métricas en formato de exposición de Prometheus
+        """
+        series = {}
+        for record in self.stages:
+            labels = dict(self.labels, stage=record['stage'])
+            label_text = ','.join(f'{key}="{value}"' for key, value in labels.items())
+            for key, value in record.items():
+                # Solo los valores numéricos son métricas
+                if key == 'stage' or isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                series.setdefault(f"{prefix}_{key}", []).append(f"{prefix}_{key}{{{label_text}}} {value}")
+
+        lines = []
+        for name, samples in series.items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def export(self, path, fmt='jsonl'):
+        """
+        Guarda las métricas en un archivo
+
+        Args:
+            path (str): Ruta del archivo; con 'jsonl' se agregan líneas al final
+            fmt (str): 'jsonl' o 'prometheus'
+        """
+        if fmt == 'prometheus':
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.to_json_lines())
+
+    def summary(self):
+        """
+        Genera un resumen legible de los tiempos por etapa
+
+        Returns:
+            str: Una línea por etapa
+        """
+        lines = []
+        for record in self.stages:
+            if 'wall_seconds' not in record:
+                continue
+            line = f"  - {record['stage']}: {record['wall_seconds']:.3f} s (CPU {record['cpu_seconds']:.3f} s)"
+            if 'memory_peak_bytes' in record:
+                line += f", memoria máxima {record['memory_peak_bytes'] / (1024 * 1024):.1f} MB"
+            lines.append(line)
+        return '\n'.join(lines)
+
+def ngram_counts(documents_ngrams):
+    """
+    Calcula los contadores de n-gramas por documento
+
+    Args:
+        documents_ngrams (dict): Diccionario con nombres de documentos y n-gramas
+
+    Returns:
+        dict: Documentos, total de n-gramas y mínimo, promedio y máximo por documento
+    """
+    sizes = [len(ngrams) for ngrams in documents_ngrams.values()]
+    if not sizes:
+        return {'documents': 0, 'ngrams': 0}
+
+    return {
+        'documents': len(sizes),
+        'ngrams': sum(sizes),
+        'ngrams_per_doc_min': min(sizes),
+        'ngrams_per_doc_mean': sum(sizes) / len(sizes),
+        'ngrams_per_doc_max': max(sizes)
+    }
+
+def count_items(items, counters, key='pairs_evaluated'):
+    """
+    Recorre un iterable contando sus elementos sin materializarlo
+
+    Args:
+        items (iterable): Elementos (por ejemplo, pares de similitud)
+        counters (dict): Contadores de la etapa donde se guarda el total
+        key (str): Nombre del contador
+
+    Yields:
+        any: Los mismos elementos de items
+    """
+    counters[key] = 0
+    for item in items:
+        counters[key] += 1
+        yield item
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    metrics = PipelineMetrics(trace_memory=True)
+    metrics.labels['run'] = 'ejemplo'
+
+    with metrics.stage('preprocess') as counters:
+        documents_ngrams = {f"doc{i}.txt": [f"ngrama {j}" for j in range(100 * i)] for i in range(1, 4)}
+        counters.update(ngram_counts(documents_ngrams))
+
+    with metrics.stage('similarity') as counters:
+        pairs = list(count_items(((a, b) for a in documents_ngrams for b in documents_ngrams if a < b), counters))
+
+    print(metrics.summary())
+    print(metrics.to_json_lines())
+    print(metrics.to_prometheus())
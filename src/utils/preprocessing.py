@@ -1,121 +1,479 @@
-# Funciones para preprocesamiento de texto
-"""
-Módulo de preprocesamiento de texto
-Limpia y tokeniza documentos para el detector de plagio
-"""
-
-import os
-import re
-import string
-
-def clean_text(text):
-    """
-    Limpia el texto eliminando signos de puntuación y convirtiendo a minúsculas
-    
-    Args:
-        text (str): Texto a limpiar
-        
-    Returns:
-        str: Texto limpio
-    """
-    # Convertir a minúsculas
-    cleaned_text = text.lower()
-    
-    # Eliminar signos de puntuación y caracteres especiales
-    cleaned_text = re.sub(r'[^\w\s]', '', cleaned_text)
-    
-    # Eliminar números
-    cleaned_text = re.sub(r'\d+', '', cleaned_text)
-    
-    # Eliminar espacios múltiples
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-    
-    return cleaned_text
-
-def generate_ngrams(text, n=3):
-    """
-    Divide el texto en n-gramas
-    
-    Args:
-        text (str): Texto limpio
-        n (int): Tamaño del n-grama (2 para bi-gramas, 3 para tri-gramas, etc.)
-        
-    Returns:
-        list: Lista de n-gramas
-    """
-    words = text.split(' ')
-    ngrams = []
-    
-    # Si hay menos palabras que el tamaño del n-grama, devolver una lista vacía
-    if len(words) < n:
-        return ngrams
-    
-    # Generar n-gramas
-    for i in range(len(words) - n + 1):
-        ngram = ' '.join(words[i:i+n])
-        ngrams.append(ngram)
-    
-    return ngrams
-
-def load_document(file_path):
-    """
-    Carga un documento desde un archivo
-    
-    Args:
-        file_path (str): Ruta del archivo
-        
-    Returns:
-        str: Contenido del archivo
-    """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    except Exception as e:
-        print(f"Error al cargar el documento {file_path}: {e}")
-        return ''
-
-def load_documents_from_directory(dir_path):
-    """
-    Carga todos los documentos de un directorio
-    
-    Args:
-        dir_path (str): Ruta del directorio
-        
-    Returns:
-        dict: Diccionario con nombres de archivos como claves y contenido como valores
-    """
-    documents = {}
-    
-    try:
-        files = os.listdir(dir_path)
-        
-        for file in files:
-            if file.endswith('.txt'):
-                file_path = os.path.join(dir_path, file)
-                documents[file] = load_document(file_path)
-        
-        return documents
-    except Exception as e:
-        print(f"Error al cargar documentos del directorio: {e}")
-        return {}
-
-def preprocess_document(text, n=3):
-    """
-    Preprocesa un documento: lo limpia y genera n-gramas
-    
-    Args:
-        text (str): Texto del documento
-        n (int): Tamaño del n-grama
-        
-    Returns:
-        list: Lista de n-gramas
-    """
-    cleaned_text = clean_text(text)
-    return generate_ngrams(cleaned_text, n)
-
-# Ejemplo de uso
-if __name__ == "__main__":
-    text = "Este es un ejemplo de texto. Contiene varias palabras y signos de puntuación."
-    print("Texto original:", text)
-    print("Texto limpio:", clean_text(text))
-    print("Tri-gramas:", generate_ngrams(clean_text(text), 3))
\ No newline at end of file
+# Funciones para preprocesamiento de texto
+"""
+Módulo de preprocesamiento de texto
+Limpia y tokeniza documentos para el detector de plagio
+"""
+
+import mmap
+import os
+import re
+import string
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from src.hash.fingerprint import hash64, MASK_64
+from src.utils.tokenizer import iter_token_chunks
+
+# Base del hash rodante polinomial de n-gramas (impar, módulo 2^64)
+ROLLING_BASE = 0x100000001B3
+
+# Tamaño a partir del cual los archivos se leen con mmap (bytes)
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+def clean_text(text):
+    """
+    Limpia el texto eliminando signos de puntuación y convirtiendo a minúsculas
+    
+    Args:
+        text (str): Texto a limpiar
+        
+    Returns:
+        str: Texto limpio
+    """
+    # Convertir a minúsculas
+    cleaned_text = text.lower()
+    
+    # Eliminar signos de puntuación y caracteres especiales
+    cleaned_text = re.sub(r'[^\w\s]', '', cleaned_text)
+    
+    # Eliminar números
+    cleaned_text = re.sub(r'\d+', '', cleaned_text)
+    
+    # Eliminar espacios múltiples
+    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+    
+    return cleaned_text
+
+def generate_ngrams(text, n=3):
+    """
+    Divide el texto en n-gramas
+    
+    Args:
+        text (str): Texto limpio
+        n (int): Tamaño del n-grama (2 para bi-gramas, 3 para tri-gramas, etc.)
+        
+    Returns:
+        list: Lista de n-gramas
+    """
+    words = text.split(' ')
+    ngrams = []
+    
+    # Si hay menos palabras que el tamaño del n-grama, devolver una lista vacía
+    if len(words) < n:
+        return ngrams
+    
+    # Generar n-gramas
+    for i in range(len(words) - n + 1):
+        ngram = ' '.join(words[i:i+n])
+        ngrams.append(ngram)
+    
+    return ngrams
+
+@lru_cache(maxsize=1 << 16)
+def word_id(word):
+    """
+    Asigna a una palabra un identificador entero estable de 64 bits
+
+    Args:
+        word (str): Palabra
+
+    Returns:
+        int: Identificador de la palabra
+    """
+    return hash64(word)
+
+def generate_ngram_ids(text, n=3):
+    """
+    Divide el texto en n-gramas codificados como enteros de 64 bits
+    Cada palabra se convierte en un identificador entero y los n-gramas se
+    obtienen con un hash rodante, sin construir cadenas intermedias
+
+    Args:
+        text (str): Texto limpio
+        n (int): Tamaño del n-grama
+
+    Returns:
+        array: Identificadores de los n-gramas (enteros sin signo de 64 bits),
+               en el mismo orden que generate_ngrams
+    """
+    ngram_ids = array('Q')
+    _append_rolling_ids([word_id(word) for word in text.split(' ')], n, ngram_ids)
+    return ngram_ids
+
+def _append_rolling_ids(ids, n, ngram_ids):
+    """
+    Agrega los hashes rodantes de los n-gramas de una secuencia de identificadores
+
+    Args:
+        ids (list): Identificadores de palabras
+        n (int): Tamaño del n-grama
+        ngram_ids (array): Arreglo donde se agregan los identificadores de los n-gramas
+    """
+    # Si hay menos palabras que el tamaño del n-grama no hay n-gramas
+    if len(ids) < n:
+        return
+
+    # Peso de la palabra que sale de la ventana: base^(n-1)
+    leading_weight = pow(ROLLING_BASE, n - 1, 1 << 64)
+
+    rolling = 0
+    for i in range(n):
+        rolling = (rolling * ROLLING_BASE + ids[i]) & MASK_64
+    ngram_ids.append(rolling)
+
+    for i in range(n, len(ids)):
+        rolling = ((rolling - ids[i - n] * leading_weight) * ROLLING_BASE + ids[i]) & MASK_64
+        ngram_ids.append(rolling)
+
+def ngrams_from_tokens(token_chunks, n=3):
+    """
+    Construye los n-gramas a partir de las palabras que entrega el tokenizador
+
+    Args:
+        token_chunks (iterable): Listas de palabras consecutivas (ver iter_token_chunks)
+        n (int): Tamaño del n-grama
+
+    Returns:
+        list: Lista de n-gramas, igual a generate_ngrams(clean_text(texto), n)
+    """
+    ngrams = []
+    carry = []
+    empty = True
+
+    for words in token_chunks:
+        empty = False
+        # Las últimas n - 1 palabras del fragmento anterior inician los n-gramas que cruzan el borde
+        words = carry + words
+        ngrams.extend(map(' '.join, zip(*(words[i:] for i in range(n)))))
+        carry = words[max(0, len(words) - n + 1):] if n > 1 else []
+
+    # Texto sin palabras: clean_text devuelve '' y se comporta como una palabra vacía
+    if empty:
+        return generate_ngrams('', n)
+    return ngrams
+
+def ngram_ids_from_tokens(token_chunks, n=3):
+    """
+    Construye los identificadores de n-gramas a partir de las palabras del tokenizador
+
+    Args:
+        token_chunks (iterable): Listas de palabras consecutivas (ver iter_token_chunks)
+        n (int): Tamaño del n-grama
+
+    Returns:
+        array: Identificadores de los n-gramas, igual a generate_ngram_ids(clean_text(texto), n)
+    """
+    ngram_ids = array('Q')
+    carry = []
+    empty = True
+
+    for words in token_chunks:
+        empty = False
+        ids = carry + list(map(word_id, words))
+        _append_rolling_ids(ids, n, ngram_ids)
+        # Se reinicia el hash con las últimas n - 1 palabras; los n-gramas ya emitidos no se repiten
+        carry = ids[max(0, len(ids) - n + 1):] if n > 1 else []
+
+    if empty:
+        return generate_ngram_ids('', n)
+    return ngram_ids
+
+def winnow(hashes, window=4):
+    """
+    Selecciona huellas con el algoritmo de winnowing (MOSS)
+    
+    Se recorre una ventana de `window` hashes consecutivos y en cada posición se
+    conserva el mínimo (el de más a la derecha ante empates), registrándolo solo
+    cuando cambia. Cualquier pasaje compartido de al menos window + k - 1 palabras
+    (k = tamaño del n-grama) produce al menos una huella común, y se guarda
+    aproximadamente 2 / (window + 1) de los hashes
+    
+    Args:
+        hashes (array | list): Hashes de los k-gramas en orden
+        window (int): Tamaño de la ventana
+        
+    Returns:
+        array: Huellas seleccionadas (enteros sin signo de 64 bits)
+    """
+    fingerprints = array('Q')
+    if window <= 1:
+        fingerprints.extend(hashes)
+        return fingerprints
+    
+    if not hashes:
+        return fingerprints
+    
+    # Documento más corto que la ventana: una sola ventana con todos los hashes
+    if len(hashes) < window:
+        minimum = min(hashes)
+        fingerprints.append(minimum)
+        return fingerprints
+    
+    # Cola monótona de posiciones: el frente es el mínimo de la ventana actual
+    candidates = deque()
+    last_selected = -1
+    
+    for i, value in enumerate(hashes):
+        # Con >= se descartan los empates anteriores y se conserva el de más a la derecha
+        while candidates and hashes[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(i)
+        
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        
+        if i >= window - 1 and candidates[0] != last_selected:
+            last_selected = candidates[0]
+            fingerprints.append(hashes[last_selected])
+    
+    return fingerprints
+
+def load_document(file_path):
+    """
+    Carga un documento desde un archivo
+    
+    Args:
+        file_path (str): Ruta del archivo
+        
+    Returns:
+        str: Contenido del archivo
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.read()
+    except Exception as e:
+        print(f"Error al cargar el documento {file_path}: {e}")
+        return ''
+
+def load_documents_from_directory(dir_path):
+    """
+    Carga todos los documentos de un directorio
+    
+    Args:
+        dir_path (str): Ruta del directorio
+        
+    Returns:
+        dict: Diccionario con nombres de archivos como claves y contenido como valores
+    """
+    documents = {}
+    
+    try:
+        files = os.listdir(dir_path)
+        
+        for file in files:
+            if file.endswith('.txt'):
+                file_path = os.path.join(dir_path, file)
+                documents[file] = load_document(file_path)
+        
+        return documents
+    except Exception as e:
+        print(f"Error al cargar documentos del directorio: {e}")
+        return {}
+
+def list_document_paths(dir_path, recursive=True):
+    """
+    Obtiene los documentos .txt de un directorio en orden determinista
+    
+    Args:
+        dir_path (str): Ruta del directorio
+        recursive (bool): Si es True también se recorren los subdirectorios
+        
+    Returns:
+        list: Lista de tuplas (nombre, ruta); el nombre es la ruta relativa al directorio
+    """
+    paths = []
+    
+    if not recursive:
+        for file in sorted(os.listdir(dir_path)):
+            file_path = os.path.join(dir_path, file)
+            if file.endswith('.txt') and os.path.isfile(file_path):
+                paths.append((file, file_path))
+        return paths
+    
+    for root, directories, files in os.walk(dir_path):
+        directories.sort()
+        for file in sorted(files):
+            if file.endswith('.txt'):
+                file_path = os.path.join(root, file)
+                name = os.path.relpath(file_path, dir_path).replace(os.sep, '/')
+                paths.append((name, file_path))
+    
+    return paths
+
+def read_document(file_path, mmap_threshold=MMAP_THRESHOLD):
+    """
+    Lee un documento; los archivos grandes se leen mediante mmap
+    
+    Args:
+        file_path (str): Ruta del archivo
+        mmap_threshold (int): Tamaño en bytes a partir del cual se usa mmap
+        
+    Returns:
+        str: Contenido del archivo
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return ''
+            if size < mmap_threshold:
+                return file.read().decode('utf-8')
+            
+            # Se decodifica directamente desde el mapa, sin un búfer intermedio de lectura
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, 'utf-8')
+    except Exception as e:
+        print(f"Error al cargar el documento {file_path}: {e}")
+        return ''
+
+def iter_documents_from_directory(dir_path, recursive=True, mmap_threshold=MMAP_THRESHOLD):
+    """
+    Recorre los documentos de un directorio uno por uno
+    Solo el documento actual está en memoria en cada momento
+    
+    Args:
+        dir_path (str): Ruta del directorio
+        recursive (bool): Si es True también se recorren los subdirectorios
+        mmap_threshold (int): Tamaño en bytes a partir del cual se usa mmap
+        
+    Yields:
+        tuple: (nombre, texto) de cada documento
+    """
+    try:
+        paths = list_document_paths(dir_path, recursive)
+    except Exception as e:
+        print(f"Error al cargar documentos del directorio: {e}")
+        return
+    
+    for name, file_path in paths:
+        yield name, read_document(file_path, mmap_threshold)
+
+def preprocess_document(text, n=3, encoding='text', window=None, normalize=False):
+    """
+    Preprocesa un documento: lo limpia y genera n-gramas
+    El texto se tokeniza en una sola pasada (src/utils/tokenizer.py); el
+    resultado es el mismo que generate_ngrams(clean_text(text), n)
+    
+    Args:
+        text (str): Texto del documento
+        n (int): Tamaño del n-grama
+        encoding (str): 'text' para n-gramas como cadenas, 'ids' para enteros de 64 bits
+        window (int): Si se indica, solo se conservan las huellas elegidas por
+            winnowing con esa ventana (siempre como enteros de 64 bits)
+        normalize (bool): Si es True además se quitan los acentos (NFKD)
+        
+    Returns:
+        list | array: Lista de n-gramas o arreglo de identificadores
+    """
+    token_chunks = iter_token_chunks(text, normalize)
+    if window:
+        return winnow(ngram_ids_from_tokens(token_chunks, n), window)
+    if encoding == 'ids':
+        return ngram_ids_from_tokens(token_chunks, n)
+    return ngrams_from_tokens(token_chunks, n)
+
+def _preprocess_batch(batch, n, encoding='text', window=None):
+    """
+    Preprocesa un lote de documentos dentro de un proceso trabajador
+
+    Args:
+        batch (list): Lista de tuplas (nombre, texto)
+        n (int): Tamaño del n-grama
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+
+    Returns:
+        list: Lista de tuplas (nombre, n-gramas)
+    """
+    return [(doc_name, preprocess_document(text, n, encoding, window)) for doc_name, text in batch]
+
+def preprocess_documents(documents, n=3, workers=1, batch_size=None, encoding='text', window=None):
+    """
+    Preprocesa varios documentos, opcionalmente en paralelo con un pool de procesos
+    Los documentos se envían en lotes para reducir el costo de comunicación
+    entre procesos y el resultado conserva el orden de entrada
+
+    Args:
+        documents (dict): Diccionario con nombres de documentos y su contenido
+        n (int): Tamaño del n-grama
+        workers (int): Número de procesos (1 procesa en el proceso actual)
+        batch_size (int): Documentos por lote; si es None se reparte en ~4 lotes por proceso
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+
+    Returns:
+        dict: Diccionario con nombres de documentos y listas de n-gramas, en el mismo orden
+    """
+    items = list(documents.items())
+
+    if workers is None or workers <= 1 or len(items) < 2:
+        return {doc_name: preprocess_document(text, n, encoding, window) for doc_name, text in items}
+
+    if batch_size is None:
+        batch_size = max(1, len(items) // (workers * 4))
+
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    documents_ngrams = {}
+
+    # map() devuelve los lotes en el mismo orden en que se enviaron
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(_preprocess_batch, batches, [n] * len(batches),
+                                    [encoding] * len(batches), [window] * len(batches)):
+            for doc_name, ngrams in results:
+                documents_ngrams[doc_name] = ngrams
+
+    return documents_ngrams
+
+def preprocess_stream(documents, n=3, workers=1, batch_size=16, encoding='text', window=None):
+    """
+    Preprocesa documentos a medida que llegan, sin conservar su texto
+    Con varios procesos se mantiene un número acotado de lotes en curso, de
+    modo que la memoria no crece con el tamaño del corpus
+    
+    Args:
+        documents (iterable): Tuplas (nombre, texto), por ejemplo de iter_documents_from_directory
+        n (int): Tamaño del n-grama
+        workers (int): Número de procesos (1 procesa en el proceso actual)
+        batch_size (int): Documentos por lote enviado a cada proceso
+        encoding (str): Codificación de los n-gramas ('text' o 'ids')
+        window (int): Ventana de winnowing (None para conservar todos los n-gramas)
+        
+    Yields:
+        tuple: (nombre, n-gramas) en el mismo orden de entrada
+    """
+    if workers is None or workers <= 1:
+        for doc_name, text in documents:
+            yield doc_name, preprocess_document(text, n, encoding, window)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        batch = []
+        
+        for item in documents:
+            batch.append(item)
+            if len(batch) < batch_size:
+                continue
+            
+            pending.append(executor.submit(_preprocess_batch, batch, n, encoding, window))
+            batch = []
+            
+            # Como máximo dos lotes en curso por proceso
+            while len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        
+        if batch:
+            pending.append(executor.submit(_preprocess_batch, batch, n, encoding, window))
+        
+        while pending:
+            yield from pending.popleft().result()
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    text = "Este es un ejemplo de texto. Contiene varias palabras y signos de puntuación."
+    print("Texto original:", text)
+    print("Texto limpio:", clean_text(text))
+    print("Tri-gramas:", generate_ngrams(clean_text(text), 3))
+    print("Tri-gramas (enteros):", list(generate_ngram_ids(clean_text(text), 3)))
+    print("Huellas (winnowing, ventana 4):", list(winnow(generate_ngram_ids(clean_text(text), 3), 4)))
\ No newline at end of file
@@ -0,0 +1,232 @@
+# Tokenizador de una sola pasada
+"""
+Módulo para convertir un texto en palabras limpias sin pasadas intermedias
+Equivale a clean_text + split: convierte a minúsculas, elimina signos de
+puntuación y dígitos y separa por espacios. En lugar de tres expresiones
+regulares que copian el texto completo cada vez, el texto se convierte a
+minúsculas y se separa por espacios, y cada palabra distinta se limpia una
+sola vez con una tabla de str.translate precalculada; las siguientes
+apariciones se resuelven con una búsqueda en un diccionario. Las palabras
+se entregan de forma perezosa, por fragmentos del texto.
+
+En modo compatible (por defecto) las palabras son idénticas a las de
+clean_text. Con normalize=True además se quitan los acentos y se aplican
+las equivalencias de compatibilidad de Unicode (NFKD), por ejemplo
+'Educación' -> 'educacion'
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Los caracteres por debajo de este punto de código se resuelven con la tabla;
+# un texto con caracteres mayores usa la expresión regular equivalente
+TABLE_LIMIT = 0x3000
+
+# Tamaño aproximado de cada fragmento del texto (caracteres)
+CHUNK_SIZE = 1 << 16
+
+# Máximo de palabras distintas recordadas antes de vaciar la caché
+WORD_CACHE_SIZE = 1 << 18
+
+# Lo que elimina clean_text: signos de puntuación (ni palabra ni espacio) y dígitos
+DROP_PATTERN = re.compile(r'[^\w\s]|\d')
+SPACE_PATTERN = re.compile(r'\s')
+WORD_PATTERN = re.compile(r'\S+')
+
+def _keep(char):
+    """
+    Indica si clean_text conserva un carácter (palabra y no dígito, o espacio)
+
+    Args:
+        char (str): Carácter
+
+    Returns:
+        bool: True si el carácter se conserva
+    """
+    return DROP_PATTERN.match(char) is None
+
+@lru_cache(maxsize=2)
+def translation_table(normalize=False):
+    """
+    Construye la tabla de str.translate para los caracteres menores que TABLE_LIMIT
+
+    Args:
+        normalize (bool): Si es True cada carácter se reemplaza por su forma NFKD sin acentos
+
+    Returns:
+        dict: Punto de código -> None (eliminar) o cadena de reemplazo
+    """
+    table = {}
+
+    for code in range(TABLE_LIMIT):
+        char = chr(code)
+        if normalize:
+            replacement = ''.join(part for part in unicodedata.normalize('NFKD', char) if _keep(part))
+            if replacement != char:
+                table[code] = replacement or None
+        elif not _keep(char):
+            table[code] = None
+
+    return table
+
+def clean_chunk(text, normalize=False):
+    """
+    Limpia un fragmento de texto ya convertido a minúsculas
+
+    Args:
+        text (str): Fragmento en minúsculas
+        normalize (bool): Quitar acentos y aplicar NFKD
+
+    Returns:
+        str: Fragmento sin puntuación ni dígitos (los espacios se conservan)
+    """
+    if not text or max(text) < chr(TABLE_LIMIT):
+        return text.translate(translation_table(normalize))
+
+    # Caracteres fuera de la tabla: se usa la expresión regular equivalente
+    # (las marcas diacríticas que deja NFKD no son caracteres de palabra y también se eliminan)
+    if normalize:
+        text = unicodedata.normalize('NFKD', text)
+    return DROP_PATTERN.sub('', text)
+
+class _WordCache(dict):
+    """
+    Clase _WordCache - Diccionario palabra en minúsculas -> palabra limpia
+    Las palabras que faltan se limpian al consultarlas (__missing__), así que
+    map(cache.__getitem__, palabras) recorre las palabras sin código Python
+    salvo para las palabras nuevas
+    """
+
+    def __init__(self, normalize):
+        """
+        Constructor de la caché
+
+        Args:
+            normalize (bool): Quitar acentos y aplicar NFKD
+        """
+        super().__init__()
+        self.normalize = normalize
+
+    def __missing__(self, word):
+        if len(self) >= WORD_CACHE_SIZE:
+            self.clear()
+        cleaned = self[word] = clean_chunk(word, self.normalize)
+        return cleaned
+
+_word_caches = {False: _WordCache(False), True: _WordCache(True)}
+
+def iter_chunks(text, chunk_size=CHUNK_SIZE):
+    """
+    Divide un texto en fragmentos que terminan en un espacio (sin cortar palabras)
+
+    Args:
+        text (str): Texto completo
+        chunk_size (int): Tamaño aproximado de cada fragmento
+
+    Yields:
+        str: Fragmentos consecutivos del texto
+    """
+    start = 0
+    length = len(text)
+
+    while start < length:
+        end = start + chunk_size
+        if end >= length:
+            yield text[start:]
+            return
+
+        # Extender el fragmento hasta el siguiente espacio
+        match = SPACE_PATTERN.search(text, end)
+        end = match.end() if match else length
+        yield text[start:end]
+        start = end
+
+def iter_token_chunks(text, normalize=False, chunk_size=CHUNK_SIZE):
+    """
+    Genera las palabras limpias de un texto agrupadas por fragmento
+
+    Args:
+        text (str): Texto original
+        normalize (bool): Quitar acentos y aplicar NFKD (False = idéntico a clean_text)
+        chunk_size (int): Tamaño aproximado de cada fragmento procesado
+
+    Yields:
+        list: Palabras limpias de cada fragmento (sin palabras vacías)
+    """
+    lookup = _word_caches[bool(normalize)].__getitem__
+
+    for chunk in iter_chunks(text, chunk_size):
+        # Los fragmentos terminan en un espacio, así lower() ve el mismo contexto (sigma final).
+        # Eliminar caracteres dentro de cada palabra equivale a eliminarlos del texto completo
+        words = list(filter(None, map(lookup, chunk.lower().split())))
+        if words:
+            yield words
+
+def iter_tokens(text, normalize=False, chunk_size=CHUNK_SIZE):
+    """
+    Genera las palabras limpias de un texto de forma perezosa
+
+    Args:
+        text (str): Texto original
+        normalize (bool): Quitar acentos y aplicar NFKD (False = idéntico a clean_text)
+        chunk_size (int): Tamaño aproximado de cada fragmento procesado
+
+    Yields:
+        str: Palabras en minúsculas, sin puntuación ni dígitos
+    """
+    for words in iter_token_chunks(text, normalize, chunk_size):
+        yield from words
+
+def iter_token_spans(text, normalize=False):
+    """
+    Genera las palabras limpias de un texto junto con su posición en el texto original
+
+    Args:
+        text (str): Texto original
+        normalize (bool): Quitar acentos y aplicar NFKD
+
+    Yields:
+        tuple: (palabra, inicio, fin) con los desplazamientos en caracteres del
+               texto original; las palabras son las mismas que las de tokenize
+    """
+    lookup = _word_caches[bool(normalize)].__getitem__
+
+    for match in WORD_PATTERN.finditer(text):
+        word = lookup(match.group().lower())
+        if word:
+            yield word, match.start(), match.end()
+
+def tokenize(text, normalize=False):
+    """
+    Obtiene todas las palabras limpias de un texto
+
+    Args:
+        text (str): Texto original
+        normalize (bool): Quitar acentos y aplicar NFKD
+
+    Returns:
+        list: Palabras; en modo compatible es igual a clean_text(text).split()
+    """
+    tokens = []
+    for words in iter_token_chunks(text, normalize):
+        tokens.extend(words)
+    return tokens
+
+# Ejemplo de uso
+if __name__ == "__main__":
+    import time
+    from src.utils.preprocessing import clean_text
+
+    sample = "¡La Educación, en el año 2024, está cambiando! Ésta es una prueba... ÑANDÚ"
+    print("Palabras:", tokenize(sample))
+    print("Normalizadas:", tokenize(sample, normalize=True))
+    print("Igual a clean_text:", tokenize(sample) == clean_text(sample).split())
+
+    essay = sample * 50000
+    megabytes = len(essay.encode('utf-8')) / (1024 * 1024)
+    for name, function in (("clean_text + split", lambda text: clean_text(text).split()), ("tokenize", tokenize)):
+        start_time = time.perf_counter()
+        function(essay)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name}: {megabytes / elapsed:.1f} MB/s")
@@ -1 +1 @@
-# Paquete de visualización
+# Paquete de visualización
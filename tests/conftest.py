@@ -0,0 +1,46 @@
+# Datos compartidos por las pruebas
+"""
+Documentos de prueba pequeños con fragmentos copiados entre sí, para que
+haya pares con similitud alta, baja y nula
+"""
+
+import random
+import pytest
+
+WORDS = ("la educacion es un derecho humano fundamental todos los estudiantes deben tener acceso "
+         "a ella segun el informe muchos paises invierten poco en escuelas publicas y rurales").split()
+
+def make_documents(count=12, seed=7):
+    """
+    Genera textos aleatorios reproducibles; cada tercer documento copia parte del anterior
+
+    Args:
+        count (int): Número de documentos
+        seed (int): Semilla
+
+    Returns:
+        dict: Nombre del documento -> texto
+    """
+    generator = random.Random(seed)
+    documents = {}
+    previous = []
+    for number in range(count):
+        words = [generator.choice(WORDS) for _ in range(generator.randint(20, 60))]
+        if number % 3 == 2:
+            words = previous[:30] + words
+        documents[f'doc_{number:02d}.txt'] = ' '.join(words)
+        previous = words
+    documents['vacio.txt'] = ''
+    return documents
+
+@pytest.fixture
+def documents():
+    return make_documents()
+
+@pytest.fixture
+def documents_dir(tmp_path, documents):
+    directory = tmp_path / 'documentos'
+    directory.mkdir()
+    for name, text in documents.items():
+        (directory / name).write_text(text, encoding='utf-8')
+    return directory
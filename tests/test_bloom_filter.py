@@ -0,0 +1,40 @@
+# Pruebas de las operaciones en lote del filtro de Bloom
+"""
+add_many y contains_many (con NumPy y con el recorrido de respaldo) marcan y
+consultan exactamente los mismos bits que add y contains
+"""
+
+import random
+import pytest
+from src.hash import bloom_filter
+from src.hash.bloom_filter import BloomFilter
+
+ITEMS = [f"n-grama {number} de prueba" for number in range(300)] + list(range(0, 2 ** 64, 2 ** 57))
+
+@pytest.fixture(params=['numpy', 'python'])
+def batch_mode(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(bloom_filter, 'np', None)
+    return request.param
+
+@pytest.mark.parametrize('size, hash_count', [(97, 1), (1000, 3), (12345, 7)])
+def test_batch_operations_match_single_operations(batch_mode, size, hash_count):
+    inserted = random.Random(size).sample(ITEMS, len(ITEMS) // 2)
+
+    single = BloomFilter(size, hash_count)
+    for item in inserted:
+        single.add(item)
+    batch = BloomFilter(size, hash_count)
+    batch.add_many(inserted)
+
+    assert batch.bit_array == single.bit_array
+    assert batch.contains_many(ITEMS) == [single.contains(item) for item in ITEMS]
+    assert all(batch.contains_many(inserted))
+
+def test_empty_batches(batch_mode):
+    bloom = BloomFilter(1000, 3)
+    bloom.add_many([])
+    assert bloom.contains_many([]) == []
+    assert bloom.fill_ratio() == 0
@@ -0,0 +1,63 @@
+# Pruebas de la caché persistente de huellas
+"""
+La caché devuelve los mismos n-gramas que el preprocesamiento, se invalida
+al cambiar un archivo o los parámetros y se reconstruye si está dañada
+"""
+
+import pytest
+from src.utils.cache import load_fingerprints
+from src.utils.preprocessing import preprocess_document
+
+@pytest.mark.parametrize('encoding, window', [('text', None), ('ids', None), ('ids', 4)])
+def test_round_trip(documents_dir, documents, tmp_path, encoding, window):
+    cache_path = str(tmp_path / 'cache.bin')
+    expected = {name: list(preprocess_document(text, 3, encoding, window)) for name, text in sorted(documents.items())}
+
+    cold, cold_stats = load_fingerprints(str(documents_dir), 3, cache_path, encoding, window=window)
+    warm, warm_stats = load_fingerprints(str(documents_dir), 3, cache_path, encoding, window=window)
+
+    assert cold_stats['misses'] == len(documents) and cold_stats['hits'] == 0
+    assert warm_stats['hits'] == len(documents) and warm_stats['misses'] == 0
+    for result in (cold, warm):
+        assert sorted(result) == sorted(expected)
+        assert {name: list(ngrams) for name, ngrams in result.items()} == expected
+
+def test_streaming_with_workers_keeps_order(documents_dir, tmp_path):
+    cache_path = str(tmp_path / 'cache.bin')
+    serial, _ = load_fingerprints(str(documents_dir), 3, str(tmp_path / 'serial.bin'))
+    parallel, stats = load_fingerprints(str(documents_dir), 3, cache_path, workers=2)
+    assert list(parallel) == list(serial) and parallel == serial
+    assert stats['misses'] == len(serial)
+
+def test_invalidation(documents_dir, tmp_path):
+    cache_path = str(tmp_path / 'cache.bin')
+    load_fingerprints(str(documents_dir), 3, cache_path)
+
+    (documents_dir / 'doc_00.txt').write_text("un texto completamente nuevo para este documento", encoding='utf-8')
+    (documents_dir / 'doc_01.txt').unlink()
+    result, stats = load_fingerprints(str(documents_dir), 3, cache_path)
+    assert stats['misses'] == 1 and stats['removed'] == 1
+    assert list(result['doc_00.txt']) == list(preprocess_document("un texto completamente nuevo para este documento", 3))
+
+    # Otro tamaño de n-grama no reutiliza las entradas guardadas
+    _, stats = load_fingerprints(str(documents_dir), 2, cache_path)
+    assert stats['hits'] == 0
+
+@pytest.mark.parametrize('damage', ['truncated_header', 'truncated_payload', 'bad_magic'])
+def test_corrupt_cache_is_rebuilt(documents_dir, documents, tmp_path, damage, capsys):
+    cache_path = tmp_path / 'cache.bin'
+    expected, _ = load_fingerprints(str(documents_dir), 3, str(cache_path))
+    data = cache_path.read_bytes()
+    damaged = {
+        'truncated_header': data[:12],
+        'truncated_payload': data[:-3],
+        'bad_magic': b'XXXXXXXX' + data[8:]
+    }[damage]
+    cache_path.write_bytes(damaged)
+
+    result, stats = load_fingerprints(str(documents_dir), 3, str(cache_path))
+    assert result == expected and stats['misses'] == len(documents)
+    assert 'Caché' in capsys.readouterr().out
+
+    _, stats = load_fingerprints(str(documents_dir), 3, str(cache_path))
+    assert stats['hits'] == len(documents)
@@ -0,0 +1,57 @@
+# Pruebas del conteo de pares con memoria acotada
+"""
+Pruebas de count_shared_ngrams: el diccionario de conteos nunca supera la
+capacidad que permite el presupuesto de memoria, aunque una sola lista de
+publicación genere muchos más pares, y el resultado mezclado es exacto
+"""
+
+import os
+import tempfile
+import unittest
+from itertools import combinations
+from src.index.external import PAIR_ENTRY_BYTES, count_shared_ngrams
+from src.index.sharded import _merge_records, _read_records
+
+class CountSharedNgramsTest(unittest.TestCase):
+    """
+    Clase CountSharedNgramsTest - Capacidad y exactitud de count_shared_ngrams
+    """
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix='plagio_test_')
+        # Una lista de 40 documentos genera 780 pares, muy por encima de la capacidad
+        self.posting_lists = [list(range(40)), [0, 1, 2], list(range(5, 25, 2)), [3, 39]]
+
+    def tearDown(self):
+        for file_name in os.listdir(self.work_dir):
+            os.remove(os.path.join(self.work_dir, file_name))
+        os.rmdir(self.work_dir)
+
+    def expected_counts(self):
+        counts = {}
+        for posting_list in self.posting_lists:
+            for a, b in combinations(posting_list, 2):
+                counts[a << 32 | b] = counts.get(a << 32 | b, 0) + 1
+        return counts
+
+    def test_runs_never_exceed_capacity(self):
+        capacity = 50
+        run_paths = count_shared_ngrams(self.posting_lists, self.work_dir, capacity * PAIR_ENTRY_BYTES)
+
+        # Cada run es el contenido completo del diccionario al volcarlo y el
+        # diccionario solo se vacía al volcarlo, así que su tamaño máximo es el del mayor run
+        self.assertGreater(len(run_paths), 1)
+        for path in run_paths:
+            records = os.path.getsize(path) // 16
+            self.assertLessEqual(records, capacity)
+
+    def test_merged_counts_are_exact(self):
+        for capacity in (1, 7, 50, 10000):
+            run_paths = count_shared_ngrams(self.posting_lists, self.work_dir, capacity * PAIR_ENTRY_BYTES)
+            merged = dict(_merge_records([_read_records(path) for path in run_paths], sum_counts=True))
+            self.assertEqual(merged, self.expected_counts())
+            for path in run_paths:
+                os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# Pruebas del cálculo de similitudes en paralelo
+"""
+El camino paralelo (núcleo por bloques con NumPy y recorrido de respaldo)
+produce los mismos pares y similitudes que el cálculo serial de jaccard.py
+"""
+
+import os
+import random
+from array import array
+import pytest
+from src.similarity import jaccard, parallel
+from src.similarity.profile import block_intersection_counts
+from src.utils.preprocessing import preprocess_document
+
+@pytest.fixture
+def documents_ngrams(documents):
+    return {name: preprocess_document(text, 3) for name, text in documents.items()}
+
+def assert_same_pairs(result, expected):
+    assert [(pair['doc_a'], pair['doc_b']) for pair in result] == [(pair['doc_a'], pair['doc_b']) for pair in expected]
+    assert [pair['similarity'] for pair in result] == pytest.approx([pair['similarity'] for pair in expected])
+
+@pytest.mark.parametrize('workers, blocks_per_worker', [(1, 1), (2, 4), (3, 50)])
+def test_parallel_matches_serial(documents_ngrams, workers, blocks_per_worker):
+    expected = jaccard.calculate_similarity_matrix(documents_ngrams)
+    result = parallel.calculate_similarity_matrix(documents_ngrams, workers, blocks_per_worker)
+    assert_same_pairs(result, expected)
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_similarity_blocks_match_serial(documents_ngrams, tmp_path, monkeypatch, use_numpy):
+    # Los bloques se calculan en este proceso para probar también el recorrido sin NumPy
+    if use_numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(parallel, 'np', None)
+    monkeypatch.setattr(parallel, '_worker_values', None, raising=False)
+    monkeypatch.setattr(parallel, '_worker_offsets', None, raising=False)
+
+    file_path = str(tmp_path / 'corpus.ngrams')
+    parallel._write_ngram_file(documents_ngrams, file_path)
+    parallel._open_worker_file(file_path)
+
+    similarities = []
+    for row_start, row_end in parallel.balanced_row_blocks(len(documents_ngrams), 5):
+        similarities.extend(parallel._similarity_block(row_start, row_end))
+
+    expected = jaccard.calculate_similarity_matrix(documents_ngrams)
+    assert similarities == pytest.approx([pair['similarity'] for pair in expected])
+
+def test_block_intersection_counts_brute_force():
+    np = pytest.importorskip('numpy')
+    generator = random.Random(3)
+    profiles = [sorted(set(generator.randrange(60) for _ in range(generator.randrange(0, 30)))) for _ in range(15)]
+    offsets = np.array([0] + [len(profile) for profile in profiles], dtype=np.int64).cumsum()
+    values = np.array(array('Q', [value for profile in profiles for value in profile]), dtype=np.uint64)
+
+    for row_start, row_end in [(0, 1), (0, 15), (4, 9), (13, 14)]:
+        # Tramos de columnas pequeños para recorrer varios pasos
+        counts = block_intersection_counts(values, offsets, row_start, row_end, column_chunk=7)
+        for i in range(row_start, row_end):
+            for j in range(i + 1, len(profiles)):
+                assert counts[i - row_start, j - row_start - 1] == len(set(profiles[i]) & set(profiles[j]))
@@ -0,0 +1,86 @@
+# Pruebas del servicio HTTP de consultas
+"""
+Solicitudes /query y /add concurrentes, agrupadas en lotes y preprocesadas
+en varios procesos, devuelven los mismos resultados que el índice consultado
+directamente y cada una recibe su propia respuesta
+"""
+
+import asyncio
+import json
+import pytest
+from src.index.corpus_index import CorpusIndex
+from src.index.server import DetectorService
+from src.utils.preprocessing import preprocess_document
+
+async def http_request(port, method, path, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode('latin-1') + payload)
+    await writer.drain()
+    # El servidor cierra la conexión al responder: si un proceso heredara el socket, esto no terminaría
+    response = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+def run_service(documents, scenario, workers):
+    corpus = {name: preprocess_document(text, 3) for name, text in documents.items()}
+    direct = CorpusIndex.build(corpus)
+
+    async def main():
+        service = DetectorService(CorpusIndex.build(corpus), workers=workers, batch_size=4, batch_delay=0.01)
+        await service.start()
+        server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port, direct)
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+
+    return asyncio.run(main())
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_concurrent_queries_match_direct_queries(documents, workers):
+    queries = [(f'consulta_{number}.txt', text) for number, text in enumerate(documents.values())]
+
+    async def scenario(port, direct):
+        responses = await asyncio.gather(*(
+            http_request(port, 'POST', '/query', {'name': name, 'text': text, 'top': 3})
+            for name, text in queries
+        ))
+        for (name, text), (status, response) in zip(queries, responses):
+            assert status == 200 and response['name'] == name
+            assert response['matches'] == direct.query_text(text, 3, name)
+
+    run_service(documents, scenario, workers)
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_concurrent_adds_and_errors(documents, workers):
+    texts = list(documents.values())
+    new_documents = [(f'nuevo_{number}.txt', texts[number] + ' texto agregado') for number in range(6)]
+
+    async def scenario(port, direct):
+        requests = [http_request(port, 'POST', '/add', {'name': name, 'text': text}) for name, text in new_documents]
+        requests.append(http_request(port, 'POST', '/add', {'name': 'doc_00.txt', 'text': 'repetido'}))
+        requests.append(http_request(port, 'POST', '/query', ['no', 'es', 'un', 'objeto']))
+        requests.append(http_request(port, 'POST', '/query', {'name': 'sin texto'}))
+        *added, duplicate, not_object, missing_text = await asyncio.gather(*requests)
+
+        assert [status for status, _ in added] == [200] * len(new_documents)
+        assert [response['name'] for _, response in added] == [name for name, _ in new_documents]
+        doc_ids = [response['doc_id'] for _, response in added]
+        assert sorted(doc_ids) == list(range(len(documents), len(documents) + len(new_documents)))
+        assert duplicate[0] == 409
+        assert not_object[0] == 400 and missing_text[0] == 400
+
+        # Los documentos agregados son visibles para las consultas siguientes
+        name, text = new_documents[0]
+        status, response = await http_request(port, 'POST', '/query', {'name': 'consulta', 'text': text, 'top': 1})
+        assert status == 200 and response['matches'][0]['doc_b'] == name
+        status, stats = await http_request(port, 'GET', '/stats')
+        assert stats['documents'] == len(documents) + len(new_documents)
+
+    run_service(documents, scenario, workers)